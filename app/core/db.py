@@ -1,7 +1,11 @@
-import sqlite3
+import os
+import sys
 from typing import List, Dict, Optional
 
-DB_PATH = "../voice_of_customer.db"  # Adjust path if needed
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from db_connection import read_conn
+from feedback_types import parse_priority, priority_label
+from text_search import match_expression
 
 def get_feedback_records(
     limit: int = 50,
@@ -9,30 +13,34 @@ def get_feedback_records(
     priority: Optional[str] = None,
     search: Optional[str] = None
 ) -> List[Dict]:
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    query = "SELECT id, initial_description, priority, team_routed FROM feedback WHERE 1=1"
+    query = "SELECT f.id, f.initial_description, f.priority, f.team_routed FROM feedback AS f"
     params = []
+    order = "f.created DESC"
+
+    if search:
+        # Ranked full-text match instead of a LIKE scan over every description
+        expression = match_expression(search, min_length=1, prefix=True, match_all=True)
+        if expression is None:
+            return []
+        query += " JOIN feedback_fts ON feedback_fts.rowid = f.rowid AND feedback_fts MATCH ?"
+        params.append(expression)
+        order = "feedback_fts.rank"
 
+    query += " WHERE 1=1"
     if team:
-        query += " AND team_routed = ?"
+        query += " AND f.team_routed = ?"
         params.append(team)
     if priority:
-        query += " AND priority = ?"
-        params.append(priority)
-    if search:
-        query += " AND initial_description LIKE ?"
-        params.append(f"%{search}%")
+        query += " AND f.priority = ?"
+        params.append(parse_priority(priority))
 
-    query += " ORDER BY created DESC LIMIT ?"
+    query += f" ORDER BY {order} LIMIT ?"
     params.append(limit)
 
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
+    with read_conn() as conn:
+        rows = conn.execute(query, params).fetchall()
 
     return [
-        {"id": r[0], "description": r[1], "priority": r[2], "team": r[3]}
+        {"id": r[0], "description": r[1], "priority": priority_label(r[2]), "team": r[3]}
         for r in rows
-    ]
\ No newline at end of file
+    ]
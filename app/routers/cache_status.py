@@ -8,6 +8,7 @@ router = APIRouter()
 # Import new intelligent cache system
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 import intelligent_cache
+from result_cache import result_cache
 
 @router.get("/", summary="Get intelligent cache status and statistics")
 def get_cache_status():
@@ -78,7 +79,8 @@ def get_detailed_stats():
     cache_status = intelligent_cache.get_status()
     
     return {
-        "cache": cache_status
+        "cache": cache_status,
+        "result_cache": result_cache.stats()
     }
 
 @router.post("/init-schema", summary="Initialize database schema")
@@ -2,14 +2,17 @@ from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
-import sqlite3
 import os
 import sys
 import asyncio
 
 router = APIRouter()
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from config import DB_PATH, OPENAI_API_KEY
+from config import OPENAI_API_KEY
+from db_connection import read_conn
+from feedback_types import priority_label
+import async_db
+import text_search
 from semantic_analyzer import semantic_analyzer
 
 # Initialize OpenAI client
@@ -35,44 +38,22 @@ class ChatResponse(BaseModel):
     related_jira: List[Dict]
 
 def get_related_feedback(question: str, top_n=5) -> List[Dict]:
-    """Get feedback records based on search terms in question"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Simple keyword search in feedback descriptions
-    cursor.execute("""
-        SELECT id, initial_description, priority, team_routed
-        FROM feedback
-        WHERE initial_description LIKE ?
-        ORDER BY created DESC
-        LIMIT ?
-    """, (f"%{question}%", top_n))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    """Get feedback records ranked by full-text relevance to the question"""
+    with read_conn() as conn:
+        rows = text_search.search_feedback(conn, question, top_n)
     
     return [
-        {"id": r[0], "description": r[1], "priority": r[2], "team": r[3]}
+        {"id": r[1], "description": r[2], "priority": priority_label(r[4], default=""), "team": r[5]}
         for r in rows
     ]
 
 def get_related_jira(question: str, top_n=3) -> List[Dict]:
-    """Get Jira tickets with basic text matching"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, summary, assignee, team_name
-        FROM jira_tickets
-        WHERE summary LIKE ? OR description LIKE ?
-        LIMIT ?
-    """, (f"%{question}%", f"%{question}%", top_n))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    """Get Jira tickets ranked by full-text relevance to the question"""
+    with read_conn() as conn:
+        rows = text_search.search_jira(conn, question, top_n)
     
     return [
-        {"id": r[0], "summary": r[1], "assignee": r[2], "team": r[3]}
+        {"id": r[1], "summary": r[2], "assignee": r[4], "team": r[5]}
         for r in rows
     ]
 
@@ -260,9 +241,9 @@ async def chat_stream(request: ChatRequest):
         return StreamingResponse(empty_response(), media_type="text/plain")
     
     try:
-        # Find related feedback and Jira using robust semantic analyzer
-        feedback_matches = semantic_analyzer.find_related_feedback(request.question, top_n=3)
-        jira_matches = semantic_analyzer.find_related_jira_tickets(request.question, top_n=2)
+        # Find related feedback and Jira using robust semantic analyzer (off the event loop)
+        feedback_matches = await async_db.run_sync(semantic_analyzer.find_related_feedback, request.question, top_n=3)
+        jira_matches = await async_db.run_sync(semantic_analyzer.find_related_jira_tickets, request.question, top_n=2)
 
         # Build context
         context_parts = []
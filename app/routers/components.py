@@ -1,12 +1,20 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 import sqlite3
+import sys
+import os
 
 router = APIRouter()
-DB_PATH = "../voice_of_customer.db"  # Adjust if needed
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from db_connection import get_db
+from result_cache import cached
+from http_cache import conditional_get
 
-@router.get("/", summary="Get unique Environment, Area Impacted, and Type of Issue values")
-def get_components():
-    conn = sqlite3.connect(DB_PATH)
+@router.get("/", summary="Get unique Environment, Area Impacted, and Type of Issue values",
+            dependencies=[Depends(conditional_get("components"))])
+def get_components(conn: sqlite3.Connection = Depends(get_db)):
+    return cached(conn, "components", {}, lambda: _load_components(conn))
+
+def _load_components(conn: sqlite3.Connection):
     cursor = conn.cursor()
 
     # Query unique values
@@ -19,9 +27,8 @@ def get_components():
     cursor.execute("SELECT DISTINCT type_of_report FROM feedback WHERE type_of_report IS NOT NULL AND type_of_report != ''")
     types = [row[0] for row in cursor.fetchall()]
 
-    conn.close()
     return {
         "environments": environments,
         "areas_impacted": areas,
         "types_of_issue": types
-    }
\ No newline at end of file
+    }
@@ -1,113 +1,66 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, Depends
 import sqlite3
 import json
-from collections import Counter
 from datetime import datetime
 
 router = APIRouter()
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from config import DB_PATH
+from db_connection import get_db
+from feedback_facets import facet_counts, label_distribution
+from feedback_types import PRIORITY_HIGH
+from result_cache import cached, data_version_info
+from http_cache import conditional_get
 
-@router.get("/", summary="Get customer pulse analytics")
-def get_customer_pulse(background_tasks: BackgroundTasks):
+@router.get("/", summary="Get customer pulse analytics",
+            dependencies=[Depends(conditional_get("customer_pulse"))])
+def get_customer_pulse(background_tasks: BackgroundTasks, conn: sqlite3.Connection = Depends(get_db)):
     """Get aggregated analytics on customer feedback patterns."""
-    
-    # Get data from original database
-    feedback_data = []
+    pulse = cached(conn, "customer_pulse", {}, lambda: _load_customer_pulse(conn))
+    # When the served data last changed (the data version bump), not when this entry was computed
+    _, updated = data_version_info(conn)
+    last_updated = f"{updated} UTC" if updated else datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+    # Cached values are shared between requests, so the entry is copied rather than updated
+    return {**pulse, "last_updated": last_updated}
+
+def _load_customer_pulse(conn: sqlite3.Connection):
+    # Aggregate in SQL over the typed columns instead of re-parsing every row
+    total_records = 0
+    priority_counts = {}
+    environment_counts = {}
+    status_counts = {}
+    sorted_months = []
+    high_priority_issues = []
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, created, priority, environment, area_impacted, 
-                   status, notes, team_routed
+
+        # Totals and breakdowns share the /feedback/facets counting pass
+        facets = facet_counts(conn)
+        total_records = facets["total"]
+        priority_counts = label_distribution(facets["facets"]["priority"])
+        environment_counts = label_distribution(facets["facets"]["environment"])
+        status_counts = label_distribution(facets["facets"]["status"])
+
+        # Trends (count by month from the epoch timestamp)
+        sorted_months = [tuple(row) for row in cursor.execute("""
+            SELECT strftime('%Y-%m', created_ts, 'unixepoch') AS year_month, COUNT(*)
             FROM feedback
-        """)
-        rows = cursor.fetchall()
-        
-        for row in rows:
-            try:
-                # Map priority
-                priority_value = row['priority']
-                if str(priority_value) == '1':
-                    priority = 'High'
-                elif str(priority_value) == '2':
-                    priority = 'Medium'
-                elif str(priority_value) == '3':
-                    priority = 'Low'
-                else:
-                    priority = priority_value or 'Medium'
-                
-                feedback_data.append({
-                    "id": row['id'],
-                    "description": row['notes'] or "",
-                    "priority": priority,
-                    "team": row['team_routed'] or "Unassigned",
-                    "environment": row['environment'] or "Unknown",
-                    "area_impacted": row['area_impacted'] or "Unknown",
-                    "created": row['created'] or "",
-                    "status": row['status'] or "New"
-                })
-            except Exception as e:
-                print(f"Error parsing record: {e}")
-                continue
-        
-        conn.close()
+            WHERE created_ts IS NOT NULL
+            GROUP BY year_month
+            ORDER BY year_month
+        """)]
+
+        # Get top issues by priority
+        high_priority_issues = cursor.execute("""
+            SELECT id, COALESCE(notes, ''), COALESCE(NULLIF(environment, ''), 'Unknown'), COALESCE(created, '')
+            FROM feedback
+            WHERE priority = ?
+            LIMIT 5
+        """, (PRIORITY_HIGH,)).fetchall()
     except Exception as e:
         print(f"Error fetching feedback data: {e}")
-    
-    # Convert to tuple format for existing analytics logic
-    records = []
-    for record in feedback_data:
-        records.append((
-            record.get("id", ""),
-            record.get("description", ""),
-            record.get("priority", "Medium"),
-            record.get("environment", "Unknown"),
-            record.get("created", ""),
-            record.get("status", "Unknown")
-        ))
-    
-    # Basic analytics
-    total_records = len(records)
-    
-    # Priority breakdown
-    priority_counts = Counter([r[2] for r in records])
-    
-    # Environment breakdown
-    environment_counts = Counter([r[3] for r in records])
-    
-    # Status breakdown
-    status_counts = Counter([r[5] for r in records])
-    
-    # Trends (simplified - count by month)
-    monthly_counts = {}
-    for record in records:
-        try:
-            # Parse the created date
-            created_str = record[4]
-            if created_str:
-                # Handle various date formats
-                if "T" in created_str:
-                    date_part = created_str.split("T")[0]
-                else:
-                    date_part = created_str.split(" ")[0]
-                
-                # Extract year-month
-                if "-" in date_part:
-                    parts = date_part.split("-")
-                    if len(parts) >= 2:
-                        year_month = f"{parts[0]}-{parts[1]}"
-                        monthly_counts[year_month] = monthly_counts.get(year_month, 0) + 1
-        except:
-            continue
-    
-    # Sort monthly counts
-    sorted_months = sorted(monthly_counts.items())
-    
+
     # Calculate trend
     if len(sorted_months) >= 2:
         last_month_count = sorted_months[-1][1]
@@ -115,15 +68,12 @@ def get_customer_pulse(background_tasks: BackgroundTasks):
         trend_percentage = ((last_month_count - prev_month_count) / prev_month_count) * 100
     else:
         trend_percentage = 0
-    
-    # Get top issues by priority
-    high_priority_issues = [r for r in records if r[2] == "High"][:5]
-    
+
     return {
         "total_feedback": total_records,
-        "priority_distribution": dict(priority_counts),
-        "environment_distribution": dict(environment_counts),
-        "status_distribution": dict(status_counts),
+        "priority_distribution": priority_counts,
+        "environment_distribution": environment_counts,
+        "status_distribution": status_counts,
         "monthly_trends": {
             "data": sorted_months[-12:],  # Last 12 months
             "trend_percentage": round(trend_percentage, 1),
@@ -133,10 +83,9 @@ def get_customer_pulse(background_tasks: BackgroundTasks):
             {
                 "id": issue[0],
                 "description": issue[1][:100] + "..." if len(issue[1]) > 100 else issue[1],
-                "environment": issue[3],
-                "created": issue[4]
+                "environment": issue[2],
+                "created": issue[3]
             }
             for issue in high_priority_issues
         ],
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-    }
\ No newline at end of file
+    }
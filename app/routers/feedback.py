@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, Query, HTTPException, Depends, Header, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import sqlite3
 import sys
 import os
@@ -9,242 +11,310 @@ router = APIRouter()
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from config import DB_PATH
-from team_assignment_service import team_service
+from bulk_write import chunked
+from columnar import parse_format, to_columnar
+from db_connection import get_db, read_conn
+from feedback_changes import change_version, changes_since
+from feedback_facets import facet_counts
+from feedback_query import FeedbackQuery
+from feedback_read import READ_TABLE, RESPONSE_COLUMNS
+from feedback_types import parse_priority
+from pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, parse_fields
+from result_cache import cached
+from http_cache import conditional_get
+from json_response import FastJSONResponse, dumps
 
-def get_db_connection():
-    """Get a connection to the SQLite database"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Rows in feedback_read are already in the response shape (see feedback_read.py)
+FEEDBACK_READ_SELECT = f"SELECT {', '.join(RESPONSE_COLUMNS)} FROM {READ_TABLE}"
 
-def get_description(row: sqlite3.Row) -> str:
+# Largest ID list POST /feedback/batch accepts, and IDs bound per IN (...) query
+MAX_BATCH_IDS = 1000
+BATCH_CHUNK_SIZE = 500
+
+class FeedbackBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+# Low-cardinality response fields sent as dictionary indexes by format=columnar
+DICTIONARY_COLUMNS = ("team", "priority", "environment", "status", "source")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows fetched and encoded per streamed chunk
+STREAM_BATCH_SIZE = 500
+
+def feedback_criteria(
+    team: Optional[List[str]] = Query(None, description="Repeat for several teams"),
+    priority: Optional[List[str]] = Query(None, description="High/Medium/Low or 1/2/3; repeatable"),
+    environment: Optional[List[str]] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    area: Optional[List[str]] = Query(None, description="Area impacted as returned in the response"),
+    source: Optional[List[str]] = Query(None),
+    type: Optional[List[str]] = Query(None, description="Type of report"),
+    created_from: Optional[str] = Query(None, description="YYYY-MM-DD or ISO timestamp (inclusive)"),
+    created_to: Optional[str] = Query(None, description="YYYY-MM-DD (whole day included) or ISO timestamp"),
+    q: Optional[str] = Query(None, description="Full-text match on description, notes and resolution notes")
+) -> Dict[str, Any]:
+    """Filter query params shared by the list and facet endpoints, as FeedbackQuery arguments."""
+    return {
+        "filters": {
+            "team": team, "priority": priority, "environment": environment,
+            "status": status, "area": area, "source": source, "type": type,
+        },
+        "created_from": created_from,
+        "created_to": created_to,
+        "text": q,
+    }
+
+def _criteria_params(criteria: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Get the appropriate description field with enhanced logic.
-    Tries multiple fields in priority order.
+    Hashable result cache params for feedback_criteria(), normalized as FeedbackQuery
+    reads them so equivalent requests share an entry: priorities as ranks ("High"
+    and "1"), IN-lists deduplicated and sorted (value order does not change the result).
     """
-    # Try different potential description fields in order of preference
-    description_fields = [
-        'notes',
-        'initial_description',
-        'resolution_notes'
-    ]
-    
-    for field in description_fields:
-        try:
-            value = row[field]
-            if value and str(value).strip() and str(value).strip() not in ['', 'N/A', 'None']:
-                return str(value).strip()
-        except (IndexError, KeyError):
-            continue
-    
-    return "No description provided"
+    params = {}
+    for name, values in criteria["filters"].items():
+        values = [v for v in (values or []) if v not in (None, "")]
+        if name == "priority":
+            values = [parse_priority(v) for v in values]
+        if values:
+            params[name] = tuple(sorted(set(values), key=str))
+    params.update({name: value for name, value in criteria.items() if name != "filters"})
+    return params
 
-def parse_area_impacted(area_value: Any) -> str:
-    """Parse area impacted value handling various formats"""
-    if not area_value or str(area_value).strip() in ['', 'None', 'null']:
-        return "Unknown"
-    
-    # Handle string values
-    area_str = str(area_value).strip()
-    
-    # Handle list-like strings (e.g., "['Salesforce']")
-    if area_str.startswith('[') and area_str.endswith(']'):
-        try:
-            # Remove brackets and quotes
-            area_str = area_str.strip('[]')
-            area_str = area_str.replace("'", "").replace('"', '')
-            # Split by comma and clean
-            parts = [p.strip() for p in area_str.split(',') if p.strip()]
-            if parts:
-                return ', '.join(parts)
-        except:
-            pass
-    
-    return area_str if area_str else "Unknown"
-
-@router.get("/", summary="Get feedback with optional filters")
+@router.get("/", summary="Get feedback with optional filters",
+            dependencies=[Depends(conditional_get("feedback.list"))])
 def get_feedback(
-    team: Optional[str] = None, 
-    priority: Optional[str] = None, 
-    environment: Optional[str] = None
+    response: Response,
+    criteria: Dict[str, Any] = Depends(feedback_criteria),
+    sort: Optional[str] = Query(None, description="Comma-separated keys, '-' for descending; default -created"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full list"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return"),
+    include_total: bool = Query(False, description="Send the filtered row count in X-Total-Count"),
+    stream: bool = Query(False, description="Stream the rows as they are read instead of building the whole list"),
+    format: str = Query("rows", description="rows (a list of objects) or columnar (one array per field)"),
+    accept: Optional[str] = Header(None),
+    conn: sqlite3.Connection = Depends(get_db)
 ) -> List[Dict[str, Any]]:
     """
     Get feedback records directly from the database.
-    Uses the original database schema with proper field mappings.
+    Reads feedback_read, where rows are stored already mapped to the response fields.
+    Filters combine with AND; repeated values of one filter combine with OR.
+    Newest first unless sort is given; with limit, pages are keyset paginated and
+    the cursor for the next page is returned in the X-Next-Cursor header.
+    X-Change-Version is the watermark to pass to GET /feedback/changes afterwards.
+    Results are served from the result cache until the data version changes.
+
+    For exports, stream=true or Accept: application/x-ndjson streams the rows
+    straight from the cursor (a JSON array, or one JSON object per line).
+
+    format=columnar returns {"columns", "count", "data": {field: [values]},
+    "dictionaries"}: one array per field, with team, priority, environment,
+    status and source as indexes into "dictionaries" (see columnar.py). Much
+    smaller and faster to parse for full-table views; cannot be streamed.
     """
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
-        # Build query with optional filters
-        query = """
-            SELECT id, directory_link, created, week, initial_description, 
-                   priority, notes, triage_rep, status, resolution_notes,
-                   related_imt, related_imt_link, type_of_report, area_impacted,
-                   environment, time_to_in_progress, time_from_in_progress_to_done,
-                   time_from_reported_to_imt_review, time_from_imt_review_to_done,
-                   time_from_report_to_resolution, source, team_routed
-            FROM feedback
-            WHERE 1=1
-        """
-        
-        params = []
-        
-        if team:
-            query += " AND team_routed = ?"
-            params.append(team)
-        
-        if priority:
-            query += " AND priority = ?"
-            params.append(priority)
-            
-        if environment:
-            query += " AND environment = ?"
-            params.append(environment)
-        
-        query += " ORDER BY created DESC"
+        spec = FeedbackQuery(sort=sort, **criteria)
+        columnar = parse_format(format) == "columnar"
+        columns = parse_fields(fields, RESPONSE_COLUMNS)
+        after = decode_cursor(cursor)
+        query, query_params = spec.select(columns, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Validators set by conditional_get are not merged into a returned Response
+    headers = dict(response.headers)
+    # Read before the rows: a write landing in between is then re-sent by the next delta, never missed
+    headers["X-Change-Version"] = str(change_version(conn))
+
+    ndjson = bool(accept) and NDJSON_MEDIA_TYPE in accept
+    if (stream or ndjson) and columnar:
+        raise HTTPException(status_code=400, detail="format=columnar cannot be streamed")
+    if stream or ndjson:
+        return StreamingResponse(
+            _stream_feedback(query, query_params, len(columns), ndjson, limit),
+            media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+            headers=headers
+        )
+
+    params = _criteria_params(criteria)
+    params.update({
+        "sort": sort, "limit": limit, "cursor": cursor, "fields": ",".join(columns) if fields else None,
+        "include_total": include_total or None, "format": format if columnar else None,
+    })
+    content, next_cursor, total = cached(
+        conn, "feedback.list", params,
+        lambda: _load_feedback(conn, spec, query, query_params, len(columns), limit, include_total, columnar)
+    )
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    # Rendered directly: skips FastAPI validating and re-encoding every row
+    return FastJSONResponse(content, headers=headers)
+
+def _stream_feedback(
+    query: str,
+    params: List[Any],
+    width: int,
+    ndjson: bool,
+    limit: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Encode rows as they come off the cursor, STREAM_BATCH_SIZE at a time, so memory
+    stays flat however many rows match. Runs in the threadpool on its own read
+    connection (the request's connection may be released before the body is sent).
+    """
+    sent = 0
+    if not ndjson:
+        yield b"["
+    with read_conn() as conn:
+        cursor = conn.execute(query, params)
+        names = [column[0] for column in cursor.description][:width]
+        while True:
+            rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if limit:
+                # The query asks for limit + 1 rows (next page detection); send exactly limit
+                rows = rows[:limit - sent]
+            if not rows:
+                break
+            encoded = [dumps(dict(zip(names, row))) for row in rows]
+            if ndjson:
+                chunk = b"\n".join(encoded) + b"\n"
+            else:
+                chunk = (b"," if sent else b"") + b",".join(encoded)
+            sent += len(rows)
+            yield chunk
+    if not ndjson:
+        yield b"]"
+    print(f"Streamed {sent} feedback records from database")
+
+def _load_feedback(
+    conn: sqlite3.Connection,
+    spec: FeedbackQuery,
+    query: str,
+    params: List[Any],
+    width: int,
+    limit: Optional[int] = None,
+    include_total: bool = False,
+    columnar: bool = False
+) -> Tuple[Any, Optional[str], Optional[int]]:
+    """
+    Run a query compiled by spec.select() (requested columns first, then the sort
+    keys). Returns (rows, or the columnar encoding of them, next page cursor or
+    None, filtered total or None).
+    """
+    try:
+        total = None
+        if include_total:
+            # Counted over a (filter, created, id) index where one applies, ignoring the page position
+            count_sql, count_params = spec.count()
+            total = conn.execute(count_sql, count_params).fetchone()[0]
         
-        cursor.execute(query, params)
+        cursor = conn.execute(query, params)
+        names = [column[0] for column in cursor.description][:width]
         rows = cursor.fetchall()
         
-        # Convert rows to list of dicts with proper field mappings
-        results = []
-        for row in rows:
-            # Parse area impacted
-            area_impacted = parse_area_impacted(row['area_impacted'])
-            
-            # Get team assignment using the service (or use existing if valid)
-            existing_team = row['team_routed']
-            if existing_team and existing_team != 'Unassigned' and existing_team != 'Triage':
-                assigned_team = existing_team
-            else:
-                # Use enhanced team assignment service
-                assigned_team = team_service.assign_team(
-                    area_impacted=area_impacted,
-                    description=get_description(row),
-                    type_of_issue=row['type_of_report'] or ''
-                )
-            
-            # Map priority (handle numeric or string values)
-            priority_value = row['priority']
-            if str(priority_value) == '1':
-                priority = 'High'
-            elif str(priority_value) == '2':
-                priority = 'Medium'
-            elif str(priority_value) == '3':
-                priority = 'Low'
-            else:
-                priority = priority_value or 'Medium'
-            
-            # Build the response record
-            record = {
-                "id": row['id'],
-                "description": get_description(row),
-                "priority": priority,
-                "team": assigned_team,
-                "environment": row['environment'] or 'Unknown',
-                "area_impacted": area_impacted,
-                "created": row['created'] or '',
-                "week": row['week'] or 'N/A',
-                "issue_number": '',  # Not in original schema
-                "status": row['status'] or 'New',
-                "reporter_email": '',  # Not in original schema
-                "slack_thread": '',  # Not in original schema
-                "type_of_issue": row['type_of_report'] or '',
-                "type_of_report": row['type_of_report'] or 'N/A',
-                "source": row['source'] or 'N/A',
-                "triage_rep": row['triage_rep'] or 'N/A'
-            }
-            
-            results.append(record)
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(*rows[-1][width:])
         
-        print(f"Returning {len(results)} feedback records from database")
-        return results
+        print(f"Returning {len(rows)} feedback records from database")
+        if columnar:
+            return to_columnar(names, rows, DICTIONARY_COLUMNS), next_cursor, total
+        return [dict(zip(names, row)) for row in rows], next_cursor, total
         
     except Exception as e:
         print(f"Database query error: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    finally:
-        conn.close()
 
-@router.get("/{feedback_id}", summary="Get a single feedback record by ID")
-def get_feedback_by_id(feedback_id: str) -> Dict[str, Any]:
+@router.get("/facets", summary="Counts per team, priority, environment and status for the filter sidebar",
+            dependencies=[Depends(conditional_get("feedback.facets"))])
+def get_feedback_facets(
+    criteria: Dict[str, Any] = Depends(feedback_criteria),
+    conn: sqlite3.Connection = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Takes the same filters as GET /feedback. Each facet is counted under every
+    filter except its own, so all of a facet's choices stay visible with their counts.
+    """
+    try:
+        return cached(conn, "feedback.facets", _criteria_params(criteria), lambda: facet_counts(conn, **criteria))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/changes", summary="Rows inserted, updated or deleted since a change version (delta sync)")
+def get_feedback_changes(
+    since: int = Query(..., ge=0, description="'version' from the previous full load or delta"),
+    conn: sqlite3.Connection = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Returns {"version", "reset", "changed", "deleted"}: changed rows have the GET
+    /feedback shape, deleted holds IDs. Keep "version" for the next call. When
+    "reset" is true the delta is unavailable (too old or too large) and the
+    client should reload GET /feedback, then sync from this version.
+    """
+    try:
+        return FastJSONResponse(changes_since(conn, since))
+    except Exception as e:
+        print(f"Error fetching feedback changes: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/{feedback_id}", summary="Get a single feedback record by ID",
+            dependencies=[Depends(conditional_get("feedback.by_id"))])
+def get_feedback_by_id(feedback_id: str, conn: sqlite3.Connection = Depends(get_db)) -> Dict[str, Any]:
     """Get a single feedback record by ID from the database"""
     
-    conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
     
     try:
-        cursor.execute("""
-            SELECT id, directory_link, created, week, initial_description, 
-                   priority, notes, triage_rep, status, resolution_notes,
-                   related_imt, related_imt_link, type_of_report, area_impacted,
-                   environment, time_to_in_progress, time_from_in_progress_to_done,
-                   time_from_reported_to_imt_review, time_from_imt_review_to_done,
-                   time_from_report_to_resolution, source, team_routed
-            FROM feedback
-            WHERE id = ?
-        """, (feedback_id,))
-        
+        cursor.execute(FEEDBACK_READ_SELECT + " WHERE id = ?", (feedback_id,))
         row = cursor.fetchone()
         
         if not row:
             raise HTTPException(status_code=404, detail="Feedback not found")
         
-        # Parse area impacted
-        area_impacted = parse_area_impacted(row['area_impacted'])
-        
-        # Get team assignment
-        existing_team = row['team_routed']
-        if existing_team and existing_team != 'Unassigned' and existing_team != 'Triage':
-            assigned_team = existing_team
-        else:
-            assigned_team = team_service.assign_team(
-                area_impacted=area_impacted,
-                description=get_description(row),
-                type_of_issue=row['type_of_report'] or ''
-            )
+        return _detail_record(row)
         
-        # Map priority
-        priority_value = row['priority']
-        if str(priority_value) == '1':
-            priority = 'High'
-        elif str(priority_value) == '2':
-            priority = 'Medium'
-        elif str(priority_value) == '3':
-            priority = 'Low'
-        else:
-            priority = priority_value or 'Medium'
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error fetching feedback by ID: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/batch", summary="Get several feedback records by ID in one request")
+def get_feedback_batch(request: FeedbackBatchRequest, conn: sqlite3.Connection = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Look up to MAX_BATCH_IDS records in one round trip, in request order.
+    Records have the same shape as GET /feedback/{id}; unknown IDs are listed in "missing".
+    """
+    ids = list(dict.fromkeys(request.ids))
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    
+    try:
+        found = {}
+        for chunk in chunked(ids, BATCH_CHUNK_SIZE):
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"{FEEDBACK_READ_SELECT} WHERE id IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                found[row['id']] = _detail_record(row)
         
         return {
-            "id": row['id'],
-            "description": get_description(row),
-            "priority": priority,
-            "team": assigned_team,
-            "environment": row['environment'] or 'Unknown',
-            "area_impacted": area_impacted,
-            "created": row['created'] or '',
-            "week": row['week'] or 'N/A',
-            "issue_number": '',
-            "status": row['status'] or 'New',
-            "reporter_email": '',
-            "slack_thread": '',
-            "type_of_issue": row['type_of_report'] or '',
-            "type_of_report": row['type_of_report'] or 'N/A',
-            "source": row['source'] or 'N/A',
-            "triage_rep": row['triage_rep'] or 'N/A',
-            "created_at": row['created'] or '',
-            "modified_at": row['created'] or ''
+            "records": [found[feedback_id] for feedback_id in ids if feedback_id in found],
+            "missing": [feedback_id for feedback_id in ids if feedback_id not in found],
         }
         
-    except HTTPException:
-        raise
     except Exception as e:
-        print(f"Error fetching feedback by ID: {e}")
+        print(f"Error fetching feedback batch: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        conn.close()
\ No newline at end of file
+
+def _detail_record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Single-record shape: the list fields plus created_at/modified_at."""
+    record = dict(row)
+    record["created_at"] = record["created"]
+    record["modified_at"] = record["created"]
+    return record
\ No newline at end of file
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
 from datetime import datetime, timezone
 import os
-import sqlite3
 import requests
 from config import DB_PATH, AIRTABLE_API_KEY, AIRTABLE_BASE_ID, OPENAI_API_KEY
+from db_connection import read_conn
+from result_cache import result_cache
 
 router = APIRouter()
 
@@ -19,7 +20,8 @@ def get_health_status():
             "airtable": check_airtable_health(),
             "openai": check_openai_health(),
             "environment": check_environment_health()
-        }
+        },
+        "result_cache": result_cache.stats()
     }
     
     # Overall status
@@ -34,31 +36,29 @@ def get_health_status():
 def check_database_health():
     """Check database connectivity and table existence."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Test basic connectivity
-        cursor.execute("SELECT 1")
-        
-        # Check required tables
-        tables = ["feedback", "users", "jira_tickets", "cache_metadata"]
-        existing_tables = []
-        
-        for table in tables:
-            cursor.execute(f"""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='{table}'
-            """)
-            if cursor.fetchone():
-                existing_tables.append(table)
-        
-        # Check data counts
-        counts = {}
-        for table in existing_tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            counts[table] = cursor.fetchone()[0]
-        
-        conn.close()
+        with read_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Test basic connectivity
+            cursor.execute("SELECT 1")
+            
+            # Check required tables
+            tables = ["feedback", "users", "jira_tickets", "cache_metadata"]
+            existing_tables = []
+            
+            for table in tables:
+                cursor.execute("""
+                    SELECT name FROM sqlite_master 
+                    WHERE type='table' AND name=?
+                """, (table,))
+                if cursor.fetchone():
+                    existing_tables.append(table)
+            
+            # Check data counts
+            counts = {}
+            for table in existing_tables:
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                counts[table] = cursor.fetchone()[0]
         
         return {
             "status": "healthy",
@@ -171,10 +171,8 @@ def quick_health():
     """Quick health check for load balancers."""
     try:
         # Just test database connectivity
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        conn.close()
+        with read_conn() as conn:
+            conn.execute("SELECT 1")
         
         return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
     except Exception as e:
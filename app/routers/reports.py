@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Dict, Any, Optional
 import os
-import sqlite3
+import sys
 from datetime import datetime
 
 router = APIRouter()
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+import async_db
+from result_cache import current_data_version, result_cache
+from http_cache import conditional_get
 
 @router.get("/test", summary="Test endpoint")
 async def test_reports():
@@ -15,13 +19,8 @@ async def test_reports():
 async def get_environments():
     """Get list of environments that have response time data in cache."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Get unique environments from cache
-        cursor.execute("SELECT DISTINCT environment FROM response_times_weighted ORDER BY environment")
-        rows = cursor.fetchall()
-        conn.close()
+        rows = await async_db.fetch_all("SELECT DISTINCT environment FROM response_times_weighted ORDER BY environment")
         
         environments = [row[0] for row in rows if row[0]]
         print(f"✅ Found {len(environments)} environments with response time data: {environments}")
@@ -32,9 +31,6 @@ async def get_environments():
         print(f"Error fetching environments: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# Database configuration
-DB_PATH = "/Users/tylerwood/voice_of_customer/voice_of_customer.db"
-
 @router.get("/response-times-mock", summary="Get mock response times for testing")
 async def get_response_times_mock():
     """Return mock data for testing while we debug the real endpoint."""
@@ -70,18 +66,29 @@ async def get_response_times_mock():
         }
     }
 
-@router.get("/response-times", summary="Get cached average response times week over week")
+@router.get("/response-times", summary="Get cached average response times week over week",
+            dependencies=[Depends(conditional_get("reports.response_times"))])
 async def get_response_times(environment: str = None):
     """Get response times data from cache (updated weekly on Sundays)."""
+    if environment == 'All Environments':
+        environment = None
+    params = {"environment": environment}
+    
+    version = await async_db.run_sync(current_data_version)
+    found, result = result_cache.get("reports.response_times", params, version)
+    if found:
+        return result
     
+    result = await _load_response_times(environment)
+    result_cache.put("reports.response_times", params, version, result)
+    return result
+
+async def _load_response_times(environment: Optional[str]):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Build query based on environment filter
-        if environment and environment != 'All Environments':
+        if environment:
             # Fetch weekly data for specific environment
-            cursor.execute('''
+            weekly_rows = await async_db.fetch_all('''
                 SELECT week_label, count, time_to_in_progress_avg, time_in_progress_to_done_avg,
                        time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg
                 FROM response_times_cache 
@@ -89,20 +96,16 @@ async def get_response_times(environment: str = None):
                 ORDER BY week_label
             ''', (environment,))
             
-            weekly_rows = cursor.fetchall()
-            
             # Fetch weighted averages for specific environment
-            cursor.execute('''
+            weighted_row = await async_db.fetch_one('''
                 SELECT count, time_to_in_progress_avg, time_in_progress_to_done_avg,
                        time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg
                 FROM response_times_weighted 
                 WHERE environment = ?
             ''', (environment,))
-            
-            weighted_row = cursor.fetchone()
         else:
             # Aggregate data across all environments
-            cursor.execute('''
+            weekly_rows = await async_db.fetch_all('''
                 SELECT week_label, 
                        SUM(count) as total_count,
                        AVG(time_to_in_progress_avg) as avg_time_to_in_progress,
@@ -115,10 +118,8 @@ async def get_response_times(environment: str = None):
                 ORDER BY week_label
             ''')
             
-            weekly_rows = cursor.fetchall()
-            
             # Calculate overall weighted averages across all environments
-            cursor.execute('''
+            weighted_row = await async_db.fetch_one('''
                 SELECT SUM(count) as total_count,
                        AVG(time_to_in_progress_avg) as avg_time_to_in_progress,
                        AVG(time_in_progress_to_done_avg) as avg_time_in_progress_to_done,
@@ -127,10 +128,6 @@ async def get_response_times(environment: str = None):
                        AVG(time_report_to_resolution_avg) as avg_time_report_to_resolution
                 FROM response_times_weighted
             ''')
-            
-            weighted_row = cursor.fetchone()
-        
-        conn.close()
         
         # If no cached data, return sample data starting from June 30, 2025
         if not weekly_rows:
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 import sqlite3
 import hashlib
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from config import DB_PATH
+from db_connection import get_db, write_conn
 
 router = APIRouter()
 
@@ -28,57 +28,52 @@ class UserUpdate(BaseModel):
 def init_users_table():
     """Initialize users table and create default users"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Create users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                email TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                role TEXT NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Insert default users if they don't exist
-        default_users = [
-            ('admin@coverwallet.com', 'Admin User', 'admin', 'coverwallet2025'),
-            ('tyler.wood@coverwallet.com', 'Tyler Wood', 'super_admin', 'superadmin2025')
-        ]
-        
-        for email, name, role, password in default_users:
-            # Check if user already exists
-            cursor.execute('SELECT email FROM users WHERE email = ?', (email,))
-            if not cursor.fetchone():
-                # Hash the password
-                password_hash = hashlib.sha256(password.encode()).hexdigest()
-                cursor.execute(
-                    'INSERT INTO users (email, name, role, password_hash) VALUES (?, ?, ?, ?)',
-                    (email, name, role, password_hash)
+        with write_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Create users table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    email TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
+            ''')
+            
+            # Insert default users if they don't exist
+            default_users = [
+                ('admin@coverwallet.com', 'Admin User', 'admin', 'coverwallet2025'),
+                ('tyler.wood@coverwallet.com', 'Tyler Wood', 'super_admin', 'superadmin2025')
+            ]
+            
+            for email, name, role, password in default_users:
+                # Check if user already exists
+                cursor.execute('SELECT email FROM users WHERE email = ?', (email,))
+                if not cursor.fetchone():
+                    # Hash the password
+                    password_hash = hashlib.sha256(password.encode()).hexdigest()
+                    cursor.execute(
+                        'INSERT INTO users (email, name, role, password_hash) VALUES (?, ?, ?, ?)',
+                        (email, name, role, password_hash)
+                    )
         
-        conn.commit()
-        conn.close()
         print("✅ Users table initialized")
         
     except Exception as e:
         print(f"❌ Error initializing users table: {e}")
 
 @router.get("/", summary="Get all users")
-def get_users():
+def get_users(conn: sqlite3.Connection = Depends(get_db)):
     """Get all users"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Initialize table if it doesn't exist
         init_users_table()
         
+        cursor = conn.cursor()
         cursor.execute('SELECT email, name, role FROM users ORDER BY email')
         users = cursor.fetchall()
-        conn.close()
         
         return [{"email": user[0], "name": user[1], "role": user[2]} for user in users]
         
@@ -89,29 +84,25 @@ def get_users():
 def create_user(user: UserCreate):
     """Create a new user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Initialize table if it doesn't exist
         init_users_table()
         
-        # Check if user already exists
-        cursor.execute('SELECT email FROM users WHERE email = ?', (user.email,))
-        if cursor.fetchone():
-            conn.close()
-            raise HTTPException(status_code=400, detail="User with this email already exists")
-        
-        # Hash the password
-        password_hash = hashlib.sha256(user.password.encode()).hexdigest()
-        
-        # Insert new user
-        cursor.execute(
-            'INSERT INTO users (email, name, role, password_hash) VALUES (?, ?, ?, ?)',
-            (user.email, user.name, user.role, password_hash)
-        )
-        
-        conn.commit()
-        conn.close()
+        with write_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Check if user already exists
+            cursor.execute('SELECT email FROM users WHERE email = ?', (user.email,))
+            if cursor.fetchone():
+                raise HTTPException(status_code=400, detail="User with this email already exists")
+            
+            # Hash the password
+            password_hash = hashlib.sha256(user.password.encode()).hexdigest()
+            
+            # Insert new user
+            cursor.execute(
+                'INSERT INTO users (email, name, role, password_hash) VALUES (?, ?, ?, ?)',
+                (user.email, user.name, user.role, password_hash)
+            )
         
         return {"message": f"User {user.email} created successfully"}
         
@@ -124,23 +115,19 @@ def create_user(user: UserCreate):
 def delete_user(email: str):
     """Delete a user by email"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Initialize table if it doesn't exist
         init_users_table()
         
-        # Check if user exists
-        cursor.execute('SELECT email FROM users WHERE email = ?', (email,))
-        if not cursor.fetchone():
-            conn.close()
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Delete user
-        cursor.execute('DELETE FROM users WHERE email = ?', (email,))
-        
-        conn.commit()
-        conn.close()
+        with write_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Check if user exists
+            cursor.execute('SELECT email FROM users WHERE email = ?', (email,))
+            if not cursor.fetchone():
+                raise HTTPException(status_code=404, detail="User not found")
+            
+            # Delete user
+            cursor.execute('DELETE FROM users WHERE email = ?', (email,))
         
         return {"message": f"User {email} deleted successfully"}
         
@@ -153,35 +140,31 @@ def delete_user(email: str):
 def update_user(email: str, user_update: UserUpdate):
     """Update a user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Initialize table if it doesn't exist
         init_users_table()
         
-        # Check if user exists
-        cursor.execute('SELECT email FROM users WHERE email = ?', (email,))
-        if not cursor.fetchone():
-            conn.close()
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Update user
-        if user_update.password:
-            # Update with new password
-            password_hash = hashlib.sha256(user_update.password.encode()).hexdigest()
-            cursor.execute(
-                'UPDATE users SET name = ?, role = ?, password_hash = ? WHERE email = ?',
-                (user_update.name, user_update.role, password_hash, email)
-            )
-        else:
-            # Update without changing password
-            cursor.execute(
-                'UPDATE users SET name = ?, role = ? WHERE email = ?',
-                (user_update.name, user_update.role, email)
-            )
-        
-        conn.commit()
-        conn.close()
+        with write_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Check if user exists
+            cursor.execute('SELECT email FROM users WHERE email = ?', (email,))
+            if not cursor.fetchone():
+                raise HTTPException(status_code=404, detail="User not found")
+            
+            # Update user
+            if user_update.password:
+                # Update with new password
+                password_hash = hashlib.sha256(user_update.password.encode()).hexdigest()
+                cursor.execute(
+                    'UPDATE users SET name = ?, role = ?, password_hash = ? WHERE email = ?',
+                    (user_update.name, user_update.role, password_hash, email)
+                )
+            else:
+                # Update without changing password
+                cursor.execute(
+                    'UPDATE users SET name = ?, role = ? WHERE email = ?',
+                    (user_update.name, user_update.role, email)
+                )
         
         return {"message": f"User {email} updated successfully"}
         
@@ -195,12 +178,9 @@ class UserAuth(BaseModel):
     password: str
 
 @router.post("/auth", summary="Authenticate a user")
-def authenticate_user(auth: UserAuth):
+def authenticate_user(auth: UserAuth, conn: sqlite3.Connection = Depends(get_db)):
     """Authenticate a user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Initialize table if it doesn't exist
         init_users_table()
         
@@ -208,12 +188,12 @@ def authenticate_user(auth: UserAuth):
         password_hash = hashlib.sha256(auth.password.encode()).hexdigest()
         
         # Check credentials
+        cursor = conn.cursor()
         cursor.execute(
             'SELECT email, name, role FROM users WHERE email = ? AND password_hash = ?',
             (auth.email, password_hash)
         )
         user = cursor.fetchone()
-        conn.close()
         
         if user:
             return {"email": user[0], "name": user[1], "role": user[2]}
@@ -1,6 +1,7 @@
 import sqlite3
+from feedback_read import refresh_feedback_read
+from result_cache import bump_data_version
 from src.semantic_router import find_related_tickets
-import pickle
 import numpy as np
 
 DB_PATH = "/Users/tylerwood/voice_of_customer/voice_of_customer.db"
@@ -27,6 +28,8 @@ def assign_teams():
             )
             print(f"Feedback {f_id} assigned to team: {team_name}")
     
+    refresh_feedback_read(conn)  # keep /feedback rows in sync
+    bump_data_version(conn)  # invalidate cached API results
     conn.commit()
     conn.close()
     print("Team assignment completed!")
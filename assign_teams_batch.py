@@ -4,6 +4,8 @@ Batch team assignment script with better error handling and progress tracking.
 """
 
 import sqlite3
+from feedback_read import refresh_feedback_read
+from result_cache import bump_data_version
 import time
 import logging
 from src.semantic_router import find_related_tickets
@@ -91,6 +93,8 @@ def assign_teams_batch():
                     continue
             
             # Commit this batch
+            refresh_feedback_read(conn, [f_id for f_id, _ in batch])  # keep /feedback rows in sync
+            bump_data_version(conn)  # invalidate cached API results
             conn.commit()
             logger.info(f"  ✅ Committed batch {batch_num} successfully")
             
@@ -4,6 +4,8 @@ Optimized team assignment script with rate limiting and retry logic.
 """
 
 import sqlite3
+from feedback_read import refresh_feedback_read
+from result_cache import bump_data_version
 import time
 import logging
 import random
@@ -68,6 +70,8 @@ def assign_teams_optimized():
                     "UPDATE feedback SET team_routed = ? WHERE id = ?",
                     (assigned_team, f_id)
                 )
+                refresh_feedback_read(conn, [f_id])  # keep /feedback rows in sync
+                bump_data_version(conn)  # invalidate cached API results
                 conn.commit()
                 conn.close()
                 
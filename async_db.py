@@ -0,0 +1,42 @@
+"""
+Awaitable database access for async endpoints.
+
+Queries run on a dedicated thread pool against the pooled connections from
+db_connection, so an async route never blocks the event loop on sqlite.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from db_connection import READ_POOL_SIZE, read_conn, write_conn
+
+# One worker per pooled read connection keeps checkouts from queueing on the pool
+_executor = ThreadPoolExecutor(max_workers=READ_POOL_SIZE, thread_name_prefix="async-db")
+
+async def run_sync(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable (query helper, SemanticAnalyzer call, ...) off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+def _fetch_all(sql: str, params: Sequence) -> List[tuple]:
+    with read_conn() as conn:
+        return conn.execute(sql, params).fetchall()
+
+def _fetch_one(sql: str, params: Sequence) -> Optional[tuple]:
+    with read_conn() as conn:
+        return conn.execute(sql, params).fetchone()
+
+def _execute(sql: str, params: Sequence) -> int:
+    with write_conn() as conn:
+        return conn.execute(sql, params).rowcount
+
+async def fetch_all(sql: str, params: Sequence = ()) -> List[tuple]:
+    return await run_sync(_fetch_all, sql, params)
+
+async def fetch_one(sql: str, params: Sequence = ()) -> Optional[tuple]:
+    return await run_sync(_fetch_one, sql, params)
+
+async def execute(sql: str, params: Sequence = ()) -> int:
+    """Run a write statement on the serialized writer; returns the affected row count."""
+    return await run_sync(_execute, sql, params)
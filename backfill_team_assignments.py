@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Resumable backfill of the persisted team assignment for existing feedback.
+
+Fills team_assigned, team_method and team_confidence on rows ingested before
+team assignment became an ingest stage (feedback_read.assign_pending_teams).
+
+Works through rows without a team_method in batches of one transaction each:
+assign (feedback_read.team_assignments, one batch), write the result back, refresh their
+feedback_read rows and bump the data version. Progress is the data itself
+(idx_feedback_team_pending covers the pending rows), so an interrupted run
+carries on where it stopped when started again. --recompute first marks every
+row not routed in Airtable as pending, e.g. after the team directory changed;
+the served teams stay as they are until each batch rewrites them.
+
+Usage: python backfill_team_assignments.py [db_path] [--batch-size 500] [--recompute]
+"""
+import argparse
+import sys
+import time
+
+from db_connection import read_conn, write_conn
+from feedback_read import SOURCE_COLUMNS, refresh_feedback_read, team_assignments
+from result_cache import bump_data_version
+
+DEFAULT_BATCH_SIZE = 500
+
+def pending_count(db_path=None) -> int:
+    with read_conn(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM feedback WHERE team_method IS NULL").fetchone()[0]
+
+def mark_for_recompute(db_path=None) -> int:
+    """Queue every assigned (not Airtable-routed) row for the backfill. Returns rows queued."""
+    with write_conn(db_path) as conn:
+        return conn.execute(
+            "UPDATE feedback SET team_method = NULL WHERE team_method IS NOT NULL AND team_method != 'routed'"
+        ).rowcount
+
+def backfill_batch(db_path=None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Assign up to batch_size pending rows in one transaction. Returns rows assigned (0 when done)."""
+    with write_conn(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = [
+            dict(zip(SOURCE_COLUMNS, row)) for row in conn.execute(
+                f"SELECT {', '.join(SOURCE_COLUMNS)} FROM feedback WHERE team_method IS NULL LIMIT ?", (batch_size,)
+            )
+        ]
+        if not rows:
+            return 0
+        updates = [
+            (assignment["team_assigned"], assignment["team_method"], assignment["team_confidence"], row["id"])
+            for row, assignment in zip(rows, team_assignments(rows))
+        ]
+        conn.executemany(
+            "UPDATE feedback SET team_assigned = ?, team_method = ?, team_confidence = ? WHERE id = ?", updates
+        )
+        # Only batches that change a served team invalidate cached results
+        if refresh_feedback_read(conn, [row["id"] for row in rows]):
+            bump_data_version(conn)
+        return len(rows)
+
+def backfill(db_path=None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    total = pending_count(db_path)
+    print(f"🏷️ {total} feedback records pending team assignment")
+    done = 0
+    start = time.perf_counter()
+    while True:
+        assigned = backfill_batch(db_path, batch_size)
+        if not assigned:
+            break
+        done += assigned
+        print(f"  📈 Assigned {done}/{total} records ({done / (time.perf_counter() - start):,.0f}/s)")
+    print(f"✅ Team assignment backfill complete ({done} records)")
+    return done
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("db_path", nargs="?")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--recompute", action="store_true", help="Reassign every row not routed in Airtable")
+    args = parser.parse_args(argv)
+
+    from migrations import run_migrations
+    run_migrations(args.db_path)
+    if args.recompute:
+        print(f"🔄 Queued {mark_for_recompute(args.db_path)} records for reassignment")
+    backfill(args.db_path, args.batch_size)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Embedding storage benchmark: pickled numpy blobs vs raw float32 buffers.
+
+Fills a scratch jira_tickets table with pickled embeddings (the old format),
+then measures:
+  - decode: every blob to one float32 matrix, pickle.loads per row and a
+    stack vs one join and np.frombuffer (embedding_store.embedding_matrix)
+  - full index load from the database: SELECT plus decode and normalize, as
+    the Jira vector index did before and does now
+  - migration 11 converting the table in place (rows/s)
+  - stored bytes per vector
+The converted matrix is checked to equal the pickled one before timing.
+
+Usage: python benchmark_embedding_format.py [--tickets 5000] [--dim 1536] [--repeat 3]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+def _best(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def pickled_matrix(blobs) -> np.ndarray:
+    """Before: one pickle.loads (and array allocation) per row, then a stack."""
+    return np.array([pickle.loads(blob) for blob in blobs], dtype=np.float32)
+
+def normalized(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros(matrix.shape, dtype=np.float32), where=norms > 0)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from db_connection import read_conn, write_conn
+    from embedding_store import embedding_matrix
+    from jira_vector_index import JiraVectorIndex
+    from migrations import _m011_raw_float32_embeddings, run_migrations
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="voc-embeddings-"), "embeddings.db")
+    run_migrations(db_path)
+    vectors = np.random.default_rng(3).normal(size=(args.tickets, args.dim)).astype(np.float32)
+    with write_conn(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO jira_tickets (id, team_name, embedding) VALUES (?, ?, ?)",
+            ((f"VOC-{i}", f"Team {i % 12}", pickle.dumps(vector)) for i, vector in enumerate(vectors)),
+        )
+
+    def select_blobs(columns: str):
+        with read_conn(db_path) as conn:
+            return conn.execute(f"SELECT {columns} FROM jira_tickets WHERE embedding IS NOT NULL").fetchall()
+
+    pickled = [row[0] for row in select_blobs("embedding")]
+    pickled_bytes = sum(map(len, pickled))
+    pickled_decode = _best(args.repeat, lambda: pickled_matrix(pickled))
+    pickled_load = _best(args.repeat, lambda: normalized(pickled_matrix([row[0] for row in select_blobs("embedding")])))
+
+    start = time.perf_counter()
+    with write_conn(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        _m011_raw_float32_embeddings(conn)
+    migrate = time.perf_counter() - start
+
+    raw = [row[0] for row in select_blobs("embedding")]
+    if not np.array_equal(embedding_matrix(raw, args.dim), pickled_matrix(pickled)):
+        print("❌ Converted embeddings differ from the pickled ones")
+        return 1
+    raw_decode = _best(args.repeat, lambda: embedding_matrix(raw, args.dim))
+    raw_load = _best(args.repeat, lambda: len(JiraVectorIndex(db_path)))
+
+    print(f"📦 {args.tickets} embeddings x {args.dim} dims, best of {args.repeat}")
+    print(f"  bytes per vector   pickle {pickled_bytes / len(pickled):>10,.0f}      raw {sum(map(len, raw)) / len(raw):>10,.0f}")
+    print(f"  decode to matrix   pickle {pickled_decode * 1000:>10.1f} ms   raw {raw_decode * 1000:>10.1f} ms   "
+          f"({pickled_decode / raw_decode:.0f}x)")
+    print(f"  full index load    pickle {pickled_load * 1000:>10.1f} ms   raw {raw_load * 1000:>10.1f} ms   "
+          f"({pickled_load / raw_load:.1f}x)")
+    print(f"  migration 11       {args.tickets / migrate:>10,.0f} rows/s ({migrate:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
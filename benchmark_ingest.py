@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Ingest benchmark: the old per-row write paths vs the bulk_write/feedback_ingest ones.
+
+Generates synthetic Airtable records and loads them into freshly migrated
+scratch databases (typed feedback with its indexes and search triggers, and
+the feedback_cache JSON table):
+  - full load: REPLACE row by row into the live table vs shadow build + publish
+  - upsert: one execute per row vs chunked executemany, into the live table
+  - feedback_cache: the refresh's JSON upsert, per row vs chunked executemany
+
+Usage: python benchmark_ingest.py [--rows 50000] [--batch-size 500]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+WORDS = (
+    "login portal billing invoice slow error timeout dashboard export report payment mobile "
+    "crash sync email notification password reset account quote policy claim salesforce"
+).split()
+
+# Same shape intelligent_cache.init_schema creates
+FEEDBACK_CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS feedback_cache (
+        id TEXT PRIMARY KEY,
+        created_at TEXT,
+        modified_at TEXT,
+        fields_json TEXT
+    )
+"""
+
+# Year of the synthetic records; passed as the snapshot year so runs do not depend on the date
+BENCH_YEAR = 2025
+
+def synthetic_records(count: int, seed: int = 7):
+    rnd = random.Random(seed)
+    for i in range(count):
+        day = 1 + i % 28
+        yield {
+            "id": f"rec{i:07d}",
+            "createdTime": f"{BENCH_YEAR}-{1 + i % 12:02d}-{day:02d}T10:00:00.000Z",
+            "fields": {
+                "Initial Description": " ".join(rnd.choice(WORDS) for _ in range(25)),
+                "Notes": " ".join(rnd.choice(WORDS) for _ in range(8)),
+                "Priority": rnd.choice(["High", "Medium", "Low"]),
+                "Environment": rnd.choice(["Production", "Staging", "Client Portal"]),
+                "Area Impacted": rnd.choice(["Billing", "Salesforce", "Mobile"]),
+                "Status": rnd.choice(["New", "In Progress", "Done"]),
+                "Time to In Progress": str(rnd.uniform(0, 48)),
+                "Time From Report to Resolution": str(rnd.uniform(0, 240)),
+            },
+        }
+
+def _scratch_db(name: str) -> str:
+    from migrations import run_migrations
+    path = os.path.join(tempfile.mkdtemp(prefix="voc-bench-"), name)
+    run_migrations(path)
+    return path
+
+def _timed(db_path: str, write) -> float:
+    from db_connection import write_conn
+    start = time.perf_counter()
+    with write_conn(db_path) as conn:
+        write(conn)
+    return time.perf_counter() - start
+
+def _feedback_rows(records):
+    from feedback_ingest import FEEDBACK_ROW_COLUMNS, assign_pending_teams, record_to_row
+    rows = assign_pending_teams([record_to_row(record) for record in records])
+    return [tuple(row[c] for c in FEEDBACK_ROW_COLUMNS) for row in rows]
+
+def bench_full_load(records, batch_size: int):
+    """Old loader (REPLACE row by row into the live, indexed table) vs shadow build + publish."""
+    import feedback_ingest
+    from bulk_write import insert_sql
+    from feedback_ingest import FEEDBACK_ROW_COLUMNS
+
+    columns = tuple(FEEDBACK_ROW_COLUMNS)
+    rows = _feedback_rows(records)
+    sql = insert_sql("feedback", columns, "INSERT OR REPLACE")
+
+    def per_row(conn):
+        for row in rows:
+            conn.execute(sql, row)
+
+    before = _timed(_scratch_db("before.db"), per_row)
+
+    path = _scratch_db("after.db")
+    feedback_ingest.SNAPSHOT_CHUNK_SIZE = batch_size
+    start = time.perf_counter()
+    feedback_ingest.replace_feedback((dict(zip(columns, row)) for row in rows), path, year=BENCH_YEAR)
+    return len(rows), before, time.perf_counter() - start
+
+def bench_incremental(records, batch_size: int):
+    """Upsert into the live feedback table: one execute per row vs chunked executemany."""
+    from bulk_write import upsert_rows, upsert_sql
+    from feedback_ingest import FEEDBACK_ROW_COLUMNS
+
+    columns = tuple(FEEDBACK_ROW_COLUMNS)
+    rows = _feedback_rows(records)
+    sql = upsert_sql("feedback", columns)
+
+    def per_row(conn):
+        for row in rows:
+            conn.execute(sql, row)
+
+    def bulk(conn):
+        upsert_rows(conn, "feedback", columns, rows, batch_size=batch_size)
+
+    return len(rows), _timed(_scratch_db("before.db"), per_row), _timed(_scratch_db("after.db"), bulk)
+
+def bench_feedback_cache(records, batch_size: int):
+    from bulk_write import upsert_rows, upsert_sql
+    from db_connection import write_conn
+    from intelligent_cache import CACHE_COLUMNS
+
+    rows = [
+        (r["id"], r["createdTime"], r["createdTime"], json.dumps(r["fields"], ensure_ascii=False))
+        for r in records
+    ]
+    sql = upsert_sql("feedback_cache", CACHE_COLUMNS)
+
+    def per_row(conn):
+        for row in rows:
+            conn.execute(sql, row)
+
+    def bulk(conn):
+        upsert_rows(conn, "feedback_cache", CACHE_COLUMNS, rows, batch_size=batch_size)
+
+    results = []
+    for name, write in (("before.db", per_row), ("after.db", bulk)):
+        path = _scratch_db(name)
+        with write_conn(path) as conn:
+            conn.execute(FEEDBACK_CACHE_DDL)
+        results.append(_timed(path, write))
+    return len(rows), results[0], results[1]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    records = list(synthetic_records(args.rows))
+    print(f"📦 {args.rows} synthetic records, batch size {args.batch_size}")
+    benches = (
+        ("feedback full load", bench_full_load),
+        ("feedback upsert", bench_incremental),
+        ("feedback_cache upsert", bench_feedback_cache),
+    )
+    for label, bench in benches:
+        count, before, after = bench(records, args.batch_size)
+        print(
+            f"  {label:<22} before {count / before:>10,.0f} rows/s   "
+            f"after {count / after:>10,.0f} rows/s   ({before / after:.2f}x)"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
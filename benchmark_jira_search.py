@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Jira similarity search benchmark: per-query blob scan vs JiraVectorIndex.
+
+Fills a scratch database with synthetic ticket embeddings (text-embedding-3-small
+size by default) and runs the same queries both ways:
+  - before: SELECT every embedding, decode and normalize each row per query
+            (SemanticAnalyzer._semantic_jira_search before the index, which also
+            unpickled every row; see benchmark_embedding_format.py for that cost)
+  - after:  JiraVectorIndex.search, one matrix-vector product and argpartition
+Reports queries/sec, the index's one-off load time and memory, and checks
+both return the same top tickets.
+
+Usage: python benchmark_jira_search.py [--tickets 5000] [--dim 1536] [--queries 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+def scratch_tickets(count: int, dim: int, seed: int = 5) -> str:
+    from db_connection import write_conn
+    from embedding_store import EMBEDDING_MODEL, encode_embedding
+    from migrations import run_migrations
+
+    path = os.path.join(tempfile.mkdtemp(prefix="voc-jira-"), "jira.db")
+    run_migrations(path)
+    rnd = np.random.default_rng(seed)
+    with write_conn(path) as conn:
+        conn.executemany(
+            "INSERT INTO jira_tickets (id, summary, assignee, team_name, embedding, embedding_dim, embedding_model) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (f"VOC-{i}", f"ticket {i}", "", f"Team {i % 12}", encode_embedding(rnd.normal(size=dim)), dim,
+                 EMBEDDING_MODEL)
+                for i in range(count)
+            ),
+        )
+    return path
+
+def old_search(db_path: str, query: np.ndarray, top_n: int = 3):
+    from db_connection import read_conn
+    from embedding_store import decode_embedding
+
+    with read_conn(db_path) as conn:
+        rows = conn.execute(
+            "SELECT id, summary, assignee, team_name, embedding, embedding_dim FROM jira_tickets "
+            "WHERE embedding IS NOT NULL"
+        ).fetchall()
+    similarities = []
+    for j_id, summary, assignee, team, emb_blob, dim in rows:
+        embedding = decode_embedding(emb_blob, dim)
+        similarity = np.dot(query, embedding) / (np.linalg.norm(query) * np.linalg.norm(embedding))
+        similarities.append((similarity, j_id, summary or "", assignee or "", team or ""))
+    similarities.sort(reverse=True, key=lambda x: x[0])
+    return similarities[:top_n]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    from jira_vector_index import JiraVectorIndex
+
+    db_path = scratch_tickets(args.tickets, args.dim)
+    queries = np.random.default_rng(9).normal(size=(args.queries, args.dim)).astype(np.float32)
+
+    index = JiraVectorIndex(db_path)
+    start = time.perf_counter()
+    loaded = len(index)
+    load_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for query in queries
+        if [m[1] for m in old_search(db_path, query)] != [m[1] for m in index.search(query, 3)]
+    )
+    if mismatches:
+        print(f"❌ {mismatches} queries returned different tickets")
+        return 1
+
+    start = time.perf_counter()
+    for query in queries:
+        old_search(db_path, query)
+    before = (time.perf_counter() - start) / len(queries)
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, 3)
+    after = (time.perf_counter() - start) / len(queries)
+
+    print(f"📦 {loaded} tickets x {args.dim} dims, {args.queries} queries")
+    print(f"  index load (once)     {load_seconds * 1000:>9.1f} ms   matrix {index._state.matrix.nbytes / 2**20:,.1f} MB")
+    print(f"  before (blob scan)    {1 / before:>9,.1f} queries/s   {before * 1000:>8.2f} ms/query")
+    print(f"  after (vector index)  {1 / after:>9,.1f} queries/s   {after * 1000:>8.2f} ms/query   ({before / after:.0f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Rule routing benchmark: per-keyword ``in`` checks vs the compiled KeywordMatcher.
+
+Runs synthetic feedback (area impacted + description) through each rule
+engine, before and after, and reports records/sec. The rule tables also run
+through an alternation regex per rule (the road not taken; see
+keyword_matcher.py):
+  - team keywords: TeamAssignmentService's keyword stage over a synthetic
+    team directory (old _contains_keywords loop over every team)
+  - rules: team_analyzer.analyze_with_rules (old if/any chain)
+  - area: SemanticAnalyzer._assign_team_by_area (old if/elif chain)
+Every engine's results are checked to be identical before timing.
+
+Usage: python benchmark_keyword_matcher.py [--records 20000] [--repeat 3]
+"""
+import argparse
+import csv
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+TEAMS = [
+    "CRM SF", "Client Portal", "Agent Portal", "Billing", "Digital Payments", "Quotes", "Application",
+    "Policies", "Documents", "Workflows", "User Onboarding", "Data Platform", "IAM", "US Affinities",
+    "Market Integrations", "Orchestration", "Checkout", "Mobile", "Notifications", "Reporting",
+]
+
+AREAS = [
+    "Salesforce", "['Salesforce']", "Client Portal", "Billing", "Payments", "Quote Builder", "Documents",
+    "Underwriting", "Claims", "Dashboard", "Mobile App", "Search", "Login", "Exports", "Unknown", "",
+]
+
+WORDS = (
+    "login portal billing invoice slow error timeout dashboard export report payment mobile "
+    "crash sync email notification password reset account quote policy claim salesforce how to "
+    "feature request price training broken help improve"
+).split()
+
+# --- before: the implementations KeywordMatcher replaced -------------------------------
+
+def old_contains_keywords(area_impacted: str, team_name: str) -> bool:
+    from team_assignment_service import TEAM_KEYWORDS
+
+    if not area_impacted or not team_name:
+        return False
+    area_lower = area_impacted.lower()
+    team_lower = team_name.lower()
+    keyword_matches = dict(TEAM_KEYWORDS)  # rebuilt per call, as it was
+    for keyword, variations in keyword_matches.items():
+        if keyword in team_lower:
+            for variation in variations:
+                if variation in area_lower:
+                    return True
+    team_words = [word for word in team_lower.split() if len(word) > 3]
+    for word in team_words:
+        if word in area_lower:
+            return True
+    return False
+
+def old_keyword_team(service, area_impacted: str):
+    for team_name in service.get_all_teams():
+        if old_contains_keywords(area_impacted, team_name):
+            return team_name
+    return None
+
+def old_analyze_with_rules(description: str) -> str:
+    desc_lower = description.lower()
+    if any(word in desc_lower for word in ['error', 'bug', 'crash', 'broken', 'fail', 'exception', 'timeout']):
+        return "Engineering"
+    if any(word in desc_lower for word in ['how to', 'training', 'help', 'tutorial', 'guide']):
+        return "Support"
+    if any(word in desc_lower for word in ['price', 'quote', 'sales', 'cost', 'purchase']):
+        return "Sales"
+    if any(word in desc_lower for word in ['feature', 'request', 'enhance', 'improve', 'suggestion']):
+        return "Product"
+    return "Triage"
+
+def old_area_team(area_impacted: str) -> str:
+    if not area_impacted:
+        return "Triage"
+    area_lower = area_impacted.lower()
+    if "salesforce" in area_lower:
+        return "Salesforce Team"
+    elif "billing" in area_lower or "payment" in area_lower:
+        return "Billing Team"
+    elif "underwriting" in area_lower:
+        return "Underwriting Team"
+    elif "claims" in area_lower:
+        return "Claims Team"
+    elif "portal" in area_lower or "dashboard" in area_lower:
+        return "Portal Team"
+    return "Triage"
+
+def regex_first(rules):
+    """First-matching-rule lookup with one compiled alternation regex per rule."""
+    table = [(label, re.compile("|".join(re.escape(k.lower()) for k in sorted(keywords, key=len, reverse=True))))
+             for label, keywords in rules if keywords]
+
+    def first(text):
+        if not text:
+            return None
+        text = text.lower()
+        for label, pattern in table:
+            if pattern.search(text):
+                return label
+        return None
+    return first
+
+# ----------------------------------------------------------------------------------------
+
+def synthetic_feedback(count: int, seed: int = 7):
+    rnd = random.Random(seed)
+    return [(rnd.choice(AREAS), " ".join(rnd.choice(WORDS) for _ in range(25))) for _ in range(count)]
+
+def synthetic_service():
+    from team_assignment_service import TeamAssignmentService
+
+    path = os.path.join(tempfile.mkdtemp(prefix="voc-teams-"), "team_directory.csv")
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Team", "Tech Rep / Dev", "Tem Manager", "Product Manager"])
+        writer.writerows([name, "", "", ""] for name in TEAMS)
+    return TeamAssignmentService(path)
+
+def _rate(records, repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            fn(*record)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from semantic_analyzer import AREA_KEYWORDS, semantic_analyzer
+    from team_analyzer import RULE_KEYWORDS, analyze_with_rules
+    from team_assignment_service import team_terms
+
+    service = synthetic_service()
+    records = synthetic_feedback(args.records)
+    keyword_matcher = service._indexes().keyword_matcher
+    team_regex = regex_first([(name, team_terms(name)) for name in service.get_all_teams()])
+    rules_regex, area_regex = regex_first(RULE_KEYWORDS), regex_first(AREA_KEYWORDS)
+    # (name, before, after, regex or None)
+    engines = [
+        ("team keywords", lambda a, d: old_keyword_team(service, a), lambda a, d: keyword_matcher.first(a),
+         lambda a, d: team_regex(a)),
+        ("rules", lambda a, d: old_analyze_with_rules(d), lambda a, d: analyze_with_rules(d, "", "", a),
+         lambda a, d: rules_regex(d) or "Triage"),
+        ("area", lambda a, d: old_area_team(a), lambda a, d: semantic_analyzer._assign_team_by_area(a),
+         lambda a, d: area_regex(a) or "Triage"),
+    ]
+
+    print(f"📦 {args.records} synthetic records, {len(TEAMS)} teams, best of {args.repeat}")
+    for name, before, after, regex in engines:
+        mismatches = sum(1 for record in records if before(*record) != after(*record))
+        if mismatches:
+            print(f"❌ {name}: {mismatches} records routed differently")
+            return 1
+        old_rate, new_rate = _rate(records, args.repeat, before), _rate(records, args.repeat, after)
+        line = (f"  {name:<14} before {old_rate:>12,.0f} records/s   after {new_rate:>12,.0f} records/s   "
+                f"({new_rate / old_rate:.1f}x)")
+        if regex is not None:
+            line += f"   regex {_rate(records, args.repeat, regex):>12,.0f} records/s"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
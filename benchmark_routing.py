@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Routing engine benchmark: throughput, latency, memory and accuracy per engine.
+
+Runs one labeled corpus through the three team routing engines:
+  - assign_teams:      TeamAssignmentService.assign_teams (directory matching)
+  - semantic_analyzer: SemanticAnalyzer.assign_teams_to_issues (Jira embeddings)
+  - team_analyzer:     team_analyzer.analyze_team_batch (Jira matches, chat, rules)
+and reports, per engine, records/sec over the whole batch (best of --repeat),
+p50/p99 latency of single-record calls, peak Python memory of the batch
+(tracemalloc), accuracy against the label, and coverage (share of records
+routed to a team rather than Triage/Unassigned).
+
+The corpus is generated (a synthetic directory, feedback and Jira tickets
+per team, seeded) or replayed from a database with --db: feedback routed in
+Airtable, with team_routed as the label, and that database's Jira tickets.
+Either way it is loaded into a scratch database, and OpenAI is replaced by
+FakeOpenAI, a deterministic local fake (hashed bag-of-words embeddings, a
+keyword-picking chat model), so runs are repeatable, offline and free; the
+fake's call counts are reported too.
+
+Results are compared with the committed baseline (benchmark_baselines/routing.json)
+and --check exits non-zero on a regression: accuracy down more than 0.5
+points, or throughput/memory worse by more than --tolerance. Timings depend
+on the machine, so refresh the baseline with --save-baseline in the same
+change that moves the numbers, and compare throughput on like hardware.
+
+Usage: python benchmark_routing.py [--records 1000] [--repeat 3] [--latency-sample 200]
+                                   [--db path] [--check] [--save-baseline] [--baseline path]
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmark_baselines", "routing.json")
+EMBEDDING_DIM = 256
+# Accuracy may drop this much (absolute) before --check fails
+ACCURACY_TOLERANCE = 0.005
+UNROUTED = ("", "Triage", "Unassigned")
+
+# Synthetic directory: team -> (areas it is reported under, words its issues use)
+TEAM_TOPICS = {
+    "CRM SF": (["Salesforce", "CRM SF", "['Salesforce']"], "salesforce lead opportunity sync crm contact"),
+    "Client Portal": (["Client Portal", "Portal", "Customer portal"], "portal dashboard client view certificate"),
+    "Agent Portal": (["Agent Portal", "Agent dashboard"], "agent broker commission portal book"),
+    "Billing": (["Billing", "Invoices", "Billing page"], "invoice charge refund statement balance"),
+    "Digital Payments": (["Payments", "Digital Payments", "Card payments"], "card payment declined stripe ach"),
+    "Quotes": (["Quote Builder", "Quotes", "Quote flow"], "quote premium rate carrier bind"),
+    "Application": (["Application", "Application form"], "application form question submit applicant"),
+    "Policies": (["Policy admin", "Policies", "Policy page"], "policy coverage endorsement renewal cancel"),
+    "Documents": (["Documents", "Document upload"], "document pdf upload download attachment"),
+    "Workflows": (["Workflow engine", "Workflows"], "workflow task step approval queue"),
+    "User Onboarding": (["Onboarding flow", "User Onboarding", "Signup"], "signup onboarding welcome invite activation"),
+    "Data Platform": (["Data platform", "Data warehouse", "Reports data"], "data pipeline warehouse etl missing rows"),
+    "IAM": (["IAM", "Login", "Identity"], "login password sso mfa locked"),
+    "US Affinities": (["US Affinities", "Affinity programs"], "affinity partner program association member"),
+    "Market Integrations": (["Market Integrations", "Integrations"], "carrier api integration market appetite"),
+    "Orchestration": (["Orchestration", "Connect 3rd party"], "orchestration third party webhook retry event"),
+    "Checkout": (["Checkout", "Checkout page"], "checkout cart purchase confirm order"),
+    "Mobile": (["Mobile App", "Mobile", "iOS app"], "mobile ios android app crash"),
+    "Notifications": (["Notification center", "Notifications", "Emails"], "email notification reminder sms alert"),
+    "Reporting": (["Reportng", "Reporting", "Dashboards"], "report chart export metrics csv"),
+}
+NOISE_AREAS = ["Unknown", "", "Website", "Search", "Other"]
+NOISE_WORDS = (
+    "slow error timeout issue customer unable see wrong page again today please help urgent "
+    "after update since yesterday broken working expected shows blank fails"
+).split()
+
+# --- deterministic OpenAI stand-in --------------------------------------------------------
+
+def _tokens(text: str):
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+class FakeOpenAI:
+    """Offline stand-in for the OpenAI client's embeddings and chat completions."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self.calls = {"embeddings": 0, "chat": 0}
+        self.embeddings = SimpleNamespace(create=self._embed)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+
+    def _embed(self, model: str, input: str, **_):
+        """Hashed bag of words, L2-normalized: texts sharing words have cosine similarity > 0."""
+        self.calls["embeddings"] += 1
+        vector = [0.0] * self.dim
+        for token in _tokens(input):
+            h = zlib.crc32(token.encode())
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = sum(v * v for v in vector) ** 0.5 or 1.0
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[v / norm for v in vector])])
+
+    def _complete(self, model: str, messages, **_):
+        """Answers the team prompt with the first listed team named in the issue details, else Triage."""
+        self.calls["chat"] += 1
+        prompt = messages[-1]["content"]
+        teams = re.findall(r"\*\*(.+?)\*\*", prompt)
+        details = set(_tokens(prompt.split("Issue details:", 1)[-1]))
+        answer = next((team for team in teams if details.intersection(_tokens(team))), "Triage")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+# --- corpus -------------------------------------------------------------------------------
+
+def synthetic_corpus(count: int, seed: int = 23):
+    """(teams, issues, jira_tickets): seeded feedback and Jira tickets for TEAM_TOPICS, labeled."""
+    rnd = random.Random(seed)
+    teams = list(TEAM_TOPICS)
+    issues = []
+    for i in range(count):
+        team = rnd.choice(teams)
+        areas, topic = TEAM_TOPICS[team]
+        topic_words = topic.split()
+        words = rnd.sample(topic_words, rnd.randint(1, 3)) + [rnd.choice(NOISE_WORDS) for _ in range(12)]
+        rnd.shuffle(words)
+        issues.append({
+            "id": f"rec{i:07d}",
+            "description": " ".join(words),
+            "type": rnd.choice(["Bug", "Question", "Feature Request"]),
+            "status": rnd.choice(["New", "In Progress", "Done"]),
+            "area_impacted": rnd.choice(areas) if rnd.random() < 0.75 else rnd.choice(NOISE_AREAS),
+            "label": team,
+        })
+    jira = []
+    for team in teams:
+        topic_words = TEAM_TOPICS[team][1].split()
+        for j in range(12):
+            jira.append((
+                f"{team.replace(' ', '')[:6].upper()}-{j + 1}",
+                " ".join(rnd.sample(topic_words, 3)),
+                " ".join(rnd.sample(topic_words, 2) + [rnd.choice(NOISE_WORDS) for _ in range(6)]),
+                team,
+            ))
+    return teams, issues, jira
+
+def replay_corpus(db_path: str, count: int):
+    """(teams, issues, jira_tickets) from a real database: feedback routed in Airtable, labeled by team_routed."""
+    from feedback_read import SOURCE_COLUMNS, get_description, parse_area_impacted
+    from team_directory import team_directory
+
+    conn = sqlite3.connect(db_path)
+    try:
+        placeholders = ", ".join("?" for _ in UNROUTED)
+        rows = conn.execute(
+            f"SELECT {', '.join(SOURCE_COLUMNS)} FROM feedback "
+            f"WHERE team_routed IS NOT NULL AND team_routed NOT IN ({placeholders}) ORDER BY created DESC LIMIT ?",
+            (*UNROUTED, count),
+        ).fetchall()
+        jira = conn.execute(
+            "SELECT id, summary, description, team_name FROM jira_tickets WHERE team_name IS NOT NULL AND team_name != ''"
+        ).fetchall()
+    finally:
+        conn.close()
+    issues = []
+    for values in rows:
+        row = dict(zip(SOURCE_COLUMNS, values))
+        issues.append({
+            "id": row["id"],
+            "description": get_description(row),
+            "type": row.get("type_of_report") or "",
+            "status": row.get("status") or "",
+            "area_impacted": parse_area_impacted(row.get("area_impacted")),
+            "label": row["team_routed"],
+        })
+    return team_directory.snapshot().names, issues, jira
+
+def scratch_database(teams, jira):
+    """(db_path, csv_path): migrated scratch database holding the Jira tickets, and a directory CSV."""
+    from db_connection import write_conn
+    from migrations import run_migrations
+
+    folder = tempfile.mkdtemp(prefix="voc-routing-")
+    db_path = os.path.join(folder, "routing.db")
+    run_migrations(db_path)
+    with write_conn(db_path) as conn:
+        conn.executemany("INSERT INTO jira_tickets (id, summary, description, team_name) VALUES (?, ?, ?, ?)", jira)
+    csv_path = os.path.join(folder, "team_directory.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Team", "Tech Rep / Dev", "Tem Manager", "Product Manager"])
+        writer.writerows([name, "", "", ""] for name in teams)
+    return db_path, csv_path
+
+# --- engines ------------------------------------------------------------------------------
+
+def build_engines(db_path: str, csv_path: str, fake: FakeOpenAI):
+    """name -> batch(issues) -> teams in issue order. Points every engine at the scratch database and the fake."""
+    import semantic_analyzer as semantic_module
+    import team_analyzer
+    from team_assignment_service import TeamAssignmentService
+    from team_directory import TeamDirectory
+
+    for module in (semantic_module, team_analyzer):
+        module.openai_client = fake
+        module.OPENAI_AVAILABLE = True
+    team_analyzer.DB_PATH = db_path
+    analyzer = semantic_module.semantic_analyzer
+    analyzer.db_path = db_path
+    with _quiet():
+        analyzer.vectorize_jira_tickets()
+
+    service = TeamAssignmentService(directory=TeamDirectory(csv_path, use_database=False))
+
+    def assign_teams(issues):
+        return [result["team"] for result in service.assign_teams(
+            {"area_impacted": i["area_impacted"], "description": i["description"], "type_of_issue": i["type"]}
+            for i in issues
+        )]
+
+    def semantic(issues):
+        teams = analyzer.assign_teams_to_issues(issues)
+        return [teams.get(issue["id"]) for issue in issues]
+
+    def analyzer_batch(issues):
+        teams = team_analyzer.analyze_team_batch(issues)
+        return [teams.get(issue["id"]) for issue in issues]
+
+    return {"assign_teams": assign_teams, "semantic_analyzer": semantic, "team_analyzer": analyzer_batch}
+
+@contextlib.contextmanager
+def _quiet():
+    """The engines log per record; keep that off the report (and out of the timings' memory)."""
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        yield
+
+def _percentile(sorted_values, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def _normalized(team) -> str:
+    return " ".join((team or "").lower().split())
+
+def measure(batch, issues, repeat: int, latency_sample: int, fake: FakeOpenAI):
+    with _quiet():
+        before = dict(fake.calls)
+        predicted = batch(issues)
+        calls = {kind: (fake.calls[kind] - before[kind]) / len(issues) for kind in fake.calls}
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            batch(issues)
+            best = min(best, time.perf_counter() - start)
+
+        latencies = []
+        for issue in issues[:latency_sample]:
+            start = time.perf_counter()
+            batch([issue])
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+        tracemalloc.start()
+        batch(issues)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    correct = sum(1 for issue, team in zip(issues, predicted) if _normalized(team) == _normalized(issue["label"]))
+    routed = sum(1 for team in predicted if (team or "") not in UNROUTED)
+    return {
+        "records_per_sec": round(len(issues) / best, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 3),
+        "p99_ms": round(_percentile(latencies, 0.99), 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "accuracy": round(correct / len(issues), 4),
+        "coverage": round(routed / len(issues), 4),
+        "openai_calls_per_record": {kind: round(value, 3) for kind, value in calls.items()},
+    }
+
+# --- baselines ----------------------------------------------------------------------------
+
+def regressions(results, baseline, tolerance: float):
+    """Human-readable regressions of results against a baseline for the same corpus."""
+    found = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["accuracy"] < previous["accuracy"] - ACCURACY_TOLERANCE:
+            found.append(f"{name}: accuracy {previous['accuracy']:.2%} -> {current['accuracy']:.2%}")
+        if current["records_per_sec"] < previous["records_per_sec"] * (1 - tolerance):
+            found.append(f"{name}: {previous['records_per_sec']:,.0f} -> {current['records_per_sec']:,.0f} records/s")
+        if current["peak_memory_kb"] > previous["peak_memory_kb"] * (1 + tolerance):
+            found.append(f"{name}: peak memory {previous['peak_memory_kb']:,.0f} -> {current['peak_memory_kb']:,.0f} KB")
+    return found
+
+def _delta(current, previous, key: str) -> str:
+    if not previous or not previous.get(key):
+        return ""
+    return f" ({(current[key] - previous[key]) / previous[key]:+.0%})"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-sample", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=23)
+    parser.add_argument("--db", help="Replay feedback routed in Airtable from this database instead of generating")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed throughput/memory regression (fraction)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 when results regress against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        teams, issues, jira = replay_corpus(args.db, args.records)
+        corpus = {"source": "replay", "db": os.path.basename(args.db)}
+    else:
+        teams, issues, jira = synthetic_corpus(args.records, args.seed)
+        corpus = {"source": "synthetic", "seed": args.seed}
+    if not issues:
+        print("❌ No labeled feedback to benchmark")
+        return 1
+    corpus.update(records=len(issues), teams=len(teams), jira_tickets=len(jira))
+
+    fake = FakeOpenAI()
+    db_path, csv_path = scratch_database(teams, jira)
+    engines = build_engines(db_path, csv_path, fake)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            saved = json.load(handle)
+        if saved.get("corpus") == corpus:
+            baseline = saved.get("engines", {})
+        else:
+            print(f"⚠️ Baseline corpus differs ({saved.get('corpus')}); not comparing")
+
+    print(f"📦 {corpus['records']} {corpus['source']} records, {len(teams)} teams, {len(jira)} Jira tickets, "
+          f"best of {args.repeat}, latency over {min(args.latency_sample, len(issues))} single-record calls")
+    results = {}
+    for name, batch in engines.items():
+        result = results[name] = measure(batch, issues, args.repeat, args.latency_sample, fake)
+        previous = baseline.get(name)
+        calls = ", ".join(f"{kind} {value:g}" for kind, value in result["openai_calls_per_record"].items())
+        print(
+            f"  {name:<18} {result['records_per_sec']:>10,.0f} records/s{_delta(result, previous, 'records_per_sec'):<7}"
+            f"  p50 {result['p50_ms']:>8.3f} ms  p99 {result['p99_ms']:>8.3f} ms"
+            f"  peak {result['peak_memory_kb']:>8,.0f} KB{_delta(result, previous, 'peak_memory_kb'):<7}"
+            f"  accuracy {result['accuracy']:>6.1%}  coverage {result['coverage']:>6.1%}  openai/record: {calls}"
+        )
+
+    found = regressions(results, baseline, args.tolerance)
+    for line in found:
+        print(f"❌ Regression: {line}")
+    if baseline and not found:
+        print(f"✅ No regressions against {os.path.relpath(args.baseline, ROOT)}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({"corpus": corpus, "engines": results}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"💾 Saved baseline to {os.path.relpath(args.baseline, ROOT)}")
+    return 1 if args.check and found else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: FastAPI's default JSON path vs json_response + compression.
+
+Builds a synthetic GET /feedback payload (rows in the feedback_read response
+shape, from benchmark_ingest's synthetic Airtable records) and times:
+  - encode: FastAPI default (response-model validation + jsonable_encoder +
+    stdlib json) vs FastJSONResponse rendered directly (orjson when installed)
+  - compress: payload size and time for gzip (level GZIP_LEVEL) and zstd
+    (level ZSTD_LEVEL, when zstandard is installed)
+  - format: rows vs format=columnar payload size (plain and gzip) and the
+    client-side parse time (json.loads, as a browser's JSON.parse would do)
+
+Usage: python benchmark_serialization.py [--rows 20000] [--repeat 5]
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+def synthetic_payload(count: int) -> List[Dict[str, Any]]:
+    from benchmark_ingest import synthetic_records
+    from feedback_ingest import record_to_row
+    from feedback_read import RESPONSE_COLUMNS, read_row
+
+    rows = []
+    for record in synthetic_records(count):
+        row = read_row(record_to_row(record))
+        rows.append({name: row[name] for name in RESPONSE_COLUMNS})
+    return rows
+
+def _best(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_encode(rows, repeat: int):
+    """Seconds for (FastAPI default path, direct FastJSONResponse)."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from json_response import FastJSONResponse
+
+    # What an endpoint annotated -> List[Dict[str, Any]] returning a list goes through
+    adapter = TypeAdapter(List[Dict[str, Any]])
+
+    def default_path():
+        JSONResponse(jsonable_encoder(adapter.validate_python(rows)))
+
+    def direct():
+        FastJSONResponse(rows)
+
+    return _best(repeat, default_path), _best(repeat, direct)
+
+def bench_compress(body: bytes, repeat: int):
+    """[(encoding, compressed bytes, seconds)]"""
+    from compression import GZIP_LEVEL, ZSTD_LEVEL, zstandard
+
+    results = [("gzip", len(gzip.compress(body, GZIP_LEVEL)),
+                _best(repeat, lambda: gzip.compress(body, GZIP_LEVEL)))]
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        results.append(("zstd", len(compressor.compress(body)), _best(repeat, lambda: compressor.compress(body))))
+    return results
+
+def bench_formats(rows, repeat: int):
+    """[(format, bytes, gzip bytes, parse seconds)]"""
+    import json
+    from app.routers.feedback import DICTIONARY_COLUMNS
+    from columnar import to_columnar
+    from compression import GZIP_LEVEL
+    from feedback_read import RESPONSE_COLUMNS
+    from json_response import dumps
+
+    payloads = {
+        "rows": dumps(rows),
+        "columnar": dumps(to_columnar(
+            RESPONSE_COLUMNS, [[row[name] for name in RESPONSE_COLUMNS] for row in rows], DICTIONARY_COLUMNS
+        )),
+    }
+    return [(name, len(body), len(gzip.compress(body, GZIP_LEVEL)), _best(repeat, lambda: json.loads(body)))
+            for name, body in payloads.items()]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from json_response import dumps, orjson
+
+    rows = synthetic_payload(args.rows)
+    body = dumps(rows)
+    print(f"📦 {args.rows} rows, {len(body) / 1e6:.2f} MB JSON, best of {args.repeat}")
+
+    before, after = bench_encode(rows, args.repeat)
+    encoder = "orjson" if orjson is not None else "stdlib json (orjson not installed)"
+    print(f"  encode   default {before * 1000:>8.1f} ms   direct {after * 1000:>8.1f} ms   "
+          f"({before / after:.1f}x, {encoder})")
+
+    for encoding, size, seconds in bench_compress(body, args.repeat):
+        print(f"  {encoding:<8} {size / 1e3:>8.0f} KB ({len(body) / size:.1f}x smaller) in {seconds * 1000:.1f} ms")
+
+    formats = bench_formats(rows, args.repeat)
+    _, base_size, base_gzip, base_parse = formats[0]
+    for name, size, gzipped, seconds in formats:
+        print(f"  {name:<8} {size / 1e3:>8.0f} KB ({base_size / size:.1f}x)   gzip {gzipped / 1e3:>6.0f} KB "
+              f"({base_gzip / gzipped:.1f}x)   parse {seconds * 1000:>7.1f} ms ({base_parse / seconds:.1f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
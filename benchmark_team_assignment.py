@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Team assignment benchmark: per-record SequenceMatcher loop vs batch assign_teams.
+
+Scores a synthetic year of feedback (area impacted, description, type) against
+the synthetic team directory from benchmark_keyword_matcher, before and after:
+  - before: assign_team per record, keyword checks then a difflib
+    SequenceMatcher ratio against every team name
+  - after:  TeamAssignmentService.assign_teams over the whole batch, keyword
+    checks per distinct area then one character n-gram TF-IDF product
+Reports records/sec and how often the two pick the same team. The scorers
+differ (edit-based ratio vs n-gram cosine), so agreement is not 100%.
+
+Usage: python benchmark_team_assignment.py [--records 50000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+from benchmark_keyword_matcher import WORDS, old_contains_keywords, synthetic_service
+
+# Typos and near misses of team names as well as unrelated areas
+AREAS = [
+    "Salesforce", "Client Portal", "Agent portal login", "Billing", "Payments", "Quote Builder", "Documents",
+    "Underwriting", "Claims", "Dashboard", "Mobile App", "Search", "Reportng", "Notification center",
+    "Onboarding flow", "Data platfrom", "Workflow engine", "Policy admin", "Checkout page", "Integrations",
+    "Unknown", "",
+]
+TYPES = ["Bug", "Feature Request", "Question", "Data Issue", ""]
+
+def old_assign_team(service, area_impacted: str, description: str = "", type_of_issue: str = "") -> str:
+    """assign_team before assign_teams: every team scored with SequenceMatcher, one record at a time."""
+    if not area_impacted or area_impacted.lower() in ['unknown', 'n/a', '']:
+        return "Unassigned"
+    best_match, best_score = None, 0.0
+    full_text = f"{area_impacted} {description} {type_of_issue}".lower()
+    for team_name in service.get_all_teams():
+        if old_contains_keywords(area_impacted, team_name):
+            return team_name
+        similarity = SequenceMatcher(None, area_impacted.lower(), team_name.lower()).ratio()
+        if team_name.lower() in full_text:
+            similarity += 0.3
+        if set(team_name.lower().split()).intersection(set(area_impacted.lower().split())):
+            similarity += 0.2
+        if similarity > best_score:
+            best_score, best_match = similarity, team_name
+    return best_match if best_score >= 0.4 else "Unassigned"
+
+def synthetic_records(count: int, seed: int = 11):
+    rnd = random.Random(seed)
+    return [
+        {
+            "area_impacted": rnd.choice(AREAS),
+            "description": " ".join(rnd.choice(WORDS) for _ in range(25)),
+            "type_of_issue": rnd.choice(TYPES),
+        }
+        for _ in range(count)
+    ]
+
+def _best(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    service = synthetic_service()
+    records = synthetic_records(args.records)
+
+    def before():
+        return [old_assign_team(service, r["area_impacted"], r["description"], r["type_of_issue"]) for r in records]
+
+    def after():
+        return [result["team"] for result in service.assign_teams(records)]
+
+    agreement = sum(1 for old, new in zip(before(), after()) if old == new) / len(records)
+    old_seconds, new_seconds = _best(args.repeat, before), _best(args.repeat, after)
+    print(f"📦 {args.records} synthetic records, {len(service.get_all_teams())} teams, {len(AREAS)} distinct areas, "
+          f"best of {args.repeat}")
+    print(f"  per-record SequenceMatcher {args.records / old_seconds:>12,.0f} records/s")
+    print(f"  batch assign_teams         {args.records / new_seconds:>12,.0f} records/s   "
+          f"({old_seconds / new_seconds:.1f}x)")
+    print(f"  same team for {agreement:.1%} of records")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Batched write helpers shared by every ingest path.
+
+Rows are written with chunked executemany instead of one execute per row,
+so sqlite binds the same prepared statement for the whole chunk. The SQL
+text for a (table, columns, key) shape is built once and memoized; since
+sqlite3 caches prepared statements by SQL text (see STATEMENT_CACHE_SIZE in
+db_connection), repeated chunks and repeated refreshes reuse one statement.
+
+Helpers run inside the caller's transaction; batch_size bounds how many rows
+are materialized per executemany call.
+"""
+import sqlite3
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Mapping, Sequence, Tuple, Union
+
+DEFAULT_BATCH_SIZE = 500
+
+Row = Union[Mapping[str, Any], Sequence[Any]]
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items from any iterable (generators stay lazy)."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+@lru_cache(maxsize=None)
+def insert_sql(table: str, columns: Tuple[str, ...], verb: str = "INSERT") -> str:
+    placeholders = ", ".join("?" for _ in columns)
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+@lru_cache(maxsize=None)
+def upsert_sql(table: str, columns: Tuple[str, ...], key: Tuple[str, ...] = ("id",),
+               reset: Tuple[str, ...] = (), reset_when: Tuple[str, ...] = ()) -> str:
+    """
+    INSERT ... ON CONFLICT(key) DO UPDATE of every non-key column (rowid and untouched
+    columns are kept). Columns in reset are set to NULL on rows where any reset_when
+    column changes (values derived from them, e.g. an embedding of the text).
+    """
+    updates = [f"{name} = excluded.{name}" for name in columns if name not in key]
+    if reset and reset_when:
+        # SET expressions all see the row as it was before the update
+        changed = " OR ".join(f"{table}.{name} IS NOT excluded.{name}" for name in reset_when)
+        updates += [f"{name} = CASE WHEN {changed} THEN NULL ELSE {table}.{name} END" for name in reset]
+    updates = ", ".join(updates)
+    conflict = f"ON CONFLICT({', '.join(key)}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING")
+    return f"{insert_sql(table, columns)} {conflict}"
+
+def _as_tuple(row: Row, columns: Tuple[str, ...]) -> Sequence[Any]:
+    if isinstance(row, Mapping):
+        return tuple(row.get(name) for name in columns)
+    return row
+
+def _write(conn: sqlite3.Connection, sql: str, columns: Tuple[str, ...], rows: Iterable[Row], batch_size: int) -> int:
+    written = 0
+    for chunk in chunked(rows, batch_size):
+        conn.executemany(sql, [_as_tuple(row, columns) for row in chunk])
+        written += len(chunk)
+    return written
+
+def insert_rows(conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: Iterable[Row],
+                batch_size: int = DEFAULT_BATCH_SIZE, verb: str = "INSERT") -> int:
+    """Insert rows (mappings or sequences in column order). Returns rows written."""
+    columns = tuple(columns)
+    return _write(conn, insert_sql(table, columns, verb), columns, rows, batch_size)
+
+def upsert_rows(conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: Iterable[Row],
+                key: Sequence[str] = ("id",), batch_size: int = DEFAULT_BATCH_SIZE,
+                reset: Sequence[str] = (), reset_when: Sequence[str] = ()) -> int:
+    """
+    Insert or update rows by key (mappings or sequences in column order); see
+    upsert_sql for reset/reset_when. Returns rows written.
+    """
+    columns = tuple(columns)
+    sql = upsert_sql(table, columns, tuple(key), tuple(reset), tuple(reset_when))
+    return _write(conn, sql, columns, rows, batch_size)
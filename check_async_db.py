@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Lint guard: fail if an async route opens a blocking sqlite connection.
+
+Async endpoints must go through async_db (fetch_all/fetch_one/execute/run_sync).
+db_connection also raises BlockingDatabaseCall at runtime; this script catches
+the same mistakes before deploy. Exits non-zero when violations are found.
+
+Usage: python check_async_db.py [paths...]
+"""
+import ast
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATHS = [os.path.join(ROOT, "main.py"), os.path.join(ROOT, "app")]
+
+# Calls that open or hand out a blocking connection
+BLOCKING_CALLS = {"read_conn", "write_conn", "db_conn", "_connect", "get_read_pool"}
+# Dependencies that yield a blocking connection into the endpoint
+BLOCKING_DEPENDENCIES = {"get_db"}
+
+def _call_name(node: ast.Call) -> str:
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        if isinstance(func.value, ast.Name) and func.value.id == "sqlite3" and func.attr == "connect":
+            return "sqlite3.connect"
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return ""
+
+def _walk_coroutine(node: ast.AsyncFunctionDef):
+    """Walk a coroutine body without descending into nested sync helpers (those may be run_sync targets)."""
+    stack = list(node.body)
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.FunctionDef, ast.Lambda)):
+            continue
+        yield child
+        stack.extend(ast.iter_child_nodes(child))
+
+def check_file(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    violations = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+
+        for default in node.args.defaults + node.args.kw_defaults:
+            if isinstance(default, ast.Call) and _call_name(default) == "Depends" and default.args:
+                dep = default.args[0]
+                if isinstance(dep, ast.Name) and dep.id in BLOCKING_DEPENDENCIES:
+                    violations.append((node.lineno, node.name, f"Depends({dep.id})"))
+
+        for child in _walk_coroutine(node):
+            if isinstance(child, ast.Call):
+                name = _call_name(child)
+                if name == "sqlite3.connect" or name in BLOCKING_CALLS:
+                    violations.append((child.lineno, node.name, name))
+
+    return violations
+
+def iter_python_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if filename.endswith(".py"):
+                        yield os.path.join(dirpath, filename)
+        elif path.endswith(".py"):
+            yield path
+
+def main(argv=None) -> int:
+    paths = (argv if argv is not None else sys.argv[1:]) or DEFAULT_PATHS
+    found = 0
+    for path in iter_python_files(paths):
+        for lineno, func, name in check_file(path):
+            print(f"{os.path.relpath(path, ROOT)}:{lineno}: async def {func}() uses blocking {name}")
+            found += 1
+
+    if found:
+        print(f"❌ {found} blocking database call(s) inside coroutines")
+        return 1
+    print("✅ No blocking database calls inside coroutines")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
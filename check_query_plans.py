@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Query plan guard: fail if a hot API query regresses to a full table scan.
+
+Runs EXPLAIN QUERY PLAN for every query in HOT_QUERIES against a freshly
+migrated scratch database (or the given one) and reports any plan step that
+scans a table without an index or sorts through a temp B-tree.
+Add new endpoint queries here when they are introduced.
+
+Usage: python check_query_plans.py [db_path]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+FEEDBACK_SELECT = """
+    SELECT id, directory_link, created, week, initial_description,
+           priority, notes, triage_rep, status, resolution_notes,
+           related_imt, related_imt_link, type_of_report, area_impacted,
+           environment, time_to_in_progress, time_from_in_progress_to_done,
+           time_from_reported_to_imt_review, time_from_imt_review_to_done,
+           time_from_report_to_resolution, source, team_routed
+    FROM feedback
+"""
+
+FEEDBACK_READ_SELECT = """
+    SELECT id, description, priority, team, environment, area_impacted, created, week,
+           issue_number, status, reporter_email, slack_thread, type_of_issue,
+           type_of_report, source, triage_rep
+    FROM feedback_read
+"""
+
+# name -> (sql, params)
+HOT_QUERIES: Dict[str, Tuple[str, tuple]] = {
+    "feedback.list": (FEEDBACK_READ_SELECT + " ORDER BY created DESC, id DESC", ()),
+    "feedback.list_by_team": (FEEDBACK_READ_SELECT + " WHERE team = ? ORDER BY created DESC, id DESC", ("Engineering",)),
+    "feedback.list_by_priority": (FEEDBACK_READ_SELECT + " WHERE priority_rank = ? ORDER BY created DESC, id DESC", (1,)),
+    "feedback.list_by_environment": (FEEDBACK_READ_SELECT + " WHERE environment_raw = ? ORDER BY created DESC, id DESC", ("Production",)),
+    "feedback.page_after": (FEEDBACK_READ_SELECT + " WHERE (created, id) < (?, ?) ORDER BY created DESC, id DESC LIMIT ?", ("2025-06-01", "rec1", 51)),
+    "feedback.page_by_team_after": (FEEDBACK_READ_SELECT + " WHERE team = ? AND (created, id) < (?, ?) ORDER BY created DESC, id DESC LIMIT ?", ("Engineering", "2025-06-01", "rec1", 51)),
+    "feedback.count": ("SELECT COUNT(*) FROM feedback_read", ()),
+    "feedback.count_by_priority": ("SELECT COUNT(*) FROM feedback_read WHERE priority_rank = ?", (1,)),
+    "feedback.by_id": (FEEDBACK_READ_SELECT + " WHERE id = ?", ("rec1",)),
+    "feedback.source_by_id": (FEEDBACK_SELECT + " WHERE id = ?", ("rec1",)),
+    "feedback.created_range": (FEEDBACK_SELECT + " WHERE created_ts >= ? AND created_ts < ?", (1735689600, 1738368000)),
+    "feedback.search": ("""
+        SELECT f.id FROM feedback_fts JOIN feedback AS f ON f.rowid = feedback_fts.rowid
+        WHERE feedback_fts MATCH ? ORDER BY feedback_fts.rank LIMIT 5""", ('"login"',)),
+    "jira.search": ("""
+        SELECT j.id FROM jira_fts JOIN jira_tickets AS j ON j.rowid = jira_fts.rowid
+        WHERE jira_fts MATCH ? ORDER BY jira_fts.rank LIMIT 3""", ('"login"',)),
+    "feedback.changes": ("""
+        SELECT c.id, c.deleted, r.id IS NOT NULL, r.description
+        FROM feedback_changes AS c LEFT JOIN feedback_read AS r ON r.id = c.id
+        WHERE c.version > ? AND c.version <= ? LIMIT ?""", (10, 12, 5001)),
+    "feedback.changes_prune": ("DELETE FROM feedback_changes WHERE version <= ? AND deleted = 1", (10,)),
+    "feedback.team_pending": ("SELECT id, area_impacted FROM feedback WHERE team_method IS NULL LIMIT ?", (500,)),
+    "components.environments": ("SELECT DISTINCT environment FROM feedback WHERE environment IS NOT NULL AND environment != ''", ()),
+    "components.areas": ("SELECT DISTINCT area_impacted FROM feedback WHERE area_impacted IS NOT NULL AND area_impacted != ''", ()),
+    "components.types": ("SELECT DISTINCT type_of_report FROM feedback WHERE type_of_report IS NOT NULL AND type_of_report != ''", ()),
+}
+
+# GET /feedback filter specs, compiled by feedback_query exactly as the endpoint does
+BUILDER_SPECS: Dict[str, dict] = {
+    "feedback.query.created_range": dict(created_from="2025-01-01", created_to="2025-03-31"),
+    "feedback.query.status": dict(filters={"status": ["New"]}),
+    "feedback.query.area": dict(filters={"area": ["Salesforce"]}),
+    "feedback.query.source": dict(filters={"source": ["Slack"]}),
+    "feedback.query.team_created_range": dict(filters={"team": ["Engineering"]}, created_from="2025-01-01"),
+    "feedback.query.oldest_first": dict(sort="created"),
+}
+
+# Specs whose matches are found by an indexed lookup and then sorted (IN-lists,
+# text match): a temp B-tree over the matched rows is expected, a table scan is not
+SORTED_AFTER_LOOKUP_SPECS: Dict[str, dict] = {
+    "feedback.query.status_in": dict(filters={"status": ["New", "Done"]}),
+    "feedback.query.text": dict(text="login error"),
+    "feedback.query.unassigned": dict(filters={"team": ["Unassigned"]}),
+    "feedback.query.unknown_environment": dict(filters={"environment": ["Unknown"]}),
+}
+
+def builder_queries(specs: Dict[str, dict]) -> Dict[str, Tuple[str, tuple]]:
+    from feedback_query import FeedbackQuery
+    from feedback_read import RESPONSE_COLUMNS
+
+    return {name: FeedbackQuery(**spec).select(RESPONSE_COLUMNS, limit=50) for name, spec in specs.items()}
+
+def facet_queries() -> Dict[str, Tuple[str, tuple]]:
+    from feedback_facets import cube_sql
+
+    return {"feedback.facets": (cube_sql("")[0], ())}
+
+def plan_problems(detail: str, allow_sort: bool = False) -> bool:
+    """A plan step is a regression if it scans a table without an index or sorts in a temp B-tree."""
+    # FTS5 MATCH lookups show up as a SCAN of the virtual table with an index plan
+    if detail.startswith("SCAN ") and "USING" not in detail and "VIRTUAL TABLE INDEX" not in detail:
+        return True
+    return not allow_sort and "USE TEMP B-TREE" in detail
+
+def check_plans(conn: sqlite3.Connection) -> Tuple[int, List[Tuple[str, str]]]:
+    """Returns (queries checked, [(query name, offending plan step)])."""
+    checks = [(HOT_QUERIES, False), (builder_queries(BUILDER_SPECS), False),
+              (builder_queries(SORTED_AFTER_LOOKUP_SPECS), True), (facet_queries(), False)]
+    checked = 0
+    problems = []
+    for queries, allow_sort in checks:
+        for name, (sql, params) in queries.items():
+            checked += 1
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+                detail = row[-1]
+                if plan_problems(detail, allow_sort):
+                    problems.append((name, detail))
+    return checked, problems
+
+def main(argv=None) -> int:
+    argv = argv if argv is not None else sys.argv[1:]
+    scratch = None
+    if argv:
+        db_path = argv[0]
+    else:
+        scratch = tempfile.mkdtemp(prefix="voc-plans-")
+        db_path = os.path.join(scratch, "plans.db")
+
+    from migrations import run_migrations
+    version = run_migrations(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        checked, problems = check_plans(conn)
+    finally:
+        conn.close()
+
+    if problems:
+        for name, detail in problems:
+            print(f"❌ {name}: {detail}")
+        print(f"❌ {len(problems)} query plan regression(s) at schema version {version}")
+        return 1
+    print(f"✅ {checked} hot queries use indexes at schema version {version}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
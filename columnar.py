@@ -0,0 +1,44 @@
+"""
+Columnar (struct-of-arrays) encoding for list responses.
+
+A list of N rows is sent as one array per column instead of N objects, so key
+names appear once rather than once per row:
+
+    {"columns": ["id", "team", ...],
+     "count": N,
+     "data": {"id": [...], "team": [0, 1, 0, ...], ...},
+     "dictionaries": {"team": ["Engineering", "CRM SF", ...]}}
+
+Low-cardinality columns are dictionary encoded: data holds an index into that
+column's dictionaries entry (values in first-seen order) instead of the
+repeated string. Row i is {c: data[c][i]} with dictionary columns looked up,
+which the client can also leave as indexes for grouping and filtering.
+Repeated short integers also compress much better than repeated strings.
+"""
+from typing import Any, Dict, List, Sequence
+
+FORMATS = ("rows", "columnar")
+
+def parse_format(value: str) -> str:
+    """Validated format= value; ValueError for anything unknown."""
+    if value not in FORMATS:
+        raise ValueError(f"Unknown format: {value}. Allowed: {', '.join(FORMATS)}")
+    return value
+
+def to_columnar(
+    names: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    dictionary_columns: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """Encode rows (sequences in names order, extra trailing values ignored) column by column."""
+    columns = list(zip(*rows)) if rows else [() for _ in names]
+    data: Dict[str, List[Any]] = {}
+    dictionaries: Dict[str, List[Any]] = {}
+    for name, values in zip(names, columns):
+        if name in dictionary_columns:
+            lookup: Dict[Any, int] = {}
+            data[name] = [lookup.setdefault(value, len(lookup)) for value in values]
+            dictionaries[name] = list(lookup)
+        else:
+            data[name] = list(values)
+    return {"columns": list(names), "count": len(rows), "data": data, "dictionaries": dictionaries}
@@ -4,6 +4,8 @@ Continue team assignment in smaller batches to avoid timeouts.
 """
 
 import sqlite3
+from feedback_read import refresh_feedback_read
+from result_cache import bump_data_version
 import time
 import logging
 import random
@@ -62,6 +64,8 @@ def continue_assignment():
                     "UPDATE feedback SET team_routed = ? WHERE id = ?",
                     (assigned_team, f_id)
                 )
+                refresh_feedback_read(conn, [f_id])  # keep /feedback rows in sync
+                bump_data_version(conn)  # invalidate cached API results
                 conn.commit()
                 conn.close()
                 
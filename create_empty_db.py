@@ -6,6 +6,7 @@ def create_empty_database():
     """Create an empty database with the required schema"""
     try:
         conn = sqlite3.connect(DB_PATH)
+        conn.execute("PRAGMA recursive_triggers=ON")  # REPLACE keeps the search index in sync
         cursor = conn.cursor()
         
         # Create feedback table with minimal schema
@@ -8,6 +8,8 @@ import os
 import hashlib
 import csv
 from datetime import datetime
+from bulk_write import upsert_rows
+from migrations import JIRA_CSV_COLUMNS, JIRA_EMBEDDED_COLUMNS, JIRA_EMBEDDING_COLUMNS
 from config import DB_PATH, AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME
 
 class DatabaseManager:
@@ -96,8 +98,13 @@ class DatabaseManager:
             
             conn.commit()
             conn.close()
+            
+            # Bring the schema up to date (full feedback columns, query indexes)
+            from migrations import run_migrations
+            schema_version = run_migrations(self.db_path)
+            
             self.health_status["tables"] = True
-            print("✅ All database tables created successfully")
+            print(f"✅ All database tables created successfully (schema version {schema_version})")
             return True
             
         except Exception as e:
@@ -175,6 +182,7 @@ class DatabaseManager:
             
             print(f"📂 Loading Jira tickets from {csv_path}")
             loaded_count = 0
+            tickets = []
             
             with open(csv_path, 'r', encoding='utf-8') as csvfile:
                 reader = csv.DictReader(csvfile)
@@ -194,14 +202,15 @@ class DatabaseManager:
                     team_name = (row.get('Team Name') or row.get('Team') or 
                                 row.get('Component/s') or '').strip()
                     
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO jira_tickets 
-                        (id, summary, description, resolution, assignee, team_name)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (issue_id, summary, description, resolution, assignee, team_name))
+                    tickets.append((issue_id, summary, description, resolution, assignee, team_name))
                     
                     loaded_count += 1
             
+            upsert_rows(
+                conn, "jira_tickets", JIRA_CSV_COLUMNS, tickets,
+                reset=JIRA_EMBEDDING_COLUMNS, reset_when=JIRA_EMBEDDED_COLUMNS
+            )
+            
             # Update metadata
             cursor.execute("""
                 INSERT OR REPLACE INTO cache_metadata (key, value)
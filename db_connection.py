@@ -1,19 +1,153 @@
+import asyncio
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 from config import DB_PATH
 
-def _connect():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)  # background thread safe
+# Prepared statements sqlite3 keeps per connection (stdlib default is 128)
+STATEMENT_CACHE_SIZE = 256
+# Idle read connections kept open per database file
+READ_POOL_SIZE = 8
+
+def _connect(db_path=None):
+    conn = sqlite3.connect(
+        db_path or DB_PATH,
+        check_same_thread=False,  # background thread safe
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
     conn.execute("PRAGMA busy_timeout=5000;")
+    # INSERT OR REPLACE must fire delete triggers so the FTS indexes stay in sync
+    conn.execute("PRAGMA recursive_triggers=ON;")
     return conn
 
+class BlockingDatabaseCall(RuntimeError):
+    """Raised when a blocking connection is opened on the event loop thread."""
+
+def _ensure_off_event_loop():
+    # Async routes must go through async_db, which runs queries on its executor
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise BlockingDatabaseCall(
+        "Blocking sqlite access inside a coroutine; use async_db.fetch_all/fetch_one/execute/run_sync"
+    )
+
+class ReadPool:
+    """
+    Reusable read-only connections for one database file.
+
+    A connection is checked out by a single caller at a time, so it is safe to
+    hand one to a FastAPI dependency and use it from a different worker thread.
+    """
+
+    def __init__(self, db_path: str, size: int = READ_POOL_SIZE):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            conn = _connect(self.db_path)
+            conn.isolation_level = None  # autocommit: readers never pin a snapshot
+            conn.execute("PRAGMA query_only=ON;")
+            return conn
+
+    def release(self, conn: sqlite3.Connection):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_read_pool(db_path=None) -> ReadPool:
+    path = db_path or DB_PATH
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ReadPool(path)
+        return pool
+
 @contextmanager
-def db_conn():
-    conn = _connect()
+def read_conn(db_path=None):
+    """Check out a pooled read-only connection."""
+    _ensure_off_event_loop()
+    pool = get_read_pool(db_path)
+    conn = pool.acquire()
     try:
         yield conn
-        conn.commit()
     finally:
-        conn.close()
\ No newline at end of file
+        pool.release(conn)
+
+# One writer per database file; every write goes through it under this lock
+_writers = {}
+_write_lock = threading.RLock()
+# write_conn blocks open per database file in the thread holding _write_lock
+_write_depth = {}
+
+@contextmanager
+def write_conn(db_path=None):
+    """
+    Serialized write transaction on the shared writer connection.
+
+    Only the outermost block commits, or rolls back if an exception leaves it.
+    A nested block on the same thread runs in a savepoint of the outer
+    transaction: if it raises, only its own writes are undone, so an outer
+    block that catches the error commits just its own work. Nested blocks
+    must not BEGIN or COMMIT themselves.
+    """
+    _ensure_off_event_loop()
+    path = db_path or DB_PATH
+    with _write_lock:
+        conn = _writers.get(path)
+        if conn is None:
+            conn = _writers[path] = _connect(path)
+        depth = _write_depth.get(path, 0)
+        _write_depth[path] = depth + 1
+        try:
+            if not depth:
+                try:
+                    yield conn
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            else:
+                if not conn.in_transaction:
+                    # Otherwise the savepoint would open the transaction and RELEASE would commit it
+                    conn.execute("BEGIN")
+                savepoint = f"write_conn_{depth}"
+                conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                    raise
+                conn.execute(f"RELEASE {savepoint}")
+        finally:
+            _write_depth[path] = depth
+
+# Kept for existing callers (intelligent_cache); writes are serialized now
+db_conn = write_conn
+
+def get_db():
+    """FastAPI dependency: a pooled read connection for the lifetime of the request."""
+    with read_conn() as conn:
+        yield conn
@@ -0,0 +1,59 @@
+"""
+Storage format for embedding vectors (jira_tickets, feedback).
+
+A vector is stored as its raw little-endian float32 bytes in the embedding
+column, with its length in embedding_dim and the model that produced it in
+embedding_model. Reading is np.frombuffer over the blob: no deserialization
+and no copy, and a whole index is one join of the blobs and one frombuffer
+(embedding_matrix). Unlike the pickled arrays stored before, loading a blob
+cannot run code.
+
+Rows written before this format are converted in place by migration 11
+(migrations._m011_raw_float32_embeddings). That is the only place pickles are
+still read, through an unpickler that only rebuilds numpy arrays.
+"""
+import io
+import pickle
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+def encode_embedding(vector: Sequence[float]) -> bytes:
+    """Raw little-endian float32 bytes of vector."""
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).ravel().tobytes()
+
+def decode_embedding(blob: Optional[bytes], dim: Optional[int]) -> Optional[np.ndarray]:
+    """Read-only float32 view of a stored vector; None unless blob holds exactly dim floats."""
+    if blob is None or not dim or len(blob) != dim * EMBEDDING_DTYPE.itemsize:
+        return None
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+def embedding_matrix(blobs: Iterable[bytes], dim: int) -> np.ndarray:
+    """(len(blobs), dim) float32 matrix from stored vectors of one dimension, in one allocation."""
+    return np.frombuffer(b"".join(blobs), dtype=EMBEDDING_DTYPE).reshape(-1, dim)
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """Unpickler for the legacy blobs: numpy array reconstruction only, nothing else importable."""
+
+    ALLOWED = {
+        ("numpy", "ndarray"), ("numpy", "dtype"),
+        ("numpy.core.multiarray", "_reconstruct"), ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy.core.multiarray", "scalar"), ("numpy._core.multiarray", "scalar"),
+        ("_codecs", "encode"),  # protocol 2 pickles carry the array bytes as latin-1 text
+    }
+
+    def find_class(self, module, name):
+        if (module, name) not in self.ALLOWED:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed in an embedding")
+        return super().find_class(module, name)
+
+def legacy_embedding(blob: bytes) -> Optional[np.ndarray]:
+    """Vector from a pickled numpy array blob (the format before this one); None if it is not one."""
+    try:
+        vector = np.asarray(_ArrayUnpickler(io.BytesIO(blob)).load(), dtype=EMBEDDING_DTYPE).ravel()
+    except Exception:
+        return None
+    return vector if vector.size else None
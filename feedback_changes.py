@@ -0,0 +1,108 @@
+"""
+Change log behind GET /feedback/changes (delta sync).
+
+feedback_changes keeps one row per feedback id: the change version of the
+last write that inserted, updated or deleted its feedback_read row, and
+whether that write deleted it (a tombstone). Change versions come from a
+counter in cache_metadata, bumped once per writing transaction in the same
+transaction as the rows it stamps, so a client holding version V needs
+exactly the ids with version > V. That is a range scan of
+idx_feedback_changes_version: a refresh costs what changed, not the table.
+
+feedback_read records its own writes here (see refresh_feedback_read and
+publish_read_table), so every writer is covered: snapshot publishes and full
+rebuilds record the diff against the previous rows, incremental upserts and
+the team assignment scripts record the ids they touched.
+
+Tombstones older than TOMBSTONE_RETENTION versions are pruned and the floor
+raised to the newest pruned version. A client behind the floor, ahead of the
+counter (restored database) or with more than MAX_CHANGES pending gets
+reset=True and should reload GET /feedback instead.
+"""
+import sqlite3
+from typing import Any, Dict, Iterable, Optional
+
+from migrations import table_exists
+
+CHANGES_TABLE = "feedback_changes"
+CHANGE_VERSION_KEY = "feedback_change_version"
+CHANGE_FLOOR_KEY = "feedback_change_floor"
+
+# Change versions a tombstone is kept for (one version per refresh or script run)
+TOMBSTONE_RETENTION = 1000
+# Past this many changed ids a full reload is cheaper than a delta
+MAX_CHANGES = 5000
+
+def _metadata_int(conn: sqlite3.Connection, key: str) -> int:
+    row = conn.execute("SELECT value FROM cache_metadata WHERE key = ?", (key,)).fetchone()
+    return int(row[0]) if row else 0
+
+def _set_metadata_int(conn: sqlite3.Connection, key: str, value: int):
+    conn.execute("""
+        INSERT INTO cache_metadata (key, value, last_updated) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_updated = excluded.last_updated
+    """, (key, str(value)))
+
+def change_version(conn: sqlite3.Connection) -> int:
+    return _metadata_int(conn, CHANGE_VERSION_KEY)
+
+def record_changes(conn: sqlite3.Connection, upserted: Iterable[str], deleted: Iterable[str] = ()) -> Optional[int]:
+    """
+    Stamp ids with a new change version inside the caller's transaction.
+    Returns the version, or None when there was nothing to record or the
+    schema predates the change log.
+    """
+    upserted, deleted = list(upserted), list(deleted)
+    if not (upserted or deleted) or not table_exists(conn, CHANGES_TABLE):
+        return None
+
+    version = change_version(conn) + 1
+    _set_metadata_int(conn, CHANGE_VERSION_KEY, version)
+    conn.executemany(
+        f"INSERT INTO {CHANGES_TABLE} (id, version, deleted) VALUES (?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET version = excluded.version, deleted = excluded.deleted",
+        [(record_id, version, 0) for record_id in upserted] + [(record_id, version, 1) for record_id in deleted],
+    )
+
+    horizon = version - TOMBSTONE_RETENTION
+    if horizon > _metadata_int(conn, CHANGE_FLOOR_KEY):
+        pruned = conn.execute(
+            f"DELETE FROM {CHANGES_TABLE} WHERE version <= ? AND deleted = 1", (horizon,)
+        ).rowcount
+        if pruned:
+            _set_metadata_int(conn, CHANGE_FLOOR_KEY, horizon)
+    return version
+
+def changes_since(conn: sqlite3.Connection, since: int) -> Dict[str, Any]:
+    """
+    {"version": new watermark, "reset": bool, "changed": [feedback_read rows in
+    the GET /feedback shape], "deleted": [ids]} for everything after since.
+    """
+    # feedback_read records its writes through this module, so import it lazily
+    from feedback_read import READ_TABLE, RESPONSE_COLUMNS
+
+    version = change_version(conn)
+    floor = _metadata_int(conn, CHANGE_FLOOR_KEY)
+    result = {"version": version, "reset": False, "changed": [], "deleted": []}
+    if since < floor or since > version:
+        result["reset"] = True
+        return result
+
+    # Bounded by the version read above: writes committing meanwhile are picked up next time
+    columns = ", ".join(f"r.{name}" for name in RESPONSE_COLUMNS)
+    rows = conn.execute(f"""
+        SELECT c.id, c.deleted, r.id IS NOT NULL, {columns}
+        FROM {CHANGES_TABLE} AS c LEFT JOIN {READ_TABLE} AS r ON r.id = c.id
+        WHERE c.version > ? AND c.version <= ?
+        LIMIT ?
+    """, (since, version, MAX_CHANGES + 1)).fetchall()
+    if len(rows) > MAX_CHANGES:
+        result["reset"] = True
+        return result
+
+    for row in rows:
+        if row[1] or not row[2]:
+            result["deleted"].append(row[0])
+        else:
+            result["changed"].append(dict(zip(RESPONSE_COLUMNS, row[3:])))
+    return result
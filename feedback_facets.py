@@ -0,0 +1,98 @@
+"""
+Facet counts for the feedback filter sidebar.
+
+One grouped SQL pass over feedback_read returns a small cube: the row count for
+every (team, priority, environment, status) combination matching the filters
+that are not facets (date range, text, area, source, type). Each facet's
+counts are then summed from that cube in Python, applying the selections of
+every *other* facet but not its own, so a chip shows how many rows selecting
+it would add (multi-select facets). The cube grows with the number of distinct
+combinations (a few hundred), not with the table, and idx_feedback_read_shown_facets
+covers the pass.
+
+Facets count the values /feedback displays (the resolved team, the priority
+label, environment and status), so the counts match what the dashboard shows.
+Each facet entry is {"value": what to pass back as the filter param, "label":
+what /feedback displays, "count": rows}; value and label are the same, and
+rows with no stored value are counted under the value that filters them
+(feedback_query.BLANK_VALUES), so every value round-trips as a filter.
+"""
+import sqlite3
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from feedback_query import BLANK_VALUES, FeedbackQuery
+from feedback_types import PRIORITY_LABELS, parse_priority, priority_label
+
+# facet -> feedback_read column with the displayed value
+FACETS = {
+    "team": "team",
+    "priority": "priority",
+    "environment": "environment",
+    "status": "status",
+}
+
+def cube_sql(where: str) -> Tuple[str, List[str]]:
+    columns = list(FACETS.values())
+    names = ", ".join(columns)
+    return f"SELECT {names}, COUNT(*) FROM feedback_read{where} GROUP BY {names}", columns
+
+def _facet_value(name: str, display: Any) -> str:
+    """The displayed value, or the blank value its filter matches (never None)."""
+    if display in (None, ""):
+        blank = BLANK_VALUES.get(name, "")
+        return PRIORITY_LABELS.get(blank, blank) if name == "priority" else blank
+    return display
+
+def _selected(name: str, values: Optional[Sequence[str]]) -> Optional[set]:
+    """Filter values as the facet values they select."""
+    values = [v for v in (values or []) if v not in (None, "")]
+    if not values:
+        return None
+    if name == "priority":
+        return {priority_label(parse_priority(v)) for v in values}
+    return set(values)
+
+def facet_counts(
+    conn: sqlite3.Connection,
+    filters: Optional[Dict[str, Sequence[str]]] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    text: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    {"total": rows matching every filter, "facets": {facet: [entries, largest first]}}.
+    ValueError for invalid filters (as FeedbackQuery).
+    """
+    filters = filters or {}
+    base = {name: values for name, values in filters.items() if name not in FACETS}
+    spec = FeedbackQuery(base, created_from, created_to, text)
+    sql, columns = cube_sql(spec.where())
+    position = {column: i for i, column in enumerate(columns)}
+    cube = conn.execute(sql, spec.params).fetchall()
+
+    selected = {name: _selected(name, filters.get(name)) for name in FACETS}
+
+    def matches(row, skip: Optional[str]) -> bool:
+        for name, chosen in selected.items():
+            if name != skip and chosen is not None and _facet_value(name, row[position[FACETS[name]]]) not in chosen:
+                return False
+        return True
+
+    total = sum(row[-1] for row in cube if matches(row, None))
+    facets = {}
+    for name, column in FACETS.items():
+        counts = defaultdict(int)
+        for row in cube:
+            if matches(row, name):
+                counts[_facet_value(name, row[position[column]])] += row[-1]
+        entries = [{"value": value, "label": value, "count": count} for value, count in counts.items()]
+        facets[name] = sorted(entries, key=lambda entry: (-entry["count"], str(entry["label"])))
+    return {"total": total, "facets": facets}
+
+def label_distribution(facet: List[Dict[str, Any]]) -> Dict[str, int]:
+    """{label: count} for one facet's entries (several values can share a label)."""
+    distribution = defaultdict(int)
+    for entry in facet:
+        distribution[entry["label"]] += entry["count"]
+    return dict(distribution)
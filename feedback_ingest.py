@@ -0,0 +1,222 @@
+"""
+Airtable -> feedback ingest shared by intelligent_cache and the loaders.
+
+Full refreshes never write into the served feedback table. They build a
+shadow table (feedback_next), committing in chunks that readers cannot see,
+then publish it in one short transaction that swaps it in, rebuilds indexes
+and the search index, and bumps the feedback generation. The feedback_read
+response rows are built alongside (feedback_read_next) and swapped in with it,
+logging the rows that changed for delta sync clients. Under WAL every
+reader sees either the previous snapshot or the new one, never a partial or
+empty table. Incremental refreshes upsert their few rows in one commit.
+Both paths serve one year (snapshot_year, the current one): rows created in
+other years are dropped here, so the served table is the same whichever job
+ran last. A full refresh that ends up with no rows is refused rather than
+published (EmptySnapshotError), so an Airtable outage cannot empty the table.
+Team assignment runs here too, one batch per chunk (assign_pending_teams),
+so every ingest path stores it on the row and nothing computes it at read time.
+"""
+import re
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from bulk_write import chunked, insert_rows, upsert_rows
+from db_connection import write_conn
+from feedback_read import (
+    READ_ROW_COLUMNS, READ_SHADOW_TABLE, assign_pending_teams, publish_read_table, read_rows, refresh_feedback_read,
+)
+from feedback_types import parse_priority, parse_duration, parse_created, created_epoch, week_start
+from result_cache import bump_data_version
+from migrations import (
+    FEEDBACK_COLUMNS, FEEDBACK_INDEXES, FEEDBACK_READ_COLUMNS, FTS_INDEXES,
+    ensure_table, fts_statements,
+)
+
+SHADOW_TABLE = "feedback_next"
+# Rows per shadow-build commit; keeps the writer free for other requests between chunks
+SNAPSHOT_CHUNK_SIZE = 1000
+GENERATION_KEY = "feedback_generation"
+
+FEEDBACK_ROW_COLUMNS = [name for name, _ in FEEDBACK_COLUMNS]
+
+# feedback column -> Airtable field (text columns)
+TEXT_FIELDS = {
+    "directory_link": "Directory Link",
+    "initial_description": "Initial Description",
+    "notes": "Notes",
+    "triage_rep": "Triage Rep",
+    "status": "Status",
+    "resolution_notes": "Resolution Notes",
+    "related_imt": "Related IMT",
+    "related_imt_link": "Related IMT Link",
+    "type_of_report": "Type of Report",
+    "area_impacted": "Area Impacted",
+    "environment": "Environment",
+    "source": "Source",
+    "team_routed": "Team Routed",
+}
+
+# feedback column -> Airtable field (durations, stored as REAL hours)
+DURATION_FIELDS = {
+    "time_to_in_progress": "Time to In Progress",
+    "time_from_in_progress_to_done": "Time from In Progress to Done",
+    "time_from_reported_to_imt_review": "Time from Reported to Referred",
+    "time_from_imt_review_to_done": "Time from Referred to Done",
+    "time_from_report_to_resolution": "Time From Report to Resolution",
+}
+
+class EmptySnapshotError(RuntimeError):
+    """A full refresh produced no rows; the published snapshot was kept."""
+
+def snapshot_year() -> int:
+    """The year the served feedback table holds."""
+    return datetime.now().year
+
+def in_year(row: Dict[str, Any], year: Optional[int]) -> bool:
+    """True when row was created in year (or year is None, or created does not parse)."""
+    if year is None:
+        return True
+    parsed = parse_created(row.get("created"))
+    return parsed is None or parsed.year == year
+
+def _created_str(record: Dict[str, Any]) -> str:
+    fields = record.get("fields", {})
+    created_date = None
+    for date_field in ["Reported On", "Reported At", "Created"]:
+        if fields.get(date_field):
+            created_date = fields[date_field]
+            break
+    if not created_date:
+        created_date = record.get("createdTime")
+    if not created_date or not isinstance(created_date, str):
+        return ""
+    try:
+        if "T" in created_date:
+            dt = datetime.fromisoformat(created_date.replace("Z", "+00:00"))
+        else:
+            dt = datetime.strptime(created_date, "%Y-%m-%d")
+        return dt.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    except ValueError:
+        return created_date
+
+def record_to_row(record: Dict[str, Any], year: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Map an Airtable record onto a feedback row (typed columns parsed once here).
+    The team is assigned per batch by the write paths (assign_pending_teams).
+    Returns None for records without an id or created outside ``year``.
+    """
+    record_id = record.get("id", "")
+    if not record_id:
+        return None
+
+    fields = record.get("fields", {})
+    created = _created_str(record)
+    if not in_year({"created": created}, year):
+        return None
+    week = week_start(created)
+
+    row = {
+        "id": record_id,
+        "created": created,
+        "created_ts": created_epoch(created),
+        "week": week or "",
+        "week_start": week,
+        "priority": parse_priority(fields.get("Priority")),
+    }
+    for column, field in TEXT_FIELDS.items():
+        value = fields.get(field, "")
+        row[column] = str(value) if value is not None else ""
+    for column, field in DURATION_FIELDS.items():
+        row[column] = parse_duration(fields.get(field))
+    return row
+
+def current_generation(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM cache_metadata WHERE key = ?", (GENERATION_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+def _bump_generation(conn: sqlite3.Connection) -> int:
+    generation = current_generation(conn) + 1
+    conn.execute("""
+        INSERT INTO cache_metadata (key, value, last_updated) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_updated = excluded.last_updated
+    """, (GENERATION_KEY, str(generation)))
+    return generation
+
+def build_feedback_snapshot(rows: Iterable[Dict[str, Any]], db_path=None, year: Optional[int] = None) -> int:
+    """
+    Load rows created in year (default snapshot_year()) into the shadow table,
+    replacing any earlier unpublished build. Returns rows written.
+    """
+    year = snapshot_year() if year is None else year
+    rows = (row for row in rows if in_year(row, year))
+    with write_conn(db_path) as conn:
+        ddl = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'feedback'").fetchone()[0]
+        conn.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+        # Same columns/types as the served table, but no indexes or triggers while loading
+        conn.execute(re.sub(r'^CREATE TABLE\s+("feedback"|feedback)', f"CREATE TABLE {SHADOW_TABLE}", ddl))
+        conn.execute(f"DROP TABLE IF EXISTS {READ_SHADOW_TABLE}")
+        ensure_table(conn, READ_SHADOW_TABLE, FEEDBACK_READ_COLUMNS)
+
+    # INSERT OR REPLACE: later duplicates of an id win, as with the old in-place load
+    written = 0
+    for chunk in chunked(rows, SNAPSHOT_CHUNK_SIZE):
+        assign_pending_teams(chunk)
+        with write_conn(db_path) as conn:
+            written += insert_rows(conn, SHADOW_TABLE, FEEDBACK_ROW_COLUMNS, chunk, verb="INSERT OR REPLACE")
+            insert_rows(conn, READ_SHADOW_TABLE, READ_ROW_COLUMNS, read_rows(chunk), verb="INSERT OR REPLACE")
+    return written
+
+def publish_feedback_snapshot(db_path=None) -> int:
+    """Atomically swap the shadow table in as feedback. Returns the new generation."""
+    with write_conn(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DROP TABLE feedback")
+        conn.execute(f"ALTER TABLE {SHADOW_TABLE} RENAME TO feedback")
+        for statement in FEEDBACK_INDEXES:
+            conn.execute(statement)
+        # Dropping feedback dropped its search triggers; reattach and reindex
+        for fts, table, columns in FTS_INDEXES:
+            if table != "feedback":
+                continue
+            for statement in fts_statements(fts, table, columns):
+                conn.execute(statement)
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        publish_read_table(conn)
+        bump_data_version(conn)
+        return _bump_generation(conn)
+
+def discard_feedback_snapshot(db_path=None):
+    """Drop an unpublished shadow build."""
+    with write_conn(db_path) as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+        conn.execute(f"DROP TABLE IF EXISTS {READ_SHADOW_TABLE}")
+
+def replace_feedback(rows: Iterable[Dict[str, Any]], db_path=None, year: Optional[int] = None) -> int:
+    """
+    Full refresh: build a complete snapshot of the rows created in year (default
+    snapshot_year()) and publish it. Returns rows written. Raises
+    EmptySnapshotError, keeping the published snapshot, when no rows are left.
+    """
+    written = build_feedback_snapshot(rows, db_path, year)
+    if not written:
+        discard_feedback_snapshot(db_path)
+        raise EmptySnapshotError("full refresh produced no feedback rows; keeping the published snapshot")
+    generation = publish_feedback_snapshot(db_path)
+    print(f"📸 Published feedback generation {generation} ({written} records)")
+    return written
+
+def upsert_feedback(rows: Iterable[Dict[str, Any]], db_path=None, year: Optional[int] = None) -> int:
+    """
+    Incremental refresh: upsert the rows created in year (default snapshot_year())
+    into feedback (and feedback_read) in one transaction. Returns rows written.
+    """
+    year = snapshot_year() if year is None else year
+    rows = assign_pending_teams([row for row in rows if in_year(row, year)])
+    with write_conn(db_path) as conn:
+        written = upsert_rows(conn, "feedback", FEEDBACK_ROW_COLUMNS, rows)
+        if written:
+            refresh_feedback_read(conn, [row["id"] for row in rows])
+            bump_data_version(conn)
+            _bump_generation(conn)
+    return written
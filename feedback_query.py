@@ -0,0 +1,216 @@
+"""
+Filter/sort spec for GET /feedback, compiled to parameterized SQL over feedback_read.
+
+A FeedbackQuery holds the filters a client may combine:
+  - IN-lists on team, priority, environment, status, area, source and type
+  - a created range (dates or ISO timestamps, end date inclusive) on created_ts
+  - full-text match against the feedback search index (feedback_fts); every
+    word must match, so more words narrow the result
+  - a multi-column sort such as "priority,-created" (id breaks ties)
+and compiles them to SQL with every value bound as a parameter. Column names
+only ever come from the FILTER_COLUMNS / SORT_KEYS whitelists. Keyset paging
+works for any sort: the cursor holds the sort key values of the last row.
+
+check_query_plans compiles representative specs through this module, so the
+index coverage of what the endpoint actually runs is checked in CI.
+"""
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from feedback_read import READ_TABLE
+from feedback_types import PRIORITY_MEDIUM, parse_created, parse_priority
+from text_search import match_expression
+
+# filter param -> feedback_read column. priority/environment match the raw stored
+# values (as they always have); the rest match the values the API returns, so
+# team is the displayed team (Airtable routing, else the persisted assignment).
+FILTER_COLUMNS = {
+    "team": "team",
+    "priority": "priority_rank",
+    "environment": "environment_raw",
+    "status": "status",
+    "area": "area_impacted",
+    "source": "source",
+    "type": "type_of_report",
+}
+
+# sort name -> SQL expression; priority sorts High..Low, unranked rows with Medium
+# (the label priority_label gives them)
+SORT_KEYS = {
+    "created": "created",
+    "priority": f"IFNULL(priority_rank, {PRIORITY_MEDIUM})",
+    "team": "team",
+    "status": "status",
+    "environment": "environment",
+    "area": "area_impacted",
+    "source": "source",
+}
+DEFAULT_SORT = "-created"
+
+# filter param -> the value rows without a stored value are shown under; filtering
+# on it also matches those rows, so every facet value can be sent back as a filter
+BLANK_VALUES = {
+    "team": "Unassigned",
+    "priority": PRIORITY_MEDIUM,
+    "environment": "Unknown",
+}
+
+# Bound values per IN-list; keeps the statement well under SQLite's parameter limit
+MAX_IN_VALUES = 100
+
+def parse_sort(sort: Optional[str]) -> List[Tuple[str, str]]:
+    """
+    "priority,-created" -> [(expr, "ASC"), (expr, "DESC"), ("id", <last direction>)].
+    ValueError on unknown keys.
+    """
+    keys = []
+    for part in (sort or DEFAULT_SORT).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        direction = "DESC" if part.startswith("-") else "ASC"
+        name = part.lstrip("+-")
+        if name not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {name}. Allowed: {', '.join(SORT_KEYS)}")
+        keys.append((SORT_KEYS[name], direction))
+    if not keys:
+        raise ValueError(f"Empty sort: {sort!r}")
+    # id is unique, so (sort keys, id) totally orders rows for keyset paging
+    keys.append(("id", keys[-1][1]))
+    return keys
+
+def _created_range(value: str, end: bool) -> List[Tuple[str, Any]]:
+    """
+    [(condition, param)] for a created_from / created_to value. The exact test is
+    on created_ts (epoch seconds): the stored created strings mix date-only and
+    timestamp formats, so they do not compare correctly as text. A text bound on
+    created, padded by days so no matching row falls outside it, keeps the
+    (..., created, id) indexes seekable. Naive values are taken as UTC.
+    """
+    parsed = parse_created(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value!r} (expected YYYY-MM-DD or an ISO timestamp)")
+    if not end:
+        return [
+            ("created >= ?", (parsed - timedelta(days=1)).strftime("%Y-%m-%d")),
+            ("created_ts >= ?", int(parsed.timestamp())),
+        ]
+    op = "<="
+    if len(value.strip()) == 10:
+        # An end date includes that whole day
+        op, parsed = "<", parsed + timedelta(days=1)
+    return [
+        ("created < ?", (parsed + timedelta(days=2)).strftime("%Y-%m-%d")),
+        (f"created_ts {op} ?", int(parsed.timestamp())),
+    ]
+
+def _keyset_condition(keys: List[Tuple[str, str]]) -> str:
+    """Rows strictly after the cursor row in (keys) order."""
+    if len({direction for _, direction in keys}) == 1:
+        # Uniform direction: one row-value comparison, which SQLite can seek on
+        op = "<" if keys[0][1] == "DESC" else ">"
+        return f"({', '.join(expr for expr, _ in keys)}) {op} ({', '.join('?' for _ in keys)})"
+    branches = []
+    for i, (expr, direction) in enumerate(keys):
+        equal = [f"{prior} = ?" for prior, _ in keys[:i]]
+        branches.append("(" + " AND ".join(equal + [f"{expr} {'<' if direction == 'DESC' else '>'} ?"]) + ")")
+    return "(" + " OR ".join(branches) + ")"
+
+def _keyset_params(keys: List[Tuple[str, str]], after: Sequence[Any]) -> List[Any]:
+    if len({direction for _, direction in keys}) == 1:
+        return list(after)
+    params = []
+    for i in range(len(keys)):
+        params.extend(after[:i])
+        params.append(after[i])
+    return params
+
+class FeedbackQuery:
+    """A validated filter/sort spec; compile with select() and count()."""
+
+    def __init__(
+        self,
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        text: Optional[str] = None,
+        sort: Optional[str] = None
+    ):
+        self.conditions: List[str] = []
+        self.params: List[Any] = []
+
+        for name, values in (filters or {}).items():
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown filter: {name}")
+            values = [v for v in (values or []) if v not in (None, "")]
+            if not values:
+                continue
+            if len(values) > MAX_IN_VALUES:
+                raise ValueError(f"Too many values for {name} (max {MAX_IN_VALUES})")
+            if name == "priority":
+                # Stored as integer rank; accepts "High" as well as "1"
+                values = [parse_priority(v) for v in values]
+            self._add_in(FILTER_COLUMNS[name], values, blank=BLANK_VALUES.get(name) in values)
+
+        for value, end in ((created_from, False), (created_to, True)):
+            if value:
+                for condition, param in _created_range(value, end):
+                    self.conditions.append(condition)
+                    self.params.append(param)
+
+        if text:
+            expression = match_expression(text, min_length=1, prefix=True, match_all=True)
+            if expression is None:
+                self.conditions.append("0")  # nothing searchable: no rows
+            else:
+                self.conditions.append(
+                    "id IN (SELECT f.id FROM feedback_fts JOIN feedback AS f ON f.rowid = feedback_fts.rowid"
+                    " WHERE feedback_fts MATCH ?)"
+                )
+                self.params.append(expression)
+
+        self.sort_keys = parse_sort(sort)
+
+    def _add_in(self, column: str, values: List[Any], blank: bool = False):
+        if len(values) == 1:
+            condition = f"{column} = ?"
+        else:
+            condition = f"{column} IN ({', '.join('?' for _ in values)})"
+        if blank:
+            condition = f"({condition} OR {column} IS NULL OR {column} = '')"
+        self.conditions.append(condition)
+        self.params.extend(values)
+
+    def where(self, extra: Optional[str] = None) -> str:
+        conditions = self.conditions + ([extra] if extra else [])
+        return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    def count(self) -> Tuple[str, List[Any]]:
+        """Filtered row count (ignores sort and page position)."""
+        return f"SELECT COUNT(*) FROM {READ_TABLE}{self.where()}", list(self.params)
+
+    def select(
+        self,
+        columns: List[str],
+        limit: Optional[int] = None,
+        after: Optional[Sequence[Any]] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        SQL selecting columns, then the sort key values as _k0.._kN (for the next
+        cursor). With limit, one extra row is fetched to tell whether a next page exists.
+        """
+        params = list(self.params)
+        extra = None
+        if after is not None:
+            if len(after) != len(self.sort_keys):
+                raise ValueError("Cursor does not match the requested sort")
+            extra = _keyset_condition(self.sort_keys)
+            params.extend(_keyset_params(self.sort_keys, after))
+
+        keys = [f"{expr} AS _k{i}" for i, (expr, _) in enumerate(self.sort_keys)]
+        order = ", ".join(f"{expr} {direction}" for expr, direction in self.sort_keys)
+        query = f"SELECT {', '.join(list(columns) + keys)} FROM {READ_TABLE}{self.where(extra)} ORDER BY {order}"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+        return query, params
@@ -0,0 +1,222 @@
+"""
+Read model for the /feedback endpoints.
+
+feedback_read holds every feedback row already in the API response shape:
+description chosen, area impacted parsed, priority labelled, team resolved
+and defaults filled. Teams come from the assignment persisted on the feedback
+row at ingest (assign_pending_teams, run per chunk by feedback_ingest and
+backfill_team_assignments.py). It is written wherever feedback is written (snapshot
+builds, incremental upserts, the team assignment scripts), so the endpoints
+are a plain indexed select with no per-row work at request time. Every write
+also records the ids it changed in the delta sync log (feedback_changes).
+
+Usage: python feedback_read.py [db_path]   # rebuild after editing feedback by hand
+"""
+import sqlite3
+import sys
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from bulk_write import chunked, insert_rows, upsert_rows
+from feedback_changes import record_changes
+from feedback_types import created_epoch, priority_label
+from migrations import FEEDBACK_READ_COLUMNS, FEEDBACK_READ_INDEXES, ensure_table, table_exists
+from team_assignment_service import team_service
+
+READ_TABLE = "feedback_read"
+# Full rebuilds are written here and swapped in by publish_read_table
+READ_SHADOW_TABLE = "feedback_read_next"
+READ_ROW_COLUMNS = [name for name, _ in FEEDBACK_READ_COLUMNS]
+# Columns the endpoints return, in response order
+RESPONSE_COLUMNS = READ_ROW_COLUMNS[:READ_ROW_COLUMNS.index("triage_rep") + 1]
+
+# feedback columns read_row needs
+SOURCE_COLUMNS = (
+    "id", "created", "created_ts", "week", "initial_description", "priority", "notes", "triage_rep", "status",
+    "resolution_notes", "type_of_report", "area_impacted", "environment", "source", "team_routed",
+    "team_assigned", "team_method",
+)
+
+# team_routed values that still need the team assignment service
+UNROUTED_TEAMS = ("", "Unassigned", "Triage")
+
+def get_description(row: Mapping[str, Any]) -> str:
+    """
+    Get the appropriate description field with enhanced logic.
+    Tries multiple fields in priority order.
+    """
+    for field in ("notes", "initial_description", "resolution_notes"):
+        value = row.get(field)
+        if value and str(value).strip() and str(value).strip() not in ['', 'N/A', 'None']:
+            return str(value).strip()
+    return "No description provided"
+
+def parse_area_impacted(area_value: Any) -> str:
+    """Parse area impacted value handling various formats"""
+    if not area_value or str(area_value).strip() in ['', 'None', 'null']:
+        return "Unknown"
+
+    area_str = str(area_value).strip()
+
+    # Handle list-like strings (e.g., "['Salesforce']")
+    if area_str.startswith('[') and area_str.endswith(']'):
+        area_str = area_str.strip('[]').replace("'", "").replace('"', '')
+        parts = [p.strip() for p in area_str.split(',') if p.strip()]
+        if parts:
+            return ', '.join(parts)
+
+    return area_str if area_str else "Unknown"
+
+def team_assignments(rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Ingest stage: {team_assigned, team_method, team_confidence} for each feedback row.
+    Rows routed in Airtable keep that team (method "routed"); the rest go through
+    the team assignment service in one batch (methods "keyword", "similarity", "none").
+    """
+    rows = list(rows)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    unrouted = []
+    for i, row in enumerate(rows):
+        routed = row.get('team_routed') or ''
+        if routed not in UNROUTED_TEAMS:
+            results[i] = {"team_assigned": routed, "team_method": "routed", "team_confidence": 1.0}
+        else:
+            unrouted.append(i)
+    assigned = team_service.assign_teams(
+        {
+            "area_impacted": parse_area_impacted(rows[i].get('area_impacted')),
+            "description": get_description(rows[i]),
+            "type_of_issue": rows[i].get('type_of_report') or '',
+        }
+        for i in unrouted
+    )
+    for i, result in zip(unrouted, assigned):
+        results[i] = {"team_assigned": result["team"], "team_method": result["method"], "team_confidence": result["confidence"]}
+    return results
+
+def team_assignment(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """team_assignments for a single row."""
+    return team_assignments([row])[0]
+
+def assign_pending_teams(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Store the team assignment on every row without a team_method, in one batch. Returns rows."""
+    pending = [row for row in rows if not row.get('team_method')]
+    for row, assignment in zip(pending, team_assignments(pending)):
+        row.update(assignment)
+    return rows
+
+def read_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map a feedback row (typed columns) onto its feedback_read row."""
+    area_impacted = parse_area_impacted(row.get('area_impacted'))
+    description = get_description(row)
+
+    team = row.get('team_routed') or ''
+    if team in UNROUTED_TEAMS:
+        # Rows the backfill has not reached yet are assigned here, once per write
+        team = row['team_assigned'] if row.get('team_method') else team_assignment(row)['team_assigned']
+
+    return {
+        "id": row['id'],
+        "description": description,
+        "priority": priority_label(row.get('priority')),
+        "team": team,
+        "environment": row.get('environment') or 'Unknown',
+        "area_impacted": area_impacted,
+        "created": row.get('created') or '',
+        "week": row.get('week') or 'N/A',
+        "issue_number": '',  # Not in original schema
+        "status": row.get('status') or 'New',
+        "reporter_email": '',  # Not in original schema
+        "slack_thread": '',  # Not in original schema
+        "type_of_issue": row.get('type_of_report') or '',
+        "type_of_report": row.get('type_of_report') or 'N/A',
+        "source": row.get('source') or 'N/A',
+        "triage_rep": row.get('triage_rep') or 'N/A',
+        "team_routed": row.get('team_routed'),
+        "priority_rank": row.get('priority'),
+        "environment_raw": row.get('environment'),
+        "created_ts": row['created_ts'] if row.get('created_ts') is not None else created_epoch(row.get('created')),
+    }
+
+def read_rows(rows: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    """read_row over rows, assigning teams the backfill has not reached yet one chunk at a time."""
+    for chunk in chunked(rows, 500):
+        yield from map(read_row, assign_pending_teams(chunk))
+
+def _source_rows(conn: sqlite3.Connection, ids: Optional[List[str]] = None) -> Iterable[Dict[str, Any]]:
+    query = f"SELECT {', '.join(SOURCE_COLUMNS)} FROM feedback"
+    if ids is None:
+        for row in conn.execute(query):
+            yield dict(zip(SOURCE_COLUMNS, row))
+        return
+    # Bounded IN lists stay well under SQLite's host parameter limit
+    for chunk in chunked(ids, 500):
+        placeholders = ", ".join("?" for _ in chunk)
+        for row in conn.execute(f"{query} WHERE id IN ({placeholders})", chunk):
+            yield dict(zip(SOURCE_COLUMNS, row))
+
+def _current_rows(conn: sqlite3.Connection, ids: List[str]) -> Iterable[Tuple[str, tuple]]:
+    for chunk in chunked(ids, 500):
+        placeholders = ", ".join("?" for _ in chunk)
+        query = f"SELECT {', '.join(READ_ROW_COLUMNS)} FROM {READ_TABLE} WHERE id IN ({placeholders})"
+        for row in conn.execute(query, chunk):
+            yield row[0], tuple(row)
+
+def _diff_ids(conn: sqlite3.Connection, old: str, new: str) -> Tuple[List[str], List[str]]:
+    """(ids added or changed in new, ids only in old); both joins are primary key lookups."""
+    changed = " OR ".join(f"o.{name} IS NOT n.{name}" for name in READ_ROW_COLUMNS if name != "id")
+    upserted = [row[0] for row in conn.execute(
+        f"SELECT n.id FROM {new} AS n LEFT JOIN {old} AS o ON o.id = n.id WHERE o.id IS NULL OR {changed}"
+    )]
+    deleted = [row[0] for row in conn.execute(
+        f"SELECT o.id FROM {old} AS o WHERE NOT EXISTS (SELECT 1 FROM {new} AS n WHERE n.id = o.id)"
+    )]
+    return upserted, deleted
+
+def publish_read_table(conn: sqlite3.Connection):
+    """
+    Swap feedback_read_next in as feedback_read inside the caller's transaction,
+    recording the rows that differ from the ones it replaces.
+    """
+    if table_exists(conn, READ_TABLE):
+        record_changes(conn, *_diff_ids(conn, READ_TABLE, READ_SHADOW_TABLE))
+    conn.execute(f"DROP TABLE IF EXISTS {READ_TABLE}")
+    conn.execute(f"ALTER TABLE {READ_SHADOW_TABLE} RENAME TO {READ_TABLE}")
+    for statement in FEEDBACK_READ_INDEXES:
+        conn.execute(statement)
+
+def refresh_feedback_read(conn: sqlite3.Connection, ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Rewrite feedback_read rows from feedback inside the caller's transaction:
+    every row when ids is None, otherwise just those ids (ids no longer in
+    feedback are removed, unchanged rows are left alone). Returns rows
+    written; 0 if the table is not there yet.
+    """
+    if not table_exists(conn, READ_TABLE):
+        return 0
+    if ids is None:
+        conn.execute(f"DROP TABLE IF EXISTS {READ_SHADOW_TABLE}")
+        ensure_table(conn, READ_SHADOW_TABLE, FEEDBACK_READ_COLUMNS)
+        written = insert_rows(conn, READ_SHADOW_TABLE, READ_ROW_COLUMNS, read_rows(_source_rows(conn)))
+        publish_read_table(conn)
+        return written
+
+    ids = list(dict.fromkeys(ids))
+    rows = list(read_rows(_source_rows(conn, ids)))
+    found = {row["id"] for row in rows}
+    missing = [record_id for record_id in ids if record_id not in found]
+    if missing:
+        conn.executemany(f"DELETE FROM {READ_TABLE} WHERE id = ?", [(record_id,) for record_id in missing])
+    # Only rows whose response actually changed are rewritten and sent to delta sync clients
+    current = dict(_current_rows(conn, list(found)))
+    rows = [row for row in rows if current.get(row["id"]) != tuple(row[name] for name in READ_ROW_COLUMNS)]
+    record_changes(conn, [row["id"] for row in rows], missing)
+    return upsert_rows(conn, READ_TABLE, READ_ROW_COLUMNS, rows)
+
+if __name__ == "__main__":
+    from db_connection import write_conn
+    from result_cache import bump_data_version
+
+    with write_conn(sys.argv[1] if len(sys.argv) > 1 else None) as conn:
+        written = refresh_feedback_read(conn)
+        bump_data_version(conn)
+    print(f"✅ Rebuilt {READ_TABLE} ({written} records)")
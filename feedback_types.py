@@ -0,0 +1,89 @@
+"""
+Typed feedback values shared by the loaders, migrations and API readers.
+
+Airtable hands us priorities, durations and dates as loosely formatted strings.
+These helpers turn them into the stored column types (INTEGER priority, REAL
+hours, INTEGER epoch seconds, Monday week_start) once at write time, and map
+stored values back to the labels the API returns.
+"""
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Union
+
+PRIORITY_HIGH = 1
+PRIORITY_MEDIUM = 2
+PRIORITY_LOW = 3
+
+PRIORITY_LABELS = {
+    PRIORITY_HIGH: "High",
+    PRIORITY_MEDIUM: "Medium",
+    PRIORITY_LOW: "Low",
+}
+_PRIORITY_BY_NAME = {label.lower(): rank for rank, label in PRIORITY_LABELS.items()}
+
+# Airtable duration fields -> feedback REAL columns (hours)
+DURATION_COLUMNS = [
+    "time_to_in_progress",
+    "time_from_in_progress_to_done",
+    "time_from_reported_to_imt_review",
+    "time_from_imt_review_to_done",
+    "time_from_report_to_resolution",
+]
+
+def parse_priority(value: Any) -> Optional[Union[int, str]]:
+    """
+    Normalize a priority to its integer rank (1=High, 2=Medium, 3=Low).
+
+    Unrecognized non-empty values are returned stripped so nothing is lost;
+    empty values become None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value) if int(value) in PRIORITY_LABELS else None
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.isdigit() and int(text) in PRIORITY_LABELS:
+        return int(text)
+    return _PRIORITY_BY_NAME.get(text.lower(), text)
+
+def priority_label(value: Any, default: str = "Medium") -> str:
+    """Map a stored priority back to the label the API returns."""
+    rank = parse_priority(value)
+    if rank is None:
+        return default
+    return PRIORITY_LABELS.get(rank, str(rank))
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Parse an Airtable duration into hours; blanks, junk and NaN become None."""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+def parse_created(value: Any) -> Optional[datetime]:
+    """Parse an ISO date/datetime (``Z`` suffix allowed); naive values are taken as UTC."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+def created_epoch(value: Any) -> Optional[int]:
+    dt = parse_created(value)
+    return int(dt.timestamp()) if dt else None
+
+def week_start(value: Any) -> Optional[str]:
+    """Monday of the week the record was created in, as YYYY-MM-DD."""
+    dt = parse_created(value)
+    if not dt:
+        return None
+    return (dt - timedelta(days=dt.weekday())).strftime("%Y-%m-%d")
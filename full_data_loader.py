@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 from dotenv import load_dotenv
+from feedback_ingest import record_to_row, replace_feedback, snapshot_year
 
 load_dotenv()
 
@@ -58,156 +59,41 @@ def fetch_all_airtable_data():
     logger.info(f"✅ Fetched {len(records)} total records from Airtable")
     return records
 
-def clear_existing_data():
-    """Clear existing feedback data to avoid duplicates."""
-    logger.info("🧹 Clearing existing feedback data...")
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("DELETE FROM feedback")
-        conn.commit()
-        logger.info("✅ Cleared existing feedback data")
-    except Exception as e:
-        logger.error(f"❌ Error clearing data: {e}")
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
-
 def process_and_load_feedback_data(records):
-    """Process Airtable records and load into feedback table."""
+    """Process Airtable records and publish them as a new feedback snapshot."""
     logger.info("📥 Processing and loading feedback data...")
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     loaded_count = 0
     skipped_count = 0
     error_count = 0
     
-    # Filter for 2025 records only
-    current_year = datetime.now().year
-    year_filter = datetime(current_year, 1, 1)
+    # Current-year records only (the served year, see feedback_ingest.snapshot_year)
+    current_year = snapshot_year()
     
-    try:
+    def rows():
+        nonlocal loaded_count, skipped_count, error_count
         for record in records:
             try:
-                fields = record.get('fields', {})
-                record_id = record.get('id', '')
-                
-                # Skip records without ID
-                if not record_id:
-                    skipped_count += 1
-                    continue
-                
-                # Get created date for year filtering
-                created_date = None
-                for date_field in ['Reported On', 'Reported At', 'Created']:
-                    if fields.get(date_field):
-                        created_date = fields[date_field]
-                        break
-                
-                if not created_date:
-                    created_date = record.get('createdTime')
-                
-                # Parse and filter by year
-                if created_date:
-                    try:
-                        if isinstance(created_date, str):
-                            if 'T' in created_date:
-                                dt = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-                            else:
-                                dt = datetime.strptime(created_date, '%Y-%m-%d')
-                            
-                            # Skip records not from current year
-                            if dt.year != current_year:
-                                skipped_count += 1
-                                continue
-                                
-                            created_str = dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
-                        else:
-                            skipped_count += 1
-                            continue
-                    except:
-                        created_str = created_date
-                else:
-                    # Use record creation time as fallback
-                    created_str = record.get('createdTime', '')
-                
-                # Extract all fields with safe defaults
-                def safe_get(field_name, default=''):
-                    value = fields.get(field_name, default)
-                    return str(value) if value is not None else default
-                
-                # Calculate week from created date
-                try:
-                    week_dt = datetime.fromisoformat(created_str.replace('Z', '+00:00'))
-                    week_start = week_dt - timedelta(days=week_dt.weekday())
-                    week_str = week_start.strftime('%Y-%m-%d')
-                except:
-                    week_str = ''
-                
-                # Map Airtable fields to database fields
-                feedback_data = {
-                    'id': record_id,
-                    'directory_link': safe_get('Directory Link'),
-                    'created': created_str,
-                    'week': week_str,
-                    'initial_description': safe_get('Initial Description'),
-                    'priority': safe_get('Priority'),
-                    'notes': safe_get('Notes'),
-                    'triage_rep': safe_get('Triage Rep'),
-                    'status': safe_get('Status'),
-                    'resolution_notes': safe_get('Resolution Notes'),
-                    'related_imt': safe_get('Related IMT'),
-                    'related_imt_link': safe_get('Related IMT Link'),
-                    'type_of_report': safe_get('Type of Report'),
-                    'area_impacted': safe_get('Area Impacted'),
-                    'environment': safe_get('Environment'),
-                    'time_to_in_progress': safe_get('Time to In Progress'),
-                    'time_from_in_progress_to_done': safe_get('Time from In Progress to Done'),
-                    'time_from_reported_to_imt_review': safe_get('Time from Reported to Referred'),
-                    'time_from_imt_review_to_done': safe_get('Time from Referred to Done'),
-                    'time_from_report_to_resolution': safe_get('Time From Report to Resolution'),
-                    'source': safe_get('Source'),
-                    'team_routed': safe_get('Team Routed')
-                }
-                
-                # Insert into database
-                cursor.execute('''
-                    INSERT OR REPLACE INTO feedback (
-                        id, directory_link, created, week, initial_description, priority, notes,
-                        triage_rep, status, resolution_notes, related_imt, related_imt_link,
-                        type_of_report, area_impacted, environment, time_to_in_progress,
-                        time_from_in_progress_to_done, time_from_reported_to_imt_review,
-                        time_from_imt_review_to_done, time_from_report_to_resolution,
-                        source, team_routed
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    feedback_data['id'], feedback_data['directory_link'], feedback_data['created'],
-                    feedback_data['week'], feedback_data['initial_description'], feedback_data['priority'],
-                    feedback_data['notes'], feedback_data['triage_rep'], feedback_data['status'],
-                    feedback_data['resolution_notes'], feedback_data['related_imt'], feedback_data['related_imt_link'],
-                    feedback_data['type_of_report'], feedback_data['area_impacted'], feedback_data['environment'],
-                    feedback_data['time_to_in_progress'], feedback_data['time_from_in_progress_to_done'],
-                    feedback_data['time_from_reported_to_imt_review'], feedback_data['time_from_imt_review_to_done'],
-                    feedback_data['time_from_report_to_resolution'], feedback_data['source'], feedback_data['team_routed']
-                ))
-                
-                loaded_count += 1
-                
-                # Progress logging
-                if loaded_count % 500 == 0:
-                    logger.info(f"  📈 Loaded {loaded_count} records...")
-                
+                row = record_to_row(record, year=current_year)
             except Exception as e:
                 error_count += 1
                 logger.warning(f"Error processing record {record.get('id', 'unknown')}: {e}")
                 continue
-        
-        conn.commit()
+            
+            if row is None:
+                skipped_count += 1
+                continue
+            
+            loaded_count += 1
+            
+            # Progress logging
+            if loaded_count % 500 == 0:
+                logger.info(f"  📈 Loaded {loaded_count} records...")
+            yield row
+    
+    try:
+        # Built in a shadow table and swapped in atomically; readers never see a partial load
+        replace_feedback(rows(), DB_PATH, year=current_year)
         logger.info(f"✅ Feedback data loading complete!")
         logger.info(f"  📊 Loaded: {loaded_count} records")
         logger.info(f"  ⏭️  Skipped: {skipped_count} records (wrong year/no data)")
@@ -215,10 +101,7 @@ def process_and_load_feedback_data(records):
         
     except Exception as e:
         logger.error(f"❌ Database loading failed: {e}")
-        conn.rollback()
         raise
-    finally:
-        conn.close()
     
     return loaded_count
 
@@ -259,13 +142,13 @@ def verify_data_load():
         env_counts = cursor.fetchall()
         
         # Count by priority
-        cursor.execute("SELECT priority, COUNT(*) FROM feedback WHERE priority != '' GROUP BY priority ORDER BY COUNT(*) DESC")
+        cursor.execute("SELECT priority, COUNT(*) FROM feedback WHERE priority IS NOT NULL GROUP BY priority ORDER BY COUNT(*) DESC")
         priority_counts = cursor.fetchall()
         
         # Count recent records (last 30 days)
         cursor.execute("""
             SELECT COUNT(*) FROM feedback 
-            WHERE created >= datetime('now', '-30 days')
+            WHERE created_ts >= CAST(strftime('%s', 'now', '-30 days') AS INTEGER)
         """)
         recent_count = cursor.fetchone()[0]
         
@@ -290,19 +173,20 @@ def main():
     logger.info(f"📅 Loading all {datetime.now().year} data from Airtable...")
     
     try:
+        # Step 0: Make sure the typed feedback schema is in place
+        from migrations import run_migrations
+        run_migrations(DB_PATH)
+        
         # Step 1: Fetch all Airtable data
         records = fetch_all_airtable_data()
         
-        # Step 2: Clear existing data
-        clear_existing_data()
-        
-        # Step 3: Process and load feedback data
+        # Step 2: Process and publish feedback data (replaces the previous snapshot)
         loaded_count = process_and_load_feedback_data(records)
         
-        # Step 4: Update response times cache
+        # Step 3: Update response times cache
         update_response_times_cache()
         
-        # Step 5: Verify the load
+        # Step 4: Verify the load
         verify_data_load()
         
         logger.info("🎉 Comprehensive data load completed successfully!")
@@ -0,0 +1,89 @@
+"""
+Conditional GET for data-backed endpoints.
+
+Responses carry an ETag and Last-Modified derived from the data version in
+cache_metadata (see result_cache), which every write to served data bumps.
+A poll that sends back If-None-Match / If-Modified-Since for an unchanged
+version gets a bodiless 304 after one primary-key lookup, before the
+endpoint runs any query.
+
+Usage: @router.get("/", dependencies=[Depends(conditional_get("components"))])
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from db_connection import read_conn
+from result_cache import data_version_info
+
+# Stored, but revalidated with the server on every use
+CACHE_CONTROL = "no-cache"
+
+def make_etag(endpoint: str, version: int, request: Request) -> str:
+    """
+    Weak validator for this endpoint, path, query and Accept at this data version.
+    Weak because the body may be re-encoded (compression) without changing meaning.
+    """
+    variant = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = f"{endpoint}|{request.url.path}?{variant}|{request.headers.get('accept', '')}"
+    return f'W/"{version}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]}"'
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """cache_metadata.last_updated is sqlite CURRENT_TIMESTAMP (UTC, no zone)."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.replace("W/", "", 1) == etag.replace("W/", "", 1) for tag in candidates)
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since is None or since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+def conditional_get(endpoint: str) -> Callable[[Request, Response], None]:
+    """
+    FastAPI dependency for endpoint: answers 304 if the client's copy is current,
+    otherwise sets the validators on the response and lets the endpoint run.
+    Endpoints that return a Response themselves must copy these headers onto it.
+    """
+    def dependency(request: Request, response: Response) -> None:
+        with read_conn() as conn:
+            version, updated = data_version_info(conn)
+        if version is None:
+            return  # unmigrated database: no validators, always a full response
+
+        etag = make_etag(endpoint, version, request)
+        last_modified = _parse_timestamp(updated)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if is_not_modified(request, etag, last_modified):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
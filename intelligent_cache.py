@@ -6,10 +6,16 @@ import json
 from datetime import datetime
 from typing import Iterable, Dict, Any
 
-from db_connection import db_conn
+from bulk_write import upsert_rows
+from db_connection import db_conn, read_conn
+import feedback_ingest
 from config import AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME, DEBUG_REFRESH
 from airtable import fetch_all_records  # you'll write this (below)
 
+CACHE_COLUMNS = ("id", "created_at", "modified_at", "fields_json")
+# Rows per executemany call when upserting a refresh
+REFRESH_BATCH_SIZE = 500
+
 def init_schema():
     with db_conn() as conn:
         conn.execute("""
@@ -44,7 +50,7 @@ def _update_status(**kwargs):
         conn.execute(f"UPDATE cache_status SET {keys} WHERE id = :id", kwargs)
 
 def get_status():
-    with db_conn() as conn:
+    with read_conn() as conn:
         row = conn.execute("SELECT last_update, total_records, last_error, last_run_type, running FROM cache_status WHERE id = 1").fetchone()
     if not row:
         return None
@@ -77,27 +83,29 @@ def _do_refresh(mode: str, since: str | None = None):
             since=since if mode == "incremental" else None
         )
 
-        total = 0
-        with db_conn() as conn:
-            # speed: transaction is already open (context manager)
-            # UPSERT each record
+        def cache_rows():
             for r in records:
-                rid = r["id"]
                 created = r["createdTime"]
                 modified = r.get("fields", {}).get("Last Modified", created)  # or your own LAST_MODIFIED_TIME
-                payload = json.dumps(r["fields"], ensure_ascii=False)
+                yield (r["id"], created, modified, json.dumps(r["fields"], ensure_ascii=False))
+
+        with db_conn() as conn:
+            # chunked executemany UPSERT inside one transaction
+            total = upsert_rows(conn, "feedback_cache", CACHE_COLUMNS, cache_rows(), batch_size=REFRESH_BATCH_SIZE)
+        if DEBUG_REFRESH:
+            print(f"[cache] upserted {total} records into feedback_cache")
 
-                conn.execute("""
-                    INSERT INTO feedback_cache (id, created_at, modified_at, fields_json)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                        created_at = excluded.created_at,
-                        modified_at = excluded.modified_at,
-                        fields_json = excluded.fields_json
-                """, (rid, created, modified, payload))
-                total += 1
-                if DEBUG_REFRESH and total % 500 == 0:
-                    print(f"[cache] {total}...")
+        # Project into the served feedback table: a full refresh publishes a
+        # complete new snapshot, an incremental one upserts just its rows
+        # (both keep only the served year, see feedback_ingest.snapshot_year)
+        rows = [row for row in map(feedback_ingest.record_to_row, records) if row is not None]
+        if mode == "full":
+            try:
+                feedback_ingest.replace_feedback(rows)
+            except feedback_ingest.EmptySnapshotError as e:
+                print(f"[cache] {e}")
+        else:
+            feedback_ingest.upsert_feedback(rows)
 
         _update_status(
             last_update=datetime.utcnow().isoformat() + "Z",
@@ -0,0 +1,196 @@
+"""
+In-memory vector index over the Jira ticket embeddings.
+
+Every ticket embedded with the query model is loaded once into one
+contiguous float32 matrix (the stored raw float32 blobs joined and read with
+np.frombuffer, see embedding_store), L2-normalized at load, with parallel
+arrays of id, summary, assignee and team. A query is then a single matrix-vector product (cosine similarity to
+every ticket) and an argpartition for the top k, instead of deserializing
+and normalizing every row's blob on every request.
+
+The index follows the table without reloading it:
+  - update(ids) re-reads just those tickets (vectorize_jira_tickets calls it
+    after each stored batch) and replaces or appends their rows
+  - at most every CHECK_INTERVAL seconds a search compares the embedded
+    rowids with the loaded ones (no blobs read): new rows are appended,
+    removed ones trigger a full rebuild
+New state is built aside and swapped in with one reference assignment, so
+searches never wait on a rebuild and always see a consistent matrix.
+"""
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from bulk_write import chunked
+from db_connection import read_conn
+from embedding_store import EMBEDDING_DTYPE, EMBEDDING_MODEL, embedding_matrix
+from migrations import table_exists
+
+CHECK_INTERVAL = 60.0
+
+class _IndexState:
+    """One immutable load: normalized matrix and its parallel ticket arrays."""
+
+    def __init__(self, rowids, ids, summaries, assignees, teams, matrix: np.ndarray):
+        self.rowids = rowids
+        self.ids = ids
+        self.summaries = summaries
+        self.assignees = assignees
+        self.teams = teams
+        self.matrix = matrix
+        self.has_team = np.array([bool(team) for team in teams], dtype=bool)
+        self.position = {rowid: i for i, rowid in enumerate(rowids)}
+
+    @classmethod
+    def empty(cls) -> "_IndexState":
+        return cls([], [], [], [], [], np.zeros((0, 0), dtype=np.float32))
+
+class JiraVectorIndex:
+    def __init__(self, db_path: str = None, check_interval: float = CHECK_INTERVAL, model: str = EMBEDDING_MODEL):
+        self.db_path = db_path
+        self.model = model
+        self.check_interval = check_interval
+        self._state = _IndexState.empty()
+        self._loaded = False
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._current().ids)
+
+    def _current(self) -> _IndexState:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._rebuild()
+        elif time.monotonic() - self._checked_at >= self.check_interval and self._lock.acquire(blocking=False):
+            try:
+                self._sync()
+            except Exception as e:
+                print(f"⚠️ Jira vector index refresh failed, keeping {len(self._state.ids)} tickets: {e}")
+            finally:
+                self._lock.release()
+        return self._state
+
+    def _fetch(self, conn, where: str = "", params: Iterable = ()) -> List[tuple]:
+        return conn.execute(f"""
+            SELECT rowid, id, summary, assignee, team_name, embedding, embedding_dim
+            FROM jira_tickets
+            WHERE embedding IS NOT NULL AND embedding_model = ? {where}
+        """, (self.model, *params)).fetchall()
+
+    def _build(self, rows: List[tuple], dim: Optional[int] = None) -> Tuple[list, np.ndarray]:
+        """(kept rows, normalized float32 matrix); rows that do not hold dim floats are skipped."""
+        if dim is None and rows:
+            dim = rows[0][6]
+        kept = [row for row in rows if row[6] == dim and len(row[5]) == dim * EMBEDDING_DTYPE.itemsize]
+        if not kept:
+            return [], np.zeros((0, dim or 0), dtype=np.float32)
+        matrix = embedding_matrix((row[5] for row in kept), dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # The division allocates the one writable matrix the index keeps
+        matrix = np.divide(matrix, norms, out=np.zeros(matrix.shape, dtype=np.float32), where=norms > 0)
+        return [row[:5] for row in kept], matrix
+
+    def _swap(self, rows: List[tuple], matrix: np.ndarray):
+        columns = list(zip(*rows)) if rows else [[] for _ in range(5)]
+        rowids, ids, summaries, assignees, teams = (list(column) for column in columns)
+        self._state = _IndexState(
+            rowids, ids, [s or "" for s in summaries], [a or "" for a in assignees], [t or "" for t in teams], matrix
+        )
+
+    def _rebuild(self):
+        """Load every embedded ticket."""
+        self._checked_at = time.monotonic()
+        with read_conn(self.db_path) as conn:
+            rows = self._fetch(conn) if table_exists(conn, "jira_tickets") else []
+        kept, matrix = self._build(rows)
+        self._swap(kept, matrix)
+        self._loaded = True
+        if kept:
+            print(f"🧭 Jira vector index loaded: {len(kept)} tickets x {matrix.shape[1]} dims")
+
+    def _sync(self):
+        """Append tickets embedded since the last load; rebuild if any were removed."""
+        self._checked_at = time.monotonic()
+        state = self._state
+        rows = []
+        with read_conn(self.db_path) as conn:
+            if not table_exists(conn, "jira_tickets"):
+                return
+            embedded = {row[0] for row in conn.execute(
+                "SELECT rowid FROM jira_tickets WHERE embedding IS NOT NULL AND embedding_model = ?", (self.model,)
+            )}
+            removed = not embedded.issuperset(state.rowids)
+            if not removed:
+                for chunk in chunked(sorted(embedded.difference(state.rowids)), 500):
+                    rows += self._fetch(conn, f"AND rowid IN ({', '.join('?' for _ in chunk)})", chunk)
+        if removed:
+            self._rebuild()
+        elif rows:
+            self._merge(rows)
+
+    def _merge(self, rows: List[tuple]):
+        """Replace loaded tickets (by rowid) and append new ones, building the new state aside."""
+        state = self._state
+        kept, matrix = self._build(rows, state.matrix.shape[1] if len(state.ids) else None)
+        merged_rows = list(zip(state.rowids, state.ids, state.summaries, state.assignees, state.teams))
+        merged = state.matrix.copy() if len(state.ids) else np.zeros((0, matrix.shape[1]), dtype=np.float32)
+        appended_rows, appended = [], []
+        for row, vector in zip(kept, matrix):
+            at = state.position.get(row[0])
+            if at is None:
+                appended_rows.append(row)
+                appended.append(vector)
+            else:
+                merged_rows[at] = row
+                merged[at] = vector
+        if appended:
+            merged = np.vstack([merged, np.array(appended, dtype=np.float32)])
+        self._swap(merged_rows + appended_rows, merged)
+
+    def update(self, ids: Iterable[str]):
+        """Re-read the given ticket ids (just embedded or re-embedded) into the index."""
+        ids = list(ids)
+        if not ids:
+            return
+        with self._lock:
+            if not self._loaded:
+                return  # The first search loads everything
+            rows = []
+            with read_conn(self.db_path) as conn:
+                for chunk in chunked(ids, 500):
+                    rows += self._fetch(conn, f"AND id IN ({', '.join('?' for _ in chunk)})", chunk)
+            self._merge(rows)
+
+    def search(self, query: np.ndarray, top_n: int = 3, with_team: bool = False) -> List[Tuple[float, str, str, str, str]]:
+        """
+        Top N (similarity, jira_id, summary, assignee, team_name) by cosine similarity
+        to query; with_team only considers tickets that have a team.
+        """
+        state = self._current()
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if not state.ids or top_n <= 0 or query.size != state.matrix.shape[1]:
+            return []
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        scores = state.matrix @ (query / norm)
+        candidates = scores.size
+        if with_team:
+            scores = np.where(state.has_team, scores, -np.inf)
+            candidates = int(state.has_team.sum())
+        k = min(top_n, candidates)
+        if not k:
+            return []
+        # argpartition finds the k-th best score; everything tied with it is kept so that,
+        # as with a stable sort, ties go to the earlier ticket
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= cutoff)
+        top = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+        return [
+            (float(scores[i]), state.ids[i], state.summaries[i], state.assignees[i], state.teams[i])
+            for i in top
+        ]
@@ -0,0 +1,34 @@
+"""
+JSON encoding for API responses.
+
+FastJSONResponse (the app's default response class) renders with orjson,
+which encodes the large list responses several times faster than stdlib json.
+Endpoints that return big lists build the response themselves
+(FastJSONResponse(rows)) so FastAPI also skips validating and
+jsonable_encoder-copying every row first. Falls back to stdlib json when the
+orjson wheel is not installed.
+
+See benchmark_serialization.py for numbers.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON bytes (same output as JSONResponse, just faster)."""
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,53 @@
+"""
+Compiled multi-keyword matcher for the rule-based team routing.
+
+The rule engines (TeamAssignmentService keyword matches, team_analyzer's
+analyze_with_rules, SemanticAnalyzer's area fallback) all ask the same
+question: which ordered rule is the first to have one of its lowercase
+substrings in this text? A KeywordMatcher compiles the rules once into a
+single table of (keyword, label) pairs in rule order, with each keyword kept
+only for the first rule that lists it. One pass down that table, lowercasing
+the text once, then answers: the first keyword found names the rule.
+
+The table is walked with str ``in`` rather than matched with one alternation
+regex: CPython's substring search runs in C with a fast skip loop, while the
+re module tries every alternative at every position, which measured 2-10x
+slower on these rule sets (benchmark_keyword_matcher.py has the numbers).
+"""
+from typing import Iterable, List, Optional, Set, Tuple
+
+class KeywordMatcher:
+    """Ordered (label, keywords) rules compiled for case-insensitive substring matching."""
+
+    def __init__(self, rules: Iterable[Tuple[str, Iterable[str]]]):
+        self.rules: List[Tuple[str, Tuple[str, ...]]] = [
+            (label, tuple(dict.fromkeys(k.lower() for k in keywords if k))) for label, keywords in rules
+        ]
+        # keyword -> label of the first rule listing it; walking this in order makes the first hit the answer
+        first_label = {}
+        for label, keywords in self.rules:
+            for keyword in keywords:
+                first_label.setdefault(keyword, label)
+        self._table: Tuple[Tuple[str, str], ...] = tuple(first_label.items())
+
+    def first(self, text: Optional[str], default: Optional[str] = None) -> Optional[str]:
+        """Label of the first rule with a keyword in text, else default."""
+        if not text:
+            return default
+        text = text.lower()
+        for keyword, label in self._table:
+            if keyword in text:
+                return label
+        return default
+
+    def keywords_in(self, text: Optional[str]) -> Set[str]:
+        """Every keyword occurring in text."""
+        if not text:
+            return set()
+        text = text.lower()
+        return {keyword for keyword, _ in self._table if keyword in text}
+
+    def labels_in(self, text: Optional[str]) -> List[str]:
+        """Labels of every rule with a keyword in text (candidates), in rule order."""
+        found = self.keywords_in(text)
+        return [label for label, keywords in self.rules if found.intersection(keywords)] if found else []
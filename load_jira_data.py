@@ -6,6 +6,10 @@ import sqlite3
 import csv
 import os
 from config import DB_PATH
+from bulk_write import upsert_rows
+from migrations import (
+    JIRA_COLUMNS, JIRA_CSV_COLUMNS, JIRA_EMBEDDED_COLUMNS, JIRA_EMBEDDING_COLUMNS, ensure_table,
+)
 
 # Use the most recent Jira CSV file
 CSV_PATH = "/Users/tylerwood/Downloads/Jira (8).csv"
@@ -31,11 +35,14 @@ def load_jira_tickets():
             embedding BLOB
         )
     """)
+    # Older tables lack the embedding metadata the upsert clears
+    ensure_table(conn, "jira_tickets", JIRA_COLUMNS)
     
     # Clear existing data
     cursor.execute("DELETE FROM jira_tickets")
     
     loaded_count = 0
+    tickets = []
     
     try:
         with open(CSV_PATH, 'r', encoding='utf-8') as csvfile:
@@ -69,17 +76,17 @@ def load_jira_tickets():
                            row.get('Component/s') or '').strip()
                 
                 if issue_id:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO jira_tickets 
-                        (id, summary, description, resolution, assignee, team_name)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (issue_id, summary, description, resolution, assignee, team_name))
+                    tickets.append((issue_id, summary, description, resolution, assignee, team_name))
                     
                     loaded_count += 1
                     
                     if loaded_count % 100 == 0:
                         print(f"Loaded {loaded_count} tickets...")
         
+        upsert_rows(
+            conn, "jira_tickets", JIRA_CSV_COLUMNS, tickets,
+            reset=JIRA_EMBEDDING_COLUMNS, reset_when=JIRA_EMBEDDED_COLUMNS
+        )
         conn.commit()
         print(f"\nSuccessfully loaded {loaded_count} Jira tickets!")
         
@@ -1,24 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import feedback, teams, components, chat, customer_pulse, ai_summary, reports, users, health
+import async_db
 import os
+from compression import CompressionMiddleware
+from json_response import FastJSONResponse
 
-app = FastAPI(title="Voice of Customer API")
+app = FastAPI(title="Voice of Customer API", default_response_class=FastJSONResponse)
 
-# Initialize database on startup
-@app.on_event("startup") 
-async def startup_event():
-    print("🚀 Starting Voice of Customer API...")
+def _verify_database():
+    """Blocking startup checks; run on the async_db executor from startup_event."""
+    # Verify database exists and is accessible
+    from config import DB_PATH
+    from db_connection import read_conn, write_conn
     
-    try:
-        # Verify database exists and is accessible
-        import sqlite3
-        from config import DB_PATH
-        
-        print(f"📁 Using database at: {DB_PATH}")
-        
-        # Test database connection
-        conn = sqlite3.connect(DB_PATH)
+    print(f"📁 Using database at: {DB_PATH}")
+    
+    # Test database connection
+    with read_conn() as conn:
         cursor = conn.cursor()
         
         # Check if feedback table exists and has data
@@ -31,31 +30,40 @@ async def startup_event():
             print(f"✅ Database connected successfully: {record_count} feedback records found")
         else:
             print("⚠️ Feedback table not found in database")
-        
-        # Ensure users table exists for authentication
-        cursor.execute("""CREATE TABLE IF NOT EXISTS users (
+    
+    # Ensure users table exists for authentication
+    with write_conn() as conn:
+        conn.execute("""CREATE TABLE IF NOT EXISTS users (
             email TEXT PRIMARY KEY,
             name TEXT NOT NULL,
             role TEXT NOT NULL,
             password_hash TEXT NOT NULL,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP
         )""")
+    
+    # Apply pending schema migrations (indexes etc.)
+    from migrations import run_migrations
+    print(f"🗂️ Database schema at version {run_migrations()}")
+    
+    # Initialize Jira vectorization for team assignments (optional)
+    try:
+        print("🤖 Checking Jira vectorization status...")
+        from semantic_analyzer import semantic_analyzer
+        vectorization_status = semantic_analyzer.get_vectorization_status()
+        print(f"📊 Jira tickets: {vectorization_status.get('vectorized_tickets', 0)}/{vectorization_status.get('total_tickets', 0)} vectorized")
         
-        conn.commit()
-        conn.close()
-        
-        # Initialize Jira vectorization for team assignments (optional)
-        try:
-            print("🤖 Checking Jira vectorization status...")
-            from semantic_analyzer import semantic_analyzer
-            vectorization_status = semantic_analyzer.get_vectorization_status()
-            print(f"📊 Jira tickets: {vectorization_status.get('vectorized_tickets', 0)}/{vectorization_status.get('total_tickets', 0)} vectorized")
-            
-            if vectorization_status.get('total_tickets', 0) == 0:
-                print("⚠️ No Jira tickets found - team assignment will use fallback methods")
-        except Exception as jira_error:
-            print(f"⚠️ Jira vectorization check failed (non-blocking): {jira_error}")
-        
+        if vectorization_status.get('total_tickets', 0) == 0:
+            print("⚠️ No Jira tickets found - team assignment will use fallback methods")
+    except Exception as jira_error:
+        print(f"⚠️ Jira vectorization check failed (non-blocking): {jira_error}")
+
+# Initialize database on startup
+@app.on_event("startup") 
+async def startup_event():
+    print("🚀 Starting Voice of Customer API...")
+    
+    try:
+        await async_db.run_sync(_verify_database)
         print("🎉 Voice of Customer API startup completed")
         
     except Exception as e:
@@ -80,8 +88,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination metadata for GET /feedback
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Change-Version"],
 )
 
+# gzip/zstd for large responses, negotiated per request
+app.add_middleware(CompressionMiddleware)
+
 app.include_router(feedback.router, prefix="/feedback", tags=["Feedback"])
 app.include_router(teams.router, prefix="/teams", tags=["Teams"])
 app.include_router(components.router, prefix="/components", tags=["Components"])
@@ -10,6 +10,7 @@ Based on the data evolution around May 23rd:
 """
 
 import sqlite3
+from result_cache import bump_data_version
 import logging
 from datetime import datetime
 
@@ -106,6 +107,7 @@ def migrate_description_fields():
                 if migration_count % 500 == 0:
                     logger.info(f"  📈 Migrated {migration_count} records...")
         
+        bump_data_version(conn)  # invalidate cached API results
         conn.commit()
         logger.info(f"✅ Successfully migrated {migration_count} records")
         logger.info("   Notes content has been copied to initial_description field")
@@ -0,0 +1,455 @@
+"""
+Versioned schema migrations for the Voice of Customer database.
+
+Each migration runs once, in order, in its own write transaction on the shared
+writer connection. The applied version is stored in PRAGMA user_version, so
+re-running is a no-op and a failed step rolls back without bumping the version.
+"""
+import sqlite3
+from typing import Callable, List, Tuple
+
+import embedding_store
+import feedback_types
+from db_connection import read_conn, write_conn
+
+# feedback as written by full_data_loader before typed columns (schema v1)
+_FEEDBACK_COLUMNS_V1 = [
+    ("id", "TEXT PRIMARY KEY"),
+    ("directory_link", "TEXT"),
+    ("created", "TEXT"),
+    ("week", "TEXT"),
+    ("initial_description", "TEXT"),
+    ("priority", "TEXT"),
+    ("notes", "TEXT"),
+    ("triage_rep", "TEXT"),
+    ("status", "TEXT"),
+    ("resolution_notes", "TEXT"),
+    ("related_imt", "TEXT"),
+    ("related_imt_link", "TEXT"),
+    ("type_of_report", "TEXT"),
+    ("area_impacted", "TEXT"),
+    ("environment", "TEXT"),
+    ("time_to_in_progress", "TEXT"),
+    ("time_from_in_progress_to_done", "TEXT"),
+    ("time_from_reported_to_imt_review", "TEXT"),
+    ("time_from_imt_review_to_done", "TEXT"),
+    ("time_from_report_to_resolution", "TEXT"),
+    ("source", "TEXT"),
+    ("team_routed", "TEXT"),
+]
+
+# Typed schema of migration 2: numeric durations/priority, epoch + week precomputed
+_FEEDBACK_COLUMNS_V2 = [
+    ("id", "TEXT PRIMARY KEY"),
+    ("directory_link", "TEXT"),
+    ("created", "TEXT"),
+    ("created_ts", "INTEGER"),
+    ("week", "TEXT"),
+    ("week_start", "TEXT"),
+    ("initial_description", "TEXT"),
+    ("priority", "INTEGER"),
+    ("notes", "TEXT"),
+    ("triage_rep", "TEXT"),
+    ("status", "TEXT"),
+    ("resolution_notes", "TEXT"),
+    ("related_imt", "TEXT"),
+    ("related_imt_link", "TEXT"),
+    ("type_of_report", "TEXT"),
+    ("area_impacted", "TEXT"),
+    ("environment", "TEXT"),
+    ("time_to_in_progress", "REAL"),
+    ("time_from_in_progress_to_done", "REAL"),
+    ("time_from_reported_to_imt_review", "REAL"),
+    ("time_from_imt_review_to_done", "REAL"),
+    ("time_from_report_to_resolution", "REAL"),
+    ("source", "TEXT"),
+    ("team_routed", "TEXT"),
+]
+
+# Current feedback schema: v2 plus the ingest-time team assignment
+# (feedback_read.team_assignment); team_method is NULL until a row is assigned
+FEEDBACK_COLUMNS = _FEEDBACK_COLUMNS_V2 + [
+    ("team_assigned", "TEXT"),
+    ("team_method", "TEXT"),
+    ("team_confidence", "REAL"),
+]
+
+_FEEDBACK_INDEXES_V2 = [
+    "CREATE INDEX IF NOT EXISTS idx_feedback_created ON feedback(created DESC, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_team_created ON feedback(team_routed, created)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_priority_created ON feedback(priority, created)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_env_created ON feedback(environment, created)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_area ON feedback(area_impacted)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_type ON feedback(type_of_report)",
+    # Date range filters and monthly/weekly aggregation on numeric columns
+    "CREATE INDEX IF NOT EXISTS idx_feedback_created_ts ON feedback(created_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_week_env ON feedback(week_start, environment)",
+]
+
+FEEDBACK_INDEXES = _FEEDBACK_INDEXES_V2 + [
+    # Rows the team assignment backfill still has to cover (stays tiny once it has run)
+    "CREATE INDEX IF NOT EXISTS idx_feedback_team_pending ON feedback(id) WHERE team_method IS NULL",
+]
+
+# /feedback response fields in response order, then the raw values the filters match on
+FEEDBACK_READ_COLUMNS = [
+    ("id", "TEXT PRIMARY KEY"),
+    ("description", "TEXT"),
+    ("priority", "TEXT"),
+    ("team", "TEXT"),
+    ("environment", "TEXT"),
+    ("area_impacted", "TEXT"),
+    ("created", "TEXT"),
+    ("week", "TEXT"),
+    ("issue_number", "TEXT"),
+    ("status", "TEXT"),
+    ("reporter_email", "TEXT"),
+    ("slack_thread", "TEXT"),
+    ("type_of_issue", "TEXT"),
+    ("type_of_report", "TEXT"),
+    ("source", "TEXT"),
+    ("triage_rep", "TEXT"),
+    ("team_routed", "TEXT"),
+    ("priority_rank", "INTEGER"),
+    ("environment_raw", "TEXT"),
+    ("created_ts", "INTEGER"),
+]
+
+# Every index ends in (created, id) so keyset pages (ORDER BY created DESC, id DESC)
+# are a backwards range scan, and filtered counts are covered
+FEEDBACK_READ_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_page ON feedback_read(created, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_shown_team_page ON feedback_read(team, created, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_priority_page ON feedback_read(priority_rank, created, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_env_page ON feedback_read(environment_raw, created, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_status_page ON feedback_read(status, created, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_area_page ON feedback_read(area_impacted, created, id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_source_page ON feedback_read(source, created, id)",
+    # Covers the facet cube (feedback_facets): GROUP BY in index order, no table reads
+    "CREATE INDEX IF NOT EXISTS idx_feedback_read_shown_facets ON feedback_read(team, priority, environment, status)",
+]
+
+# Replaced by the *_page indexes in migration 6
+_FEEDBACK_READ_INDEXES_V5 = [
+    "idx_feedback_read_created",
+    "idx_feedback_read_team_created",
+    "idx_feedback_read_priority_created",
+    "idx_feedback_read_env_created",
+]
+
+# Replaced in migration 13, when the team filter and the facets moved to the displayed values
+_FEEDBACK_READ_INDEXES_V12 = [
+    "idx_feedback_read_team_page",
+    "idx_feedback_read_facets",
+]
+
+# Delta sync log: latest change version per feedback id (deleted=1 is a tombstone)
+FEEDBACK_CHANGES_COLUMNS = [
+    ("id", "TEXT PRIMARY KEY"),
+    ("version", "INTEGER NOT NULL"),
+    ("deleted", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+FEEDBACK_CHANGES_INDEXES = [
+    # GET /feedback/changes reads a version range; tombstone pruning too
+    "CREATE INDEX IF NOT EXISTS idx_feedback_changes_version ON feedback_changes(version)",
+]
+
+_JIRA_COLUMNS_V1 = [
+    ("id", "TEXT PRIMARY KEY"),
+    ("summary", "TEXT"),
+    ("description", "TEXT"),
+    ("resolution", "TEXT"),
+    ("assignee", "TEXT"),
+    ("team_name", "TEXT"),
+    ("embedding", "BLOB"),
+    ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+]
+
+# embedding is raw little-endian float32 (embedding_store); its length and source model alongside
+EMBEDDING_META_COLUMNS = [
+    ("embedding_dim", "INTEGER"),
+    ("embedding_model", "TEXT"),
+]
+
+JIRA_COLUMNS = _JIRA_COLUMNS_V1 + EMBEDDING_META_COLUMNS
+
+# Columns the Jira CSV loaders fill (embedding is computed later by vectorize)
+JIRA_CSV_COLUMNS = ("id", "summary", "description", "resolution", "assignee", "team_name")
+# The embedding is computed from these; a reload that changes them clears it
+# (JIRA_EMBEDDING_COLUMNS) so vectorizing picks the ticket up again
+JIRA_EMBEDDED_COLUMNS = ("summary", "description")
+JIRA_EMBEDDING_COLUMNS = ("embedding",) + tuple(name for name, _ in EMBEDDING_META_COLUMNS)
+
+CACHE_METADATA_COLUMNS = [
+    ("key", "TEXT PRIMARY KEY"),
+    ("value", "TEXT"),
+    ("last_updated", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+]
+
+# Full-text indexes: (fts table, content table, indexed columns)
+FTS_INDEXES = [
+    ("feedback_fts", "feedback", ["initial_description", "notes", "resolution_notes"]),
+    ("jira_fts", "jira_tickets", ["summary", "description"]),
+]
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    ).fetchone()
+    return row is not None
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+def ensure_table(conn: sqlite3.Connection, table: str, columns: List[Tuple[str, str]]):
+    """Create the table, or add any columns an older schema is missing."""
+    if not table_exists(conn, table):
+        column_sql = ",\n    ".join(f"{name} {decl}" for name, decl in columns)
+        conn.execute(f"CREATE TABLE {table} (\n    {column_sql}\n)")
+        return
+
+    existing = set(table_columns(conn, table))
+    for name, decl in columns:
+        if name not in existing:
+            # ALTER TABLE cannot add PRIMARY KEY columns; plain type is enough there
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl.split()[0]}")
+
+def _m001_feedback_query_indexes(conn: sqlite3.Connection):
+    """Indexes for the /feedback filters + created sort and the /components DISTINCT scans."""
+    ensure_table(conn, "feedback", _FEEDBACK_COLUMNS_V1)
+
+    # GET /feedback: unfiltered list sorted by created DESC
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_created ON feedback(created DESC, id)")
+    # GET /feedback?team=|priority=|environment=: equality filter, rows come back already sorted
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_team_created ON feedback(team_routed, created)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_priority_created ON feedback(priority, created)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_env_created ON feedback(environment, created)")
+    # GET /components: DISTINCT scans served from covering indexes
+    # (environment is covered by idx_feedback_env_created)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_area ON feedback(area_impacted)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_type ON feedback(type_of_report)")
+
+    # GET /reports/response-times?environment=: filter by environment, ordered by week
+    if table_exists(conn, "response_times_cache"):
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rt_cache_env_week ON response_times_cache(environment, week_label)"
+        )
+
+def _m002_typed_feedback(conn: sqlite3.Connection):
+    """
+    Rebuild feedback with typed columns and backfill them from the TEXT values.
+
+    SQLite cannot change a column's type in place, so this copies into a new
+    table and swaps it in. Under WAL, readers keep serving the old table until
+    the transaction commits; columns outside the known schema (e.g. embedding)
+    are carried over unchanged.
+    """
+    conn.create_function("voc_priority", 1, feedback_types.parse_priority, deterministic=True)
+    conn.create_function("voc_duration", 1, feedback_types.parse_duration, deterministic=True)
+    conn.create_function("voc_epoch", 1, feedback_types.created_epoch, deterministic=True)
+    conn.create_function("voc_week_start", 1, feedback_types.week_start, deterministic=True)
+
+    ensure_table(conn, "feedback", _FEEDBACK_COLUMNS_V1)
+    typed = dict(_FEEDBACK_COLUMNS_V2)
+    extra = []
+    for _, name, decl_type, _, default, _ in conn.execute("PRAGMA table_info(feedback)").fetchall():
+        if name not in typed:
+            decl = decl_type or ""
+            if default is not None:
+                decl += f" DEFAULT {default}"
+            extra.append((name, decl.strip()))
+
+    conversions = {
+        "priority": "voc_priority(priority)",
+        "created_ts": "voc_epoch(created)",
+        "week_start": "voc_week_start(created)",
+    }
+    for column in feedback_types.DURATION_COLUMNS:
+        conversions[column] = f"voc_duration({column})"
+
+    columns = _FEEDBACK_COLUMNS_V2 + extra
+    column_sql = ",\n    ".join(f"{name} {decl}".strip() for name, decl in columns)
+    names = ", ".join(name for name, _ in columns)
+    selects = ", ".join(conversions.get(name, name) for name, _ in columns)
+
+    conn.execute("DROP TABLE IF EXISTS feedback_typed")
+    conn.execute(f"CREATE TABLE feedback_typed (\n    {column_sql}\n)")
+    conn.execute(f"INSERT INTO feedback_typed ({names}) SELECT {selects} FROM feedback")
+    conn.execute("DROP TABLE feedback")
+    conn.execute("ALTER TABLE feedback_typed RENAME TO feedback")
+    for statement in _FEEDBACK_INDEXES_V2:
+        conn.execute(statement)
+
+def fts_statements(fts: str, table: str, columns: List[str]) -> List[str]:
+    """
+    DDL for an external-content FTS5 index over table and the triggers that sync it.
+
+    The index stores only postings (the text stays in the content table) and is
+    keyed by the content table's rowid. INSERT OR REPLACE only fires the delete
+    trigger with PRAGMA recursive_triggers=ON, which writers must enable.
+    A migration that rebuilds the content table must recreate the triggers.
+    """
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values});"
+    insert = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='rowid', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN {delete} {insert} END",
+    ]
+
+def _m003_full_text_search(conn: sqlite3.Connection):
+    """FTS5 indexes for text search over feedback and Jira, backfilled from existing rows."""
+    ensure_table(conn, "feedback", FEEDBACK_COLUMNS)
+    ensure_table(conn, "jira_tickets", _JIRA_COLUMNS_V1)
+    for fts, table, columns in FTS_INDEXES:
+        for statement in fts_statements(fts, table, columns):
+            conn.execute(statement)
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+def _m004_feedback_generation(conn: sqlite3.Connection):
+    """cache_metadata holds the published feedback generation (bumped by feedback_ingest)."""
+    ensure_table(conn, "cache_metadata", CACHE_METADATA_COLUMNS)
+    conn.execute("DROP TABLE IF EXISTS feedback_next")
+
+def _m005_feedback_read(conn: sqlite3.Connection):
+    """Materialized /feedback response rows, backfilled from the current feedback table."""
+    from feedback_read import refresh_feedback_read
+
+    ensure_table(conn, "feedback", FEEDBACK_COLUMNS)
+    ensure_table(conn, "feedback_read", FEEDBACK_READ_COLUMNS)
+    for statement in FEEDBACK_READ_INDEXES:
+        conn.execute(statement)
+    conn.execute("DROP TABLE IF EXISTS feedback_read_next")
+    refresh_feedback_read(conn)
+
+def _m006_feedback_read_keyset_indexes(conn: sqlite3.Connection):
+    """(created, id) keyed indexes for keyset pagination of /feedback."""
+    for name in _FEEDBACK_READ_INDEXES_V5:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for statement in FEEDBACK_READ_INDEXES:
+        conn.execute(statement)
+
+def _m007_feedback_read_filter_indexes(conn: sqlite3.Connection):
+    """Status, area and source filters of the /feedback query builder."""
+    for statement in FEEDBACK_READ_INDEXES:
+        conn.execute(statement)
+
+def _m008_feedback_read_facet_index(conn: sqlite3.Connection):
+    """Covering index for the /feedback/facets cube."""
+    for statement in FEEDBACK_READ_INDEXES:
+        conn.execute(statement)
+
+def _m009_feedback_changes(conn: sqlite3.Connection):
+    """Change log for GET /feedback/changes; clients start from a full load, so no backfill."""
+    ensure_table(conn, "feedback_changes", FEEDBACK_CHANGES_COLUMNS)
+    for statement in FEEDBACK_CHANGES_INDEXES:
+        conn.execute(statement)
+
+def _m010_feedback_team_assignment(conn: sqlite3.Connection):
+    """Persisted team assignment columns; existing rows are filled by backfill_team_assignments.py."""
+    ensure_table(conn, "feedback", FEEDBACK_COLUMNS)
+    for statement in FEEDBACK_INDEXES:
+        conn.execute(statement)
+
+def _m011_raw_float32_embeddings(conn: sqlite3.Connection):
+    """
+    Convert pickled embedding blobs to raw float32 with embedding_dim/embedding_model,
+    in place. Covers jira_tickets and, where an embedding column was added to it,
+    feedback. Blobs that are not pickled arrays are cleared so vectorizing redoes them.
+    """
+    ensure_table(conn, "jira_tickets", JIRA_COLUMNS)
+    for table in ("jira_tickets", "feedback"):
+        if not table_exists(conn, table) or "embedding" not in table_columns(conn, table):
+            continue
+        ensure_table(conn, table, EMBEDDING_META_COLUMNS)
+        converted = cleared = 0
+        last_rowid = 0
+        while True:
+            rows = conn.execute(
+                f"SELECT rowid, embedding FROM {table} "
+                f"WHERE rowid > ? AND embedding IS NOT NULL AND embedding_dim IS NULL ORDER BY rowid LIMIT 500",
+                (last_rowid,)
+            ).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            updates = []
+            for rowid, blob in rows:
+                vector = embedding_store.legacy_embedding(blob)
+                if vector is None:
+                    updates.append((None, None, None, rowid))
+                    cleared += 1
+                else:
+                    updates.append((
+                        embedding_store.encode_embedding(vector), vector.size, embedding_store.EMBEDDING_MODEL, rowid
+                    ))
+                    converted += 1
+            conn.executemany(
+                f"UPDATE {table} SET embedding = ?, embedding_dim = ?, embedding_model = ? WHERE rowid = ?", updates
+            )
+        print(f"  🔢 {table}: {converted} embeddings converted to float32, {cleared} unreadable cleared")
+
+def _m012_feedback_read_created_ts(conn: sqlite3.Connection):
+    """
+    Typed created_ts on feedback_read for the /feedback created range, copied from
+    feedback. No index: the range seeks on the (..., created, id) indexes and
+    created_ts is tested on the rows in that window (see feedback_query._created_range).
+    """
+    ensure_table(conn, "feedback_read", FEEDBACK_READ_COLUMNS)
+    # Response columns are unchanged, so this is not logged for delta sync clients
+    conn.execute("""
+        UPDATE feedback_read SET created_ts = (
+            SELECT f.created_ts FROM feedback AS f WHERE f.id = feedback_read.id
+        )
+    """)
+
+def _m013_feedback_read_shown_value_indexes(conn: sqlite3.Connection):
+    """Team filter and facet indexes over the displayed team/priority/environment/status."""
+    for name in _FEEDBACK_READ_INDEXES_V12:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for statement in FEEDBACK_READ_INDEXES:
+        conn.execute(statement)
+
+# (version, description, step) - append only, never renumber
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "feedback query indexes", _m001_feedback_query_indexes),
+    (2, "typed feedback columns", _m002_typed_feedback),
+    (3, "full-text search indexes", _m003_full_text_search),
+    (4, "feedback snapshot generation", _m004_feedback_generation),
+    (5, "feedback read model", _m005_feedback_read),
+    (6, "feedback keyset pagination indexes", _m006_feedback_read_keyset_indexes),
+    (7, "feedback filter indexes", _m007_feedback_read_filter_indexes),
+    (8, "feedback facet index", _m008_feedback_read_facet_index),
+    (9, "feedback change log", _m009_feedback_changes),
+    (10, "feedback team assignment", _m010_feedback_team_assignment),
+    (11, "raw float32 embeddings", _m011_raw_float32_embeddings),
+    (12, "feedback created range on created_ts", _m012_feedback_read_created_ts),
+    (13, "feedback displayed value indexes", _m013_feedback_read_shown_value_indexes),
+]
+
+def current_version(db_path=None) -> int:
+    with read_conn(db_path) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def run_migrations(db_path=None) -> int:
+    """Apply pending migrations and return the resulting schema version."""
+    version = current_version(db_path)
+    for target, description, step in MIGRATIONS:
+        if target <= version:
+            continue
+        print(f"🔄 Applying migration {target}: {description}")
+        with write_conn(db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+        version = target
+    return version
+
+if __name__ == "__main__":
+    print(f"✅ Database schema at version {run_migrations()}")
@@ -0,0 +1,85 @@
+"""
+Character n-gram TF-IDF index for fuzzy matching short strings (team names).
+
+Each indexed name becomes an L2-normalized TF-IDF vector over the character
+n-grams of its words (padded with a space on each side, so word starts and
+ends count), with smoothed IDF over the indexed names. Scoring a batch of
+texts is one dense matrix product, texts x vocabulary times vocabulary x
+names, giving the cosine similarity of every text to every name in [0, 1].
+N-grams that no name contains are dropped, since they cannot add to any score.
+shares_word() does the same for whole-word overlap.
+
+The vocabulary is the n-grams of a few dozen names (hundreds of columns), so
+dense numpy matrices are small and faster than sparse ones here.
+"""
+from collections import Counter
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+
+NGRAM_SIZE = 3
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> Counter:
+    """Counts of the n-grams of each lowercased word padded as ' word '."""
+    grams = Counter()
+    for word in (text or "").lower().split():
+        padded = f" {word} "
+        grams.update(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+    return grams
+
+class CharNgramTfidf:
+    """TF-IDF matrix of names, built once; similarity() scores texts against all of them."""
+
+    def __init__(self, names: Sequence[str], n: int = NGRAM_SIZE):
+        self.n = n
+        self.names = list(names)
+        documents = [char_ngrams(name, n) for name in self.names]
+        self.vocabulary: Dict[str, int] = {
+            gram: i for i, gram in enumerate(sorted(set().union(*documents)))
+        }
+        document_frequency = np.zeros(len(self.vocabulary))
+        for document in documents:
+            for gram in document:
+                document_frequency[self.vocabulary[gram]] += 1
+        # Smoothed IDF (as scikit-learn's TfidfVectorizer): grams shared by many names weigh less
+        self.idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        self.matrix = self._vectors(documents)
+
+        # Whole-word incidence of the names, for shares_word()
+        name_words = [set(name.lower().split()) for name in self.names]
+        self.word_vocabulary: Dict[str, int] = {
+            word: i for i, word in enumerate(sorted(set().union(*name_words)))
+        }
+        self.word_matrix = np.zeros((len(self.names), len(self.word_vocabulary)))
+        for row, words in enumerate(name_words):
+            self.word_matrix[row, [self.word_vocabulary[word] for word in words]] = 1
+
+    def _vectors(self, documents: Iterable[Counter]) -> np.ndarray:
+        documents = list(documents)
+        vectors = np.zeros((len(documents), len(self.vocabulary)))
+        for row, document in enumerate(documents):
+            for gram, count in document.items():
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    vectors[row, column] = count
+        vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalized TF-IDF rows for texts (len(texts) x vocabulary)."""
+        return self._vectors(char_ngrams(text, self.n) for text in texts)
+
+    def similarity(self, texts: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every text to every name (len(texts) x len(names))."""
+        if not texts or not self.names:
+            return np.zeros((len(texts), len(self.names)))
+        return self.transform(texts) @ self.matrix.T
+
+    def shares_word(self, texts: Sequence[str]) -> np.ndarray:
+        """Boolean len(texts) x len(names): whether text and name share a lowercased word."""
+        text_matrix = np.zeros((len(texts), len(self.word_vocabulary)))
+        for row, text in enumerate(texts):
+            columns = [self.word_vocabulary[w] for w in set((text or "").lower().split()) if w in self.word_vocabulary]
+            text_matrix[row, columns] = 1
+        return (text_matrix @ self.word_matrix.T) > 0
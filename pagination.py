@@ -0,0 +1,45 @@
+"""
+Keyset pagination helpers for list endpoints.
+
+Pages are ordered by their sort keys plus id (created DESC, id DESC by
+default) and the next page starts strictly after the last row returned, so a
+page costs an index seek plus ``limit`` rows no matter how deep the client has
+paged (no OFFSET scan). The cursor handed to clients is an opaque url-safe
+token wrapping the last row's key values.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Largest page a client may ask for
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(*key: Any) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, ...]]:
+    """Return the key values a cursor points after; ValueError if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(key, list) or not key or not all(isinstance(v, (str, int, float)) for v in key):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return tuple(key)
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Columns for a comma-separated ``fields=`` projection, in the order given;
+    all allowed columns when unset. ValueError names any unknown field.
+    """
+    if not fields:
+        return list(allowed)
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown or not requested:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or fields!r}. Allowed: {', '.join(allowed)}")
+    return requested
@@ -10,6 +10,9 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 from dotenv import load_dotenv
+from feedback_types import parse_duration
+from result_cache import bump_data_version
+from bulk_write import insert_rows
 
 load_dotenv()
 
@@ -18,6 +21,11 @@ AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
 BASE_ID = os.getenv("AIRTABLE_BASE_ID")
 TABLE_NAME = os.getenv("AIRTABLE_TABLE_NAME", "Imported table")
 
+AVERAGE_COLUMNS = (
+    "time_to_in_progress_avg", "time_in_progress_to_done_avg", "time_reported_to_referred_avg",
+    "time_referred_to_done_avg", "time_report_to_resolution_avg",
+)
+
 def quick_update():
     """Quick update with limited data for immediate results."""
     print("🚀 Quick cache update starting...")
@@ -78,12 +86,7 @@ def quick_update():
             week_key = week_start.strftime('%Y-%m-%d')
             
             def safe_float(v):
-                if v is None or v == '':
-                    return 0
-                try:
-                    return float(str(v)) if not str(v).lower() in ['nan', 'null', 'none'] else 0
-                except:
-                    return 0
+                return parse_duration(v) or 0
             
             record_data = {
                 'time_report_to_resolution': safe_float(fields.get('Time From Report to Resolution')),
@@ -147,17 +150,7 @@ def quick_update():
     cursor.execute("DELETE FROM response_times_cache")
     cursor.execute("DELETE FROM response_times_weighted")
     
-    for row in rows:
-        cursor.execute('''
-            INSERT INTO response_times_cache 
-            (week_label, count, time_to_in_progress_avg, time_in_progress_to_done_avg,
-             time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            row['week_label'], row['count'], row['time_to_in_progress_avg'],
-            row['time_in_progress_to_done_avg'], row['time_reported_to_referred_avg'],
-            row['time_referred_to_done_avg'], row['time_report_to_resolution_avg']
-        ))
+    insert_rows(conn, "response_times_cache", ("week_label", "count") + AVERAGE_COLUMNS, rows)
     
     cursor.execute('''
         INSERT INTO response_times_weighted 
@@ -170,6 +163,7 @@ def quick_update():
         weighted['time_referred_to_done_avg'], weighted['time_report_to_resolution_avg']
     ))
     
+    bump_data_version(conn)  # invalidate cached /reports results
     conn.commit()
     conn.close()
     
@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 from dotenv import load_dotenv
+from feedback_types import parse_duration
+from result_cache import bump_data_version
+from bulk_write import insert_rows
 
 load_dotenv()
 
@@ -110,13 +113,7 @@ def process_records(records):
             
             # Helper function for safe number conversion
             def num_or_zero(v):
-                if v is None:
-                    return 0
-                try:
-                    n = float(v)
-                    return n if not (n != n) else 0  # Check for NaN
-                except (ValueError, TypeError):
-                    return 0
+                return parse_duration(v) or 0
             
             # Collect response time metrics
             record_data = {
@@ -222,6 +219,13 @@ def calculate_weekly_averages(weekly_data):
     logger.info(f"✅ Calculated weighted averages for {len(weighted_averages)} environments")
     return rows, weighted_averages
 
+AVERAGE_COLUMNS = (
+    "time_to_in_progress_avg", "time_in_progress_to_done_avg", "time_reported_to_referred_avg",
+    "time_referred_to_done_avg", "time_report_to_resolution_avg",
+)
+WEEKLY_COLUMNS = ("week_label", "environment", "count") + AVERAGE_COLUMNS
+WEIGHTED_COLUMNS = ("environment", "count") + AVERAGE_COLUMNS
+
 def update_cache(weekly_rows, weighted_averages):
     """Update the database cache with new data."""
     logger.info("Updating database cache...")
@@ -235,31 +239,12 @@ def update_cache(weekly_rows, weighted_averages):
         cursor.execute("DELETE FROM response_times_weighted")
         
         # Insert weekly data with environment
-        for row in weekly_rows:
-            cursor.execute('''
-                INSERT INTO response_times_cache 
-                (week_label, environment, count, time_to_in_progress_avg, time_in_progress_to_done_avg,
-                 time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                row['week_label'], row['environment'], row['count'], row['time_to_in_progress_avg'],
-                row['time_in_progress_to_done_avg'], row['time_reported_to_referred_avg'],
-                row['time_referred_to_done_avg'], row['time_report_to_resolution_avg']
-            ))
+        insert_rows(conn, "response_times_cache", WEEKLY_COLUMNS, weekly_rows)
         
         # Insert weighted averages for each environment
-        for weighted in weighted_averages:
-            cursor.execute('''
-                INSERT INTO response_times_weighted 
-                (environment, count, time_to_in_progress_avg, time_in_progress_to_done_avg,
-                 time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                weighted['environment'], weighted['count'], weighted['time_to_in_progress_avg'],
-                weighted['time_in_progress_to_done_avg'], weighted['time_reported_to_referred_avg'],
-                weighted['time_referred_to_done_avg'], weighted['time_report_to_resolution_avg']
-            ))
+        insert_rows(conn, "response_times_weighted", WEIGHTED_COLUMNS, weighted_averages)
         
+        bump_data_version(conn)  # invalidate cached /reports results
         conn.commit()
         logger.info(f"✅ Updated cache with {len(weekly_rows)} weekly records and {len(weighted_averages)} weighted averages")
         
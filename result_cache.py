@@ -0,0 +1,126 @@
+"""
+Process-local cache for read endpoint results, keyed by data version.
+
+Entries are stored under (endpoint, normalized params, data version). The
+data version lives in cache_metadata and is bumped in the same transaction
+as every write to served data (feedback snapshots and upserts, response-time
+cache rebuilds, team assignment scripts), so a bump makes all older entries
+unreachable and they age out of the LRU. Between refreshes a repeat request
+costs one primary-key lookup of the version.
+
+Cached values are shared between requests and must not be mutated.
+"""
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from db_connection import read_conn
+from migrations import CACHE_METADATA_COLUMNS, ensure_table
+
+DATA_VERSION_KEY = "data_version"
+# Distinct (endpoint, params, version) results kept in memory
+MAX_ENTRIES = 256
+
+def data_version(conn: sqlite3.Connection) -> Optional[int]:
+    """Current data version, or None if the schema has no cache_metadata yet (caching disabled)."""
+    try:
+        row = conn.execute("SELECT value FROM cache_metadata WHERE key = ?", (DATA_VERSION_KEY,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else 0
+
+def data_version_info(conn: sqlite3.Connection) -> Tuple[Optional[int], Optional[str]]:
+    """(data version, UTC 'YYYY-MM-DD HH:MM:SS' it was last bumped); (None, None) without cache_metadata."""
+    try:
+        row = conn.execute(
+            "SELECT value, last_updated FROM cache_metadata WHERE key = ?", (DATA_VERSION_KEY,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None, None
+    return (int(row[0]), row[1]) if row else (0, None)
+
+def current_data_version(db_path=None) -> Optional[int]:
+    with read_conn(db_path) as conn:
+        return data_version(conn)
+
+def bump_data_version(conn: sqlite3.Connection) -> int:
+    """Invalidate cached results; call inside the transaction that changes served data."""
+    version = data_version(conn)
+    if version is None:
+        # Scripts can run against a database the app has not migrated yet
+        ensure_table(conn, "cache_metadata", CACHE_METADATA_COLUMNS)
+        version = 0
+    version += 1
+    conn.execute("""
+        INSERT INTO cache_metadata (key, value, last_updated) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_updated = excluded.last_updated
+    """, (DATA_VERSION_KEY, str(version)))
+    return version
+
+def normalize_params(params: Dict[str, Any]) -> tuple:
+    """Order-independent params key; unset filters (None/'') are dropped."""
+    return tuple(sorted((name, value) for name, value in params.items() if value not in (None, "")))
+
+class ResultCache:
+    """Size-bounded LRU of endpoint results with hit/miss counters."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, endpoint: str, params: Dict[str, Any], version: Optional[int]):
+        """Return (found, value)."""
+        if version is None:
+            return False, None
+        key = (endpoint, normalize_params(params), version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, endpoint: str, params: Dict[str, Any], version: Optional[int], value: Any):
+        if version is None:
+            return
+        key = (endpoint, normalize_params(params), version)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+result_cache = ResultCache()
+
+def cached(conn: sqlite3.Connection, endpoint: str, params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+    """Serve endpoint's result for params from memory, or compute and remember it for this data version."""
+    version = data_version(conn)
+    found, value = result_cache.get(endpoint, params, version)
+    if found:
+        return value
+    value = compute()
+    result_cache.put(endpoint, params, version, value)
+    return value
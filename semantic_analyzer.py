@@ -3,12 +3,16 @@
 Robust semantic analysis system for team assignment and chat functionality
 Handles both OpenAI embeddings and simple text fallback
 """
-import sqlite3
 import numpy as np
-import pickle
 import os
 from typing import List, Tuple, Dict, Any, Optional
 from config import DB_PATH, OPENAI_API_KEY
+from db_connection import read_conn, write_conn
+from embedding_store import EMBEDDING_MODEL, encode_embedding
+from feedback_types import priority_label
+from jira_vector_index import JiraVectorIndex
+from keyword_matcher import KeywordMatcher
+import text_search
 
 # OpenAI client setup with error handling
 try:
@@ -25,9 +29,27 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("⚠️ OpenAI package not installed")
 
+# Area keywords per team for the area fallback, checked in order
+AREA_KEYWORDS = [
+    ("Salesforce Team", ["salesforce"]),
+    ("Billing Team", ["billing", "payment"]),
+    ("Underwriting Team", ["underwriting"]),
+    ("Claims Team", ["claims"]),
+    ("Portal Team", ["portal", "dashboard"]),
+]
+_area_matcher = KeywordMatcher(AREA_KEYWORDS)
+
 class SemanticAnalyzer:
     def __init__(self):
         self.db_path = DB_PATH
+        self._jira_index = None
+    
+    @property
+    def jira_index(self) -> JiraVectorIndex:
+        """Normalized embedding matrix of the Jira tickets in db_path, loaded on first use."""
+        if self._jira_index is None or self._jira_index.db_path != self.db_path:
+            self._jira_index = JiraVectorIndex(self.db_path)
+        return self._jira_index
         
     def embed_text(self, text: str) -> Optional[np.ndarray]:
         """Generate an embedding for the given text."""
@@ -36,7 +58,7 @@ class SemanticAnalyzer:
         
         try:
             response = openai_client.embeddings.create(
-                model="text-embedding-3-small",
+                model=EMBEDDING_MODEL,
                 input=text.strip()
             )
             return np.array(response.data[0].embedding, dtype=np.float32)
@@ -60,93 +82,42 @@ class SemanticAnalyzer:
             return []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if we have Jira tickets with embeddings
-            cursor.execute("""
-                SELECT COUNT(*) FROM jira_tickets 
-                WHERE embedding IS NOT NULL
-            """)
-            embedded_count = cursor.fetchone()[0]
-            
-            if embedded_count > 0 and OPENAI_AVAILABLE:
-                # Use semantic similarity
-                return self._semantic_jira_search(question, top_n, cursor)
-            else:
-                # Fall back to text search
-                return self._text_jira_search(question, top_n, cursor)
+            # Use semantic similarity when tickets are embedded
+            if OPENAI_AVAILABLE:
+                matches = self._semantic_jira_search(question, top_n)
+                if matches is not None:
+                    return matches
+            
+            # Fall back to text search
+            with read_conn(self.db_path) as conn:
+                return self._text_jira_search(question, top_n, conn.cursor())
                 
         except Exception as e:
             print(f"⚠️ Jira search error: {e}")
             return []
-        finally:
-            try:
-                conn.close()
-            except:
-                pass
     
-    def _semantic_jira_search(self, question: str, top_n: int, cursor) -> List[Tuple[float, str, str, str, str]]:
-        """Semantic search using embeddings"""
+    def _semantic_jira_search(self, question: str, top_n: int) -> Optional[List[Tuple[float, str, str, str, str]]]:
+        """Semantic search over the in-memory Jira vector index; None when it cannot run (use text search)"""
         try:
+            if not len(self.jira_index):
+                return None
             query_embedding = self.embed_text(question)
             if query_embedding is None:
-                return self._text_jira_search(question, top_n, cursor)
-            
-            cursor.execute("""
-                SELECT id, summary, assignee, team_name, embedding
-                FROM jira_tickets
-                WHERE embedding IS NOT NULL
-            """)
-            jira_rows = cursor.fetchall()
-            
-            similarities = []
-            for j_id, summary, assignee, team, emb_blob in jira_rows:
-                try:
-                    embedding = pickle.loads(emb_blob)
-                    similarity = self.cosine_similarity(query_embedding, embedding)
-                    similarities.append((similarity, j_id, summary or "", assignee or "", team or ""))
-                except Exception as e:
-                    continue
-            
-            similarities.sort(reverse=True, key=lambda x: x[0])
-            return similarities[:top_n]
+                return None
+            return self.jira_index.search(query_embedding, top_n)
             
         except Exception as e:
             print(f"⚠️ Semantic search failed, falling back to text search: {e}")
-            return self._text_jira_search(question, top_n, cursor)
+            return None
     
     def _text_jira_search(self, question: str, top_n: int, cursor) -> List[Tuple[float, str, str, str, str]]:
-        """Simple text-based search fallback"""
+        """BM25 full-text search fallback (FTS5 index, no embeddings needed)"""
         try:
-            # Simple keyword matching
-            keywords = question.lower().split()
-            
-            cursor.execute("""
-                SELECT id, summary, description, assignee, team_name
-                FROM jira_tickets
-                WHERE team_name IS NOT NULL AND team_name != ''
-            """)
-            jira_rows = cursor.fetchall()
-            
-            matches = []
-            for j_id, summary, description, assignee, team in jira_rows:
-                # Combine summary and description for matching
-                text = f"{summary or ''} {description or ''}".lower()
-                
-                # Count keyword matches
-                score = 0
-                for keyword in keywords:
-                    if len(keyword) > 2:  # Ignore very short words
-                        score += text.count(keyword)
-                
-                if score > 0:
-                    # Normalize score (0-1 range to match semantic similarity)
-                    normalized_score = min(score / 10.0, 1.0)
-                    matches.append((normalized_score, j_id, summary or "", assignee or "", team or ""))
-            
-            matches.sort(reverse=True, key=lambda x: x[0])
-            return matches[:top_n]
+            rows = text_search.search_jira(cursor.connection, question, top_n, with_team=True)
+            return [
+                (score, j_id, summary or "", assignee or "", team or "")
+                for score, j_id, summary, _, assignee, team in rows
+            ]
             
         except Exception as e:
             print(f"⚠️ Text search failed: {e}")
@@ -161,52 +132,23 @@ class SemanticAnalyzer:
             return []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # For now, use simple text search for feedback
-            # TODO: Add embedding support for feedback if needed
-            return self._text_feedback_search(question, top_n, cursor)
+            with read_conn(self.db_path) as conn:
+                # For now, use simple text search for feedback
+                # TODO: Add embedding support for feedback if needed
+                return self._text_feedback_search(question, top_n, conn.cursor())
             
         except Exception as e:
             print(f"⚠️ Feedback search error: {e}")
             return []
-        finally:
-            try:
-                conn.close()
-            except:
-                pass
     
     def _text_feedback_search(self, question: str, top_n: int, cursor) -> List[Tuple[float, str, str, str, str]]:
-        """Simple text-based feedback search"""
+        """BM25 full-text feedback search (FTS5 index)"""
         try:
-            keywords = question.lower().split()
-            
-            cursor.execute("""
-                SELECT id, initial_description, notes, priority, team_routed
-                FROM feedback
-                WHERE initial_description IS NOT NULL OR notes IS NOT NULL
-            """)
-            feedback_rows = cursor.fetchall()
-            
-            matches = []
-            for f_id, initial_desc, notes, priority, team in feedback_rows:
-                # Combine description and notes for matching
-                text = f"{initial_desc or ''} {notes or ''}".lower()
-                
-                # Count keyword matches
-                score = 0
-                for keyword in keywords:
-                    if len(keyword) > 2:
-                        score += text.count(keyword)
-                
-                if score > 0:
-                    normalized_score = min(score / 5.0, 1.0)
-                    description = initial_desc or notes or "No description"
-                    matches.append((normalized_score, f_id, description, priority or "", team or ""))
-            
-            matches.sort(reverse=True, key=lambda x: x[0])
-            return matches[:top_n]
+            rows = text_search.search_feedback(cursor.connection, question, top_n)
+            return [
+                (score, f_id, initial_desc or notes or "No description", priority_label(priority, default=""), team or "")
+                for score, f_id, initial_desc, notes, priority, team in rows
+            ]
             
         except Exception as e:
             print(f"⚠️ Feedback text search failed: {e}")
@@ -219,15 +161,12 @@ class SemanticAnalyzer:
             return False
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Find tickets without embeddings
-            cursor.execute("""
-                SELECT id, summary, description FROM jira_tickets 
-                WHERE embedding IS NULL AND (summary IS NOT NULL OR description IS NOT NULL)
-            """)
-            tickets = cursor.fetchall()
+            with read_conn(self.db_path) as conn:
+                # Find tickets without embeddings
+                tickets = conn.execute("""
+                    SELECT id, summary, description FROM jira_tickets 
+                    WHERE embedding IS NULL AND (summary IS NOT NULL OR description IS NOT NULL)
+                """).fetchall()
             
             if not tickets:
                 print("✅ All Jira tickets already vectorized")
@@ -235,7 +174,9 @@ class SemanticAnalyzer:
             
             print(f"🔄 Vectorizing {len(tickets)} Jira tickets...")
             
+            # Embed outside the writer so API calls never hold the write lock
             vectorized_count = 0
+            pending = []
             for i, (ticket_id, summary, description) in enumerate(tickets):
                 # Create text for embedding
                 text = f"{summary or ''} {description or ''}".strip()
@@ -245,24 +186,20 @@ class SemanticAnalyzer:
                 # Generate embedding
                 embedding = self.embed_text(text)
                 if embedding is not None:
-                    # Store embedding
-                    cursor.execute(
-                        "UPDATE jira_tickets SET embedding = ? WHERE id = ?",
-                        (pickle.dumps(embedding), ticket_id)
-                    )
+                    pending.append((encode_embedding(embedding), embedding.size, EMBEDDING_MODEL, ticket_id))
                     vectorized_count += 1
                     
                     if vectorized_count % 10 == 0:
                         print(f"📊 Vectorized {vectorized_count}/{len(tickets)} tickets")
-                        conn.commit()
                 
                 # Batch processing to avoid overwhelming API
-                if (i + 1) % batch_size == 0:
-                    conn.commit()
+                if (i + 1) % batch_size == 0 and pending:
+                    self._store_jira_embeddings(pending)
+                    pending = []
                     print(f"💾 Committed batch of {batch_size}")
             
-            conn.commit()
-            conn.close()
+            if pending:
+                self._store_jira_embeddings(pending)
             
             print(f"✅ Vectorization completed: {vectorized_count} tickets processed")
             return True
@@ -271,19 +208,26 @@ class SemanticAnalyzer:
             print(f"❌ Vectorization failed: {e}")
             return False
     
+    def _store_jira_embeddings(self, rows: List[Tuple[bytes, int, str, str]]):
+        """Write a batch of (embedding_blob, dim, model, ticket_id) rows through the shared writer."""
+        with write_conn(self.db_path) as conn:
+            conn.executemany(
+                "UPDATE jira_tickets SET embedding = ?, embedding_dim = ?, embedding_model = ? WHERE id = ?", rows
+            )
+        # Fold the new vectors into the loaded index (no-op until it is first used)
+        self.jira_index.update(row[-1] for row in rows)
+    
     def get_vectorization_status(self) -> Dict[str, Any]:
         """Get status of Jira ticket vectorization"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM jira_tickets")
-            total_tickets = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM jira_tickets WHERE embedding IS NOT NULL")
-            vectorized_tickets = cursor.fetchone()[0]
-            
-            conn.close()
+            with read_conn(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("SELECT COUNT(*) FROM jira_tickets")
+                total_tickets = cursor.fetchone()[0]
+                
+                cursor.execute("SELECT COUNT(*) FROM jira_tickets WHERE embedding IS NOT NULL")
+                vectorized_tickets = cursor.fetchone()[0]
             
             return {
                 "total_tickets": total_tickets,
@@ -309,16 +253,13 @@ class SemanticAnalyzer:
         team_assignments = {}
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get all Jira tickets with team information
-            cursor.execute("""
-                SELECT id, summary, description, team_name, embedding
-                FROM jira_tickets 
-                WHERE team_name IS NOT NULL AND team_name != ''
-            """)
-            jira_rows = cursor.fetchall()
+            with read_conn(self.db_path) as conn:
+                # Get all Jira tickets with team information
+                jira_rows = conn.execute("""
+                    SELECT id, summary, description, team_name
+                    FROM jira_tickets 
+                    WHERE team_name IS NOT NULL AND team_name != ''
+                """).fetchall()
             
             if not jira_rows:
                 print("⚠️ No Jira tickets with team information found")
@@ -344,20 +285,10 @@ class SemanticAnalyzer:
                 if OPENAI_AVAILABLE:
                     issue_embedding = self.embed_text(search_text)
                     if issue_embedding is not None:
-                        best_similarity = 0.0
-                        
-                        for j_id, summary, jira_desc, team_name, emb_blob in jira_rows:
-                            if emb_blob:
-                                try:
-                                    jira_embedding = pickle.loads(emb_blob)
-                                    similarity = self.cosine_similarity(issue_embedding, jira_embedding)
-                                    
-                                    if similarity > best_similarity:
-                                        best_similarity = similarity
-                                        best_team = team_name
-                                        
-                                except Exception:
-                                    continue
+                        matches = self.jira_index.search(issue_embedding, top_n=1, with_team=True)
+                        best_similarity = matches[0][0] if matches else 0.0
+                        if matches:
+                            best_team = matches[0][4]
                         
                         # Only use semantic result if similarity is reasonable
                         if best_similarity < 0.3:
@@ -370,7 +301,6 @@ class SemanticAnalyzer:
                 
                 team_assignments[issue_id] = best_team
             
-            conn.close()
             return team_assignments
             
         except Exception as e:
@@ -389,22 +319,7 @@ class SemanticAnalyzer:
     
     def _assign_team_by_area(self, area_impacted: str) -> str:
         """Assign team based on area impacted."""
-        if not area_impacted:
-            return "Triage"
-        
-        area_lower = area_impacted.lower()
-        if "salesforce" in area_lower:
-            return "Salesforce Team"
-        elif "billing" in area_lower or "payment" in area_lower:
-            return "Billing Team"
-        elif "underwriting" in area_lower:
-            return "Underwriting Team"
-        elif "claims" in area_lower:
-            return "Claims Team"
-        elif "portal" in area_lower or "dashboard" in area_lower:
-            return "Portal Team"
-        else:
-            return "Triage"
+        return _area_matcher.first(area_impacted, default="Triage")
     
     def _assign_team_by_text_similarity(self, search_text: str, jira_rows: List, area_impacted: str) -> str:
         """Assign team using text-based similarity matching."""
@@ -413,7 +328,7 @@ class SemanticAnalyzer:
         
         search_words = set(search_text.lower().split())
         
-        for j_id, summary, jira_desc, team_name, emb_blob in jira_rows:
+        for j_id, summary, jira_desc, team_name in jira_rows:
             jira_text = f"{summary or ''} {jira_desc or ''}".lower()
             jira_words = set(jira_text.split())
             
@@ -1,16 +1,17 @@
 import sqlite3
 import numpy as np
-import pickle
 import os
 from openai import OpenAI
 
+from embedding_store import EMBEDDING_MODEL, decode_embedding
+
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 DB_PATH = "../voice_of_customer.db"  # adjust path if needed
 
 def embed_text(text: str) -> np.ndarray:
     """Generate an embedding for the given text."""
     response = client.embeddings.create(
-        model="text-embedding-3-small",
+        model=EMBEDDING_MODEL,
         input=text
     )
     return np.array(response.data[0].embedding, dtype=np.float32)
@@ -26,16 +27,18 @@ def find_related_feedback(question: str, top_n: int = 5):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT id, initial_description, priority, team_routed, embedding
+        SELECT id, initial_description, priority, team_routed, embedding, embedding_dim
         FROM feedback
-        WHERE embedding IS NOT NULL
-    """)
+        WHERE embedding IS NOT NULL AND embedding_model = ?
+    """, (EMBEDDING_MODEL,))
     feedback_rows = cursor.fetchall()
     conn.close()
 
     similarities = []
-    for f_id, description, priority, team, emb_blob in feedback_rows:
-        embedding = pickle.loads(emb_blob)
+    for f_id, description, priority, team, emb_blob, dim in feedback_rows:
+        embedding = decode_embedding(emb_blob, dim)
+        if embedding is None:
+            continue
         similarity = cosine_similarity(query_embedding, embedding)
         similarities.append((similarity, f_id, description, priority, team))
 
@@ -1,9 +1,10 @@
 import sqlite3
 import numpy as np
-import pickle
 import os
 from dotenv import load_dotenv
 
+from embedding_store import EMBEDDING_MODEL, decode_embedding
+
 # Load environment variables
 load_dotenv()
 
@@ -26,7 +27,7 @@ def embed_text(text: str) -> np.ndarray:
         raise ValueError("OpenAI client not available")
     
     response = client.embeddings.create(
-        model="text-embedding-3-small",
+        model=EMBEDDING_MODEL,
         input=text
     )
     return np.array(response.data[0].embedding, dtype=np.float32)
@@ -49,17 +50,19 @@ def find_related_feedback(question: str, top_n: int = 5):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT id, initial_description, priority, team_routed, embedding
+        SELECT id, initial_description, priority, team_routed, embedding, embedding_dim
         FROM feedback
-        WHERE embedding IS NOT NULL
-    """)
+        WHERE embedding IS NOT NULL AND embedding_model = ?
+    """, (EMBEDDING_MODEL,))
     feedback_rows = cursor.fetchall()
     conn.close()
 
     similarities = []
-    for f_id, description, priority, team, emb_blob in feedback_rows:
+    for f_id, description, priority, team, emb_blob, dim in feedback_rows:
         try:
-            embedding = pickle.loads(emb_blob)
+            embedding = decode_embedding(emb_blob, dim)
+            if embedding is None:
+                continue
             similarity = cosine_similarity(query_embedding, embedding)
             similarities.append((similarity, f_id, description, priority, team))
         except Exception as e:
@@ -83,17 +86,19 @@ def find_related_tickets(question: str, top_n: int = 3):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT id, summary, assignee, team_name, embedding
+        SELECT id, summary, assignee, team_name, embedding, embedding_dim
         FROM jira_tickets
-        WHERE embedding IS NOT NULL
-    """)
+        WHERE embedding IS NOT NULL AND embedding_model = ?
+    """, (EMBEDDING_MODEL,))
     jira_rows = cursor.fetchall()
     conn.close()
 
     similarities = []
-    for j_id, summary, assignee, team, emb_blob in jira_rows:
+    for j_id, summary, assignee, team, emb_blob, dim in jira_rows:
         try:
-            embedding = pickle.loads(emb_blob)
+            embedding = decode_embedding(emb_blob, dim)
+            if embedding is None:
+                continue
             similarity = cosine_similarity(query_embedding, embedding)
             similarities.append((similarity, j_id, summary, assignee, team))
         except Exception as e:
@@ -6,6 +6,10 @@ import sqlite3
 import csv
 import os
 from config import DB_PATH
+from bulk_write import upsert_rows
+from migrations import (
+    JIRA_COLUMNS, JIRA_CSV_COLUMNS, JIRA_EMBEDDED_COLUMNS, JIRA_EMBEDDING_COLUMNS, ensure_table,
+)
 
 def ensure_jira_data_loaded():
     """Ensure Jira tickets are loaded into the database."""
@@ -25,6 +29,8 @@ def ensure_jira_data_loaded():
                 embedding BLOB
             )
         """)
+        # Older tables lack the embedding metadata the upsert clears
+        ensure_table(conn, "jira_tickets", JIRA_COLUMNS)
         
         # Check if we already have Jira data
         cursor.execute("SELECT COUNT(*) FROM jira_tickets")
@@ -45,6 +51,7 @@ def ensure_jira_data_loaded():
         
         print(f"📂 Loading Jira tickets from {csv_path}")
         loaded_count = 0
+        tickets = []
         
         with open(csv_path, 'r', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
@@ -72,14 +79,14 @@ def ensure_jira_data_loaded():
                            row.get('Component/s') or '').strip()
                 
                 if issue_id:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO jira_tickets 
-                        (id, summary, description, resolution, assignee, team_name)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (issue_id, summary, description, resolution, assignee, team_name))
+                    tickets.append((issue_id, summary, description, resolution, assignee, team_name))
                     
                     loaded_count += 1
         
+        upsert_rows(
+            conn, "jira_tickets", JIRA_CSV_COLUMNS, tickets,
+            reset=JIRA_EMBEDDING_COLUMNS, reset_when=JIRA_EMBEDDED_COLUMNS
+        )
         conn.commit()
         
         # Get final counts
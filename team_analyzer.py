@@ -9,6 +9,7 @@ from config import DB_PATH, OPENAI_API_KEY
 
 # Import our robust semantic analyzer
 from semantic_analyzer import semantic_analyzer
+from keyword_matcher import KeywordMatcher
 
 # OpenAI setup for enhanced analysis
 try:
@@ -139,28 +140,18 @@ def analyze_with_openai(description: str, issue_type: str, status: str, area_imp
         print(f"⚠️ OpenAI analysis failed: {e}")
         return "Triage"
 
+# Description keywords per team, checked in order (first team with a match wins)
+RULE_KEYWORDS = [
+    ("Engineering", ['error', 'bug', 'crash', 'broken', 'fail', 'exception', 'timeout']),
+    ("Support", ['how to', 'training', 'help', 'tutorial', 'guide']),
+    ("Sales", ['price', 'quote', 'sales', 'cost', 'purchase']),
+    ("Product", ['feature', 'request', 'enhance', 'improve', 'suggestion']),
+]
+_rules_matcher = KeywordMatcher(RULE_KEYWORDS)
+
 def analyze_with_rules(description: str, issue_type: str, status: str, area_impacted: str) -> str:
     """Rule-based team assignment as final fallback"""
-    desc_lower = description.lower()
-    
-    # Engineering keywords
-    if any(word in desc_lower for word in ['error', 'bug', 'crash', 'broken', 'fail', 'exception', 'timeout']):
-        return "Engineering"
-    
-    # Support keywords
-    if any(word in desc_lower for word in ['how to', 'training', 'help', 'tutorial', 'guide']):
-        return "Support"
-    
-    # Sales keywords
-    if any(word in desc_lower for word in ['price', 'quote', 'sales', 'cost', 'purchase']):
-        return "Sales"
-    
-    # Product keywords
-    if any(word in desc_lower for word in ['feature', 'request', 'enhance', 'improve', 'suggestion']):
-        return "Product"
-    
-    # Default
-    return "Triage"
+    return _rules_matcher.first(description, default="Triage")
 
 def analyze_team_batch(issues: list) -> Dict[str, str]:
     """
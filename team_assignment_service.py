@@ -1,92 +1,113 @@
 """
 Team Assignment Service
 
-Reads team_directory.csv and provides intelligent team assignment
-based on area impacted and semantic matching.
+Assigns teams from the in-memory team directory (team_directory) based on
+area impacted and semantic matching.
+
+Fuzzy matching scores areas against a character n-gram TF-IDF matrix of the
+team names (ngram_tfidf), so assign_teams() scores a whole batch with one
+matrix product over its distinct areas. The matchers are built once per
+directory version and rebuilt when the directory reloads.
 """
 
-import csv
-import os
-from typing import Dict, List, Optional
-from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from ngram_tfidf import CharNgramTfidf
+from team_directory import TeamDirectory, TeamDirectorySnapshot, normalize_team_name, team_directory
+
+# Similarity score a team needs before it is assigned
+MIN_SIMILARITY = 0.4
+# Added to the n-gram similarity when the team name appears in the record's text,
+# and when the area shares a whole word with the team name
+NAME_IN_TEXT_BOOST = 0.3
+SHARED_WORD_BOOST = 0.2
+
+UNKNOWN_AREAS = ('unknown', 'n/a', '')
+
+# Keyword in a team's name -> area phrases that route to that team
+TEAM_KEYWORDS = {
+    'salesforce': ['crm sf', 'salesforce'],
+    'portal': ['client portal', 'agent portal', 'portal'],
+    'billing': ['billing', 'payment', 'digital payments'],
+    'quotes': ['quotes', 'quote'],
+    'application': ['application'],
+    'policies': ['policies', 'policy'],
+    'documents': ['documents', 'document'],
+    'workflows': ['workflows', 'workflow'],
+    'onboarding': ['onboarding', 'user onboarding'],
+    'data': ['data'],
+    'iam': ['iam', 'identity', 'access management'],
+    'affinities': ['affinities', 'us affinities'],
+    'integrations': ['integration', 'market integrations', 'billing integrations'],
+    'orchestration': ['orchestration', 'connect 3rd party'],
+    'checkout': ['checkout']
+}
+
+# Keys the service's team dicts had before the shared directory, kept alongside the
+# directory's field names so existing callers of teams / get_team_info keep working
+LEGACY_TEAM_FIELDS = {
+    'name': 'team',
+    'tech_rep': 'tech_rep_dev',
+    'manager': 'team_manager',
+}
+
+def service_team_entry(team: Mapping[str, str]) -> Dict[str, str]:
+    """A directory entry with the legacy keys (name, tech_rep, manager) added."""
+    entry = dict(team)
+    for legacy, field in LEGACY_TEAM_FIELDS.items():
+        entry[legacy] = team.get(field, '')
+    return entry
+
+def team_terms(team_name: str) -> List[str]:
+    """Area phrases that keyword-match team_name: its TEAM_KEYWORDS phrases and significant name words."""
+    team_lower = team_name.lower()
+    terms = [variation for keyword, variations in TEAM_KEYWORDS.items() if keyword in team_lower
+             for variation in variations]
+    # Significant words from the team name
+    terms.extend(word for word in team_lower.split() if len(word) > 3)
+    return terms
+
+class _TeamIndexes:
+    """Matchers compiled for one directory snapshot (built once, reused by every assignment)."""
+    
+    def __init__(self, snapshot: TeamDirectorySnapshot):
+        self.version = snapshot.version
+        self.names = snapshot.names
+        # Every team's keyword phrases in one matcher, in directory order (first match wins)
+        self.keyword_matcher = KeywordMatcher((name, team_terms(name)) for name in self.names)
+        self.name_index = CharNgramTfidf(self.names)
+        self.names_lower = [name.lower() for name in self.names]
+        self.entries = [service_team_entry(team) for team in snapshot.teams]
+        self.entries_by_name: Dict[str, Dict[str, str]] = {}
+        for entry in self.entries:
+            self.entries_by_name.setdefault(normalize_team_name(entry['team']), entry)
 
 class TeamAssignmentService:
-    def __init__(self, csv_path: str = None):
-        if csv_path is None:
-            # Default path to team_directory.csv
-            csv_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'team_directory.csv')
-        
-        self.csv_path = csv_path
-        self.teams = self._load_teams()
-        
-    def _load_teams(self) -> List[Dict[str, str]]:
-        """Load teams from CSV file"""
-        teams = []
-        try:
-            with open(self.csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    if row.get('Team'):  # Only include rows with team names
-                        teams.append({
-                            'name': row['Team'].strip(),
-                            'tech_rep': row.get('Tech Rep / Dev', '').strip(),
-                            'manager': row.get('Tem Manager', '').strip(),
-                            'product_manager': row.get('Product Manager', '').strip()
-                        })
-        except FileNotFoundError:
-            print(f"Warning: Team directory CSV not found at {self.csv_path}")
-        except Exception as e:
-            print(f"Error loading team directory: {e}")
-        
-        return teams
+    def __init__(self, csv_path: str = None, directory: TeamDirectory = None):
+        if directory is None:
+            directory = team_directory if csv_path is None else TeamDirectory(csv_path, use_database=False)
+        self.directory = directory
+        self.csv_path = directory.csv_path
+        self._team_indexes = _TeamIndexes(directory.snapshot())
     
-    def _similarity_score(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two strings"""
-        if not text1 or not text2:
-            return 0.0
-        return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+    def _indexes(self) -> _TeamIndexes:
+        """Matchers for the current directory, rebuilt (and swapped in whole) when it reloads."""
+        indexes = self._team_indexes
+        snapshot = self.directory.snapshot()
+        if indexes.version != snapshot.version:
+            indexes = self._team_indexes = _TeamIndexes(snapshot)
+        return indexes
     
-    def _contains_keywords(self, area_impacted: str, team_name: str) -> bool:
-        """Check if area contains keywords related to team"""
-        if not area_impacted or not team_name:
-            return False
-            
-        area_lower = area_impacted.lower()
-        team_lower = team_name.lower()
-        
-        # Direct keyword matching
-        keyword_matches = {
-            'salesforce': ['crm sf', 'salesforce'],
-            'portal': ['client portal', 'agent portal', 'portal'],
-            'billing': ['billing', 'payment', 'digital payments'],
-            'quotes': ['quotes', 'quote'],
-            'application': ['application'],
-            'policies': ['policies', 'policy'],
-            'documents': ['documents', 'document'],
-            'workflows': ['workflows', 'workflow'],
-            'onboarding': ['onboarding', 'user onboarding'],
-            'data': ['data'],
-            'iam': ['iam', 'identity', 'access management'],
-            'affinities': ['affinities', 'us affinities'],
-            'integrations': ['integration', 'market integrations', 'billing integrations'],
-            'orchestration': ['orchestration', 'connect 3rd party'],
-            'checkout': ['checkout']
-        }
-        
-        # Check for keyword matches
-        for keyword, variations in keyword_matches.items():
-            if keyword in team_lower:
-                for variation in variations:
-                    if variation in area_lower:
-                        return True
-        
-        # Check if any significant words from team name appear in area
-        team_words = [word for word in team_lower.split() if len(word) > 3]
-        for word in team_words:
-            if word in area_lower:
-                return True
-                
-        return False
+    @property
+    def teams(self) -> List[Dict[str, str]]:
+        """
+        Directory entries in directory order: team, tech_rep_dev, team_manager,
+        product_manager, product_director, plus the legacy name, tech_rep and manager.
+        """
+        return list(self._indexes().entries)
     
     def assign_team(self, area_impacted: str, description: str = "", type_of_issue: str = "") -> str:
         """
@@ -100,55 +121,86 @@ class TeamAssignmentService:
         Returns:
             Team name or "Unassigned" if no match found
         """
-        if not area_impacted or area_impacted.lower() in ['unknown', 'n/a', '']:
-            return "Unassigned"
+        return self.assign_team_details(area_impacted, description, type_of_issue)["team"]
+    
+    def assign_team_details(self, area_impacted: str, description: str = "", type_of_issue: str = "") -> Dict[str, Any]:
+        """
+        Same matching as assign_team, with how the team was chosen.
         
-        best_match = None
-        best_score = 0.0
+        Returns:
+            {"team": team name or "Unassigned",
+             "method": "keyword", "similarity" or "none",
+             "confidence": 1.0 for keyword matches, else the best similarity score (capped at 1.0)}
+        """
+        record = {"area_impacted": area_impacted, "description": description, "type_of_issue": type_of_issue}
+        return self.assign_teams([record])[0]
+    
+    def assign_teams(self, records: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Batch assign_team_details for records with area_impacted (and optionally
+        description, type_of_issue) keys; results are in record order.
         
-        # Combine all text for context
-        full_text = f"{area_impacted} {description} {type_of_issue}".lower()
+        Keyword matches are checked once per distinct area. The rest are scored
+        with one TF-IDF product over their distinct areas, plus the name-in-text
+        and shared-word boosts, against every team at once.
+        """
+        records = list(records)
+        indexes = self._indexes()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        keyword_teams: Dict[str, Optional[str]] = {}
+        pending = []
         
-        for team in self.teams:
-            team_name = team['name']
-            
-            # Check for keyword matches first (highest priority)
-            if self._contains_keywords(area_impacted, team_name):
-                return team_name
-            
-            # Calculate similarity score
-            similarity = self._similarity_score(area_impacted, team_name)
+        for i, record in enumerate(records):
+            area = record.get('area_impacted') or ''
+            if area.lower() in UNKNOWN_AREAS:
+                results[i] = {"team": "Unassigned", "method": "none", "confidence": 0.0}
+                continue
+            # Check for keyword matches first (highest priority), one pass for all teams
+            if area not in keyword_teams:
+                keyword_teams[area] = indexes.keyword_matcher.first(area)
+            if keyword_teams[area]:
+                results[i] = {"team": keyword_teams[area], "method": "keyword", "confidence": 1.0}
+            else:
+                pending.append(i)
+        
+        if pending and not indexes.names:
+            for i in pending:
+                results[i] = {"team": "Unassigned", "method": "none", "confidence": 0.0}
+        elif pending:
+            areas = list(dict.fromkeys(records[i]['area_impacted'] for i in pending))
+            row_of = {area: row for row, area in enumerate(areas)}
+            # (distinct areas x teams): n-gram similarity plus the shared word boost
+            area_scores = indexes.name_index.similarity(areas) + SHARED_WORD_BOOST * indexes.name_index.shares_word(areas)
             
-            # Boost score if team name appears in full context
-            if team_name.lower() in full_text:
-                similarity += 0.3
-                
-            # Check for partial word matches
-            team_words = set(team_name.lower().split())
-            area_words = set(area_impacted.lower().split())
-            if team_words.intersection(area_words):
-                similarity += 0.2
+            # Boost teams whose name appears in the record's full text (area, description, type)
+            name_in_text = np.zeros((len(pending), len(indexes.names)))
+            for row, i in enumerate(pending):
+                record = records[i]
+                full_text = f"{record['area_impacted']} {record.get('description') or ''} {record.get('type_of_issue') or ''}".lower()
+                name_in_text[row] = [name in full_text for name in indexes.names_lower]
+            scores = area_scores[[row_of[records[i]['area_impacted']] for i in pending]] + NAME_IN_TEXT_BOOST * name_in_text
             
-            if similarity > best_score:
-                best_score = similarity
-                best_match = team_name
-        
-        # Only return match if confidence is high enough
-        if best_score >= 0.4:
-            return best_match
+            # argmax keeps the first team in directory order on ties
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(pending)), best]
+            for row, i in enumerate(pending):
+                score = float(best_scores[row])
+                confidence = round(min(score, 1.0), 4)
+                # Only return match if confidence is high enough
+                if score >= MIN_SIMILARITY:
+                    results[i] = {"team": indexes.names[best[row]], "method": "similarity", "confidence": confidence}
+                else:
+                    results[i] = {"team": "Unassigned", "method": "none", "confidence": confidence}
         
-        return "Unassigned"
+        return results
     
     def get_all_teams(self) -> List[str]:
         """Get list of all team names"""
-        return [team['name'] for team in self.teams]
+        return self.directory.snapshot().names
     
     def get_team_info(self, team_name: str) -> Optional[Dict[str, str]]:
-        """Get detailed information about a specific team"""
-        for team in self.teams:
-            if team['name'].lower() == team_name.lower():
-                return team
-        return None
+        """Get detailed information about a specific team (case/whitespace-insensitive name), keyed as teams"""
+        return self._indexes().entries_by_name.get(normalize_team_name(team_name))
 
 # Global instance
-team_service = TeamAssignmentService()
\ No newline at end of file
+team_service = TeamAssignmentService(directory=team_directory)
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+In-memory team directory shared by team assignment and the /teams endpoint.
+
+The directory is loaded from team_directory.csv (TEAM_DIRECTORY_PATH, default
+../data/team_directory.csv next to the repo) into a snapshot: the teams in
+directory order plus a dict keyed by normalized name, so lookups are one dict
+get. When the CSV is not there, the team_directory table in the database is
+read instead.
+
+snapshot() checks the source at most every CHECK_INTERVAL seconds (the CSV's
+mtime and size; the table's rows) and, when it changed, builds a new snapshot
+and swaps it in with one reference assignment. Readers never wait: they keep
+whichever snapshot they picked up, a check already in progress in another
+thread is skipped rather than waited for, and a failed reload keeps serving
+the previous snapshot. Each snapshot has a version, so derived indexes (the
+team assignment matchers) know when to rebuild.
+"""
+import csv
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'team_directory.csv')
+CHECK_INTERVAL = 30.0
+
+# API field -> CSV header (the CSV's "Tem Manager" typo is its real header)
+CSV_FIELDS = {
+    "team": "Team",
+    "tech_rep_dev": "Tech Rep / Dev",
+    "team_manager": "Tem Manager",
+    "product_manager": "Product Manager",
+    "product_director": "Product Director",
+}
+
+def normalize_team_name(name: Optional[str]) -> str:
+    """Case- and whitespace-insensitive key for a team name."""
+    return " ".join((name or "").lower().split())
+
+class TeamDirectorySnapshot:
+    """One immutable load of the directory."""
+
+    def __init__(self, teams: List[Dict[str, str]], version: int = 0, source: str = ""):
+        self.version = version
+        self.source = source
+        self.teams: Tuple[Dict[str, str], ...] = tuple(teams)
+        self.by_name: Dict[str, Dict[str, str]] = {}
+        for team in self.teams:
+            self.by_name.setdefault(normalize_team_name(team["team"]), team)
+
+    @property
+    def names(self) -> List[str]:
+        return [team["team"] for team in self.teams]
+
+    def get(self, name: Optional[str]) -> Optional[Dict[str, str]]:
+        return self.by_name.get(normalize_team_name(name))
+
+class TeamDirectory:
+    def __init__(self, csv_path: str = None, db_path: str = None, check_interval: float = CHECK_INTERVAL,
+                 use_database: bool = True):
+        self.csv_path = csv_path or os.getenv("TEAM_DIRECTORY_PATH") or DEFAULT_CSV_PATH
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self.use_database = use_database
+        self._snapshot = TeamDirectorySnapshot([])
+        self._signature = None
+        self._checked_at = float("-inf")
+        self._reload_lock = threading.Lock()
+        self.reload()
+
+    def snapshot(self) -> TeamDirectorySnapshot:
+        """The current snapshot, reloading first if the source changed (checked at most every check_interval)."""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload(block=False)
+        return self._snapshot
+
+    def reload(self, block: bool = True) -> bool:
+        """Reload if the source changed. Returns True when a new snapshot was swapped in."""
+        if not self._reload_lock.acquire(blocking=block):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                signature, teams, source = self._read_source()
+            except Exception as e:
+                print(f"⚠️ Error loading team directory, keeping {len(self._snapshot.teams)} teams: {e}")
+                return False
+            if signature == self._signature:
+                return False
+            self._snapshot = TeamDirectorySnapshot(teams, self._snapshot.version + 1, source)
+            self._signature = signature
+            if teams:
+                print(f"👥 Loaded {len(teams)} teams from {source} (directory version {self._snapshot.version})")
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def _read_source(self):
+        """(signature, teams, source). The CSV is only parsed when its mtime/size changed."""
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            stat = None
+        if stat is not None:
+            signature = ("csv", stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return signature, None, self.csv_path
+            return signature, self._load_csv(), self.csv_path
+        if self.use_database:
+            teams = self._load_table()
+            if teams is not None:
+                return ("table", tuple(tuple(team.values()) for team in teams)), teams, "team_directory table"
+        if self._signature is None:
+            print(f"Warning: Team directory CSV not found at {self.csv_path}")
+        return ("missing",), [], "nowhere"
+
+    def _load_csv(self) -> List[Dict[str, str]]:
+        teams = []
+        with open(self.csv_path, 'r', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                if (row.get('Team') or '').strip():  # Only include rows with team names
+                    teams.append({field: (row.get(header) or '').strip() for field, header in CSV_FIELDS.items()})
+        return teams
+
+    def _load_table(self) -> Optional[List[Dict[str, str]]]:
+        from db_connection import read_conn
+        from migrations import table_exists
+
+        with read_conn(self.db_path) as conn:
+            if not table_exists(conn, "team_directory"):
+                return None
+            rows = conn.execute(f"SELECT {', '.join(CSV_FIELDS)} FROM team_directory ORDER BY rowid").fetchall()
+        return [
+            {field: (value or '').strip() for field, value in zip(CSV_FIELDS, row)}
+            for row in rows if (row[0] or '').strip()
+        ]
+
+# Global instance
+team_directory = TeamDirectory()
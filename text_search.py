@@ -0,0 +1,81 @@
+"""
+BM25-ranked full-text search over feedback and Jira text.
+
+feedback_fts and jira_fts are FTS5 indexes over the feedback and jira_tickets
+tables (created by migration 3 and kept in sync by triggers), so lookups touch
+only the matching postings instead of reading every row into Python.
+Scores are mapped from BM25 into 0-1 so they sit alongside cosine similarity.
+"""
+import re
+import sqlite3
+from typing import List, Optional, Tuple
+
+# Question words shorter than this carry no signal for chat/related lookups
+MIN_TERM_LENGTH = 3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def match_expression(
+    text: str, min_length: int = MIN_TERM_LENGTH, prefix: bool = False, match_all: bool = False
+) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression over its distinct terms.
+
+    By default the terms are ORed, for relevance lookups (chat, related
+    feedback) where any shared word is a candidate. With match_all=True every
+    term must match, for filters where adding words should narrow the result.
+    Every term is quoted, so user input can never inject FTS5 query syntax.
+    With prefix=True each term also matches longer words ("dash" -> "dashboard").
+    Returns None when nothing searchable is left.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if len(token) >= min_length and token not in terms:
+            terms.append(token)
+    if not terms:
+        return None
+    suffix = "*" if prefix else ""
+    # FTS5 treats space-separated phrases as an implicit AND
+    return (" " if match_all else " OR ").join(f'"{term}"{suffix}' for term in terms)
+
+def bm25_score(rank: float) -> float:
+    """Map an FTS5 rank (negative BM25, lower is better) into 0-1, higher is better."""
+    relevance = max(-rank, 0.0)
+    return relevance / (1.0 + relevance)
+
+def search_feedback(conn: sqlite3.Connection, text: str, top_n: int = 5) -> List[Tuple]:
+    """
+    Top feedback matches for free text.
+    Returns: List of (score, id, initial_description, notes, priority, team_routed)
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    rows = conn.execute("""
+        SELECT feedback_fts.rank, f.id, f.initial_description, f.notes, f.priority, f.team_routed
+        FROM feedback_fts
+        JOIN feedback AS f ON f.rowid = feedback_fts.rowid
+        WHERE feedback_fts MATCH ?
+        ORDER BY feedback_fts.rank
+        LIMIT ?
+    """, (expression, top_n)).fetchall()
+    return [(bm25_score(row[0]),) + tuple(row[1:]) for row in rows]
+
+def search_jira(conn: sqlite3.Connection, text: str, top_n: int = 3, with_team: bool = False) -> List[Tuple]:
+    """
+    Top Jira ticket matches for free text, optionally only tickets with a team.
+    Returns: List of (score, id, summary, description, assignee, team_name)
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    team_filter = "AND j.team_name IS NOT NULL AND j.team_name != ''" if with_team else ""
+    rows = conn.execute(f"""
+        SELECT jira_fts.rank, j.id, j.summary, j.description, j.assignee, j.team_name
+        FROM jira_fts
+        JOIN jira_tickets AS j ON j.rowid = jira_fts.rowid
+        WHERE jira_fts MATCH ? {team_filter}
+        ORDER BY jira_fts.rank
+        LIMIT ?
+    """, (expression, top_n)).fetchall()
+    return [(bm25_score(row[0]),) + tuple(row[1:]) for row in rows]
@@ -5,6 +5,7 @@ Runs on Sundays at 11:59 PM EST to update the cache with latest data from Airtab
 """
 
 import os
+import sys
 import sqlite3
 import requests
 import logging
@@ -12,6 +13,10 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 from dotenv import load_dotenv
+from feedback_types import parse_duration
+from result_cache import bump_data_version
+from bulk_write import insert_rows
+from db_connection import read_conn, write_conn
 
 # Load environment variables
 load_dotenv()
@@ -107,13 +112,7 @@ def process_records(records):
             
             # Helper function for safe number conversion
             def num_or_zero(v):
-                if v is None:
-                    return 0
-                try:
-                    n = float(v)
-                    return n if not (n != n) else 0  # Check for NaN
-                except (ValueError, TypeError):
-                    return 0
+                return parse_duration(v) or 0
             
             # Collect metrics using the correct field names
             record_data = {
@@ -197,53 +196,78 @@ def calculate_weekly_averages(weekly_data):
     logger.info(f"✅ Calculated weighted averages for {len(weighted_averages)} environments")
     return rows, weighted_averages
 
+def calculate_averages_from_feedback(min_week='2025-06-30'):
+    """
+    Compute the same weekly/weighted averages in SQL from the typed feedback table.
+
+    Uses the precomputed week_start and REAL duration columns, so no Airtable
+    fetch or per-record parsing is needed. Averages skip zero/empty durations
+    like calculate_weekly_averages does.
+    """
+    logger.info("Aggregating response times from feedback table...")
+    
+    metrics = {
+        'time_to_in_progress_avg': 'time_to_in_progress',
+        'time_in_progress_to_done_avg': 'time_from_in_progress_to_done',
+        'time_reported_to_referred_avg': 'time_from_reported_to_imt_review',
+        'time_referred_to_done_avg': 'time_from_imt_review_to_done',
+        'time_report_to_resolution_avg': 'time_from_report_to_resolution',
+    }
+    averages = ", ".join(
+        f"COALESCE(AVG(CASE WHEN {column} > 0 THEN {column} END), 0) AS {name}"
+        for name, column in metrics.items()
+    )
+    environment = "COALESCE(NULLIF(environment, ''), 'Unknown')"
+    
+    with read_conn(DB_PATH) as conn:
+        conn.row_factory = sqlite3.Row  # reset when the pool takes the connection back
+        weekly_rows = [dict(row) for row in conn.execute(f"""
+            SELECT week_start AS week_label, {environment} AS environment, COUNT(*) AS count, {averages}
+            FROM feedback
+            WHERE week_start >= ?
+            GROUP BY week_start, {environment}
+            ORDER BY week_start
+        """, (min_week,))]
+        weighted_averages = [dict(row) for row in conn.execute(f"""
+            SELECT {environment} AS environment, COUNT(*) AS count, {averages}
+            FROM feedback
+            WHERE week_start >= ?
+            GROUP BY {environment}
+        """, (min_week,))]
+    
+    logger.info(f"✅ Aggregated {len(weekly_rows)} week-environment combinations from feedback")
+    return weekly_rows, weighted_averages
+
+AVERAGE_COLUMNS = (
+    "time_to_in_progress_avg", "time_in_progress_to_done_avg", "time_reported_to_referred_avg",
+    "time_referred_to_done_avg", "time_report_to_resolution_avg",
+)
+WEEKLY_COLUMNS = ("week_label", "environment", "count") + AVERAGE_COLUMNS
+WEIGHTED_COLUMNS = ("environment", "count") + AVERAGE_COLUMNS
+
 def update_cache(weekly_rows, weighted_averages):
     """Update the database cache with new data."""
     logger.info("Updating database cache...")
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     try:
-        # Clear existing cache
-        cursor.execute("DELETE FROM response_times_cache")
-        cursor.execute("DELETE FROM response_times_weighted")
-        
-        # Insert weekly data with environment
-        for row in weekly_rows:
-            cursor.execute('''
-                INSERT INTO response_times_cache 
-                (week_label, environment, count, time_to_in_progress_avg, time_in_progress_to_done_avg,
-                 time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                row['week_label'], row['environment'], row['count'], row['time_to_in_progress_avg'],
-                row['time_in_progress_to_done_avg'], row['time_reported_to_referred_avg'],
-                row['time_referred_to_done_avg'], row['time_report_to_resolution_avg']
-            ))
-        
-        # Insert weighted averages for each environment
-        for weighted in weighted_averages:
-            cursor.execute('''
-                INSERT INTO response_times_weighted 
-                (environment, count, time_to_in_progress_avg, time_in_progress_to_done_avg,
-                 time_reported_to_referred_avg, time_referred_to_done_avg, time_report_to_resolution_avg)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                weighted['environment'], weighted['count'], weighted['time_to_in_progress_avg'],
-                weighted['time_in_progress_to_done_avg'], weighted['time_reported_to_referred_avg'],
-                weighted['time_referred_to_done_avg'], weighted['time_report_to_resolution_avg']
-            ))
-        
-        conn.commit()
+        # One transaction on the serialized writer: readers see the old cache or the new one
+        with write_conn(DB_PATH) as conn:
+            # Clear existing cache
+            conn.execute("DELETE FROM response_times_cache")
+            conn.execute("DELETE FROM response_times_weighted")
+            
+            # Insert weekly data with environment
+            insert_rows(conn, "response_times_cache", WEEKLY_COLUMNS, weekly_rows)
+            
+            # Insert weighted averages for each environment
+            insert_rows(conn, "response_times_weighted", WEIGHTED_COLUMNS, weighted_averages)
+            
+            bump_data_version(conn)  # invalidate cached /reports results
         logger.info(f"✅ Updated cache with {len(weekly_rows)} weekly records and {len(weighted_averages)} weighted averages")
         
     except Exception as e:
         logger.error(f"❌ Database update failed: {e}")
-        conn.rollback()
         raise
-    finally:
-        conn.close()
 
 def main():
     """Main batch update function."""
@@ -251,14 +275,18 @@ def main():
     logger.info(f"📅 Update time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S EST')}")
     
     try:
-        # Fetch data from Airtable
-        records = fetch_airtable_data()
-        
-        # Process into weekly buckets
-        weekly_data = process_records(records)
-        
-        # Calculate averages
-        weekly_rows, weighted_averages = calculate_weekly_averages(weekly_data)
+        if '--from-db' in sys.argv:
+            # Aggregate in SQL over the already-loaded feedback table
+            weekly_rows, weighted_averages = calculate_averages_from_feedback()
+        else:
+            # Fetch data from Airtable
+            records = fetch_airtable_data()
+            
+            # Process into weekly buckets
+            weekly_data = process_records(records)
+            
+            # Calculate averages
+            weekly_rows, weighted_averages = calculate_weekly_averages(weekly_data)
         
         # Update database cache
         update_cache(weekly_rows, weighted_averages)
@@ -1,6 +1,5 @@
 import sqlite3
 import numpy as np
-import pickle
 import os
 from dotenv import load_dotenv
 
@@ -19,17 +18,22 @@ except ImportError:
     print("Error: OpenAI package not installed. Run: pip install openai")
     exit(1)
 
+from embedding_store import EMBEDDING_MODEL, encode_embedding
+from migrations import run_migrations
+
 DB_PATH = "/Users/tylerwood/voice_of_customer/voice_of_customer.db"  # adjust if needed
 
 def embed_text(text: str) -> np.ndarray:
     """Generate an embedding for a given text using OpenAI embeddings."""
     response = client.embeddings.create(
-        model="text-embedding-3-small",
+        model=EMBEDDING_MODEL,
         input=text
     )
     return np.array(response.data[0].embedding, dtype=np.float32)
 
 def vectorize_feedback(batch_size: int = 50):
+    # Embeddings are stored as raw float32 with their dimension and model (migration 11)
+    run_migrations(DB_PATH)
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
@@ -50,8 +54,8 @@ def vectorize_feedback(batch_size: int = 50):
         try:
             embedding = embed_text(description)
             cursor.execute(
-                "UPDATE feedback SET embedding = ? WHERE id = ?",
-                (pickle.dumps(embedding), record_id)
+                "UPDATE feedback SET embedding = ?, embedding_dim = ?, embedding_model = ? WHERE id = ?",
+                (encode_embedding(embedding), embedding.size, EMBEDDING_MODEL, record_id)
             )
             print(f"[{i}/{len(records)}] Vectorized feedback: {record_id}")
 
@@ -1,6 +1,5 @@
 import sqlite3
 import numpy as np
-import pickle
 import os
 from dotenv import load_dotenv
 
@@ -20,16 +19,20 @@ except ImportError:
     exit(1)
 
 from config import DB_PATH
+from embedding_store import EMBEDDING_MODEL, encode_embedding
+from migrations import run_migrations
 BATCH_SIZE = 100  # Process 100 tickets at a time
 
 def embed_text(text: str) -> np.ndarray:
     response = client.embeddings.create(
-        model="text-embedding-3-small",
+        model=EMBEDDING_MODEL,
         input=text
     )
     return np.array(response.data[0].embedding, dtype=np.float32)
 
 def vectorize_jira_tickets():
+    # Embeddings are stored as raw float32 with their dimension and model (migration 11)
+    run_migrations(DB_PATH)
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
@@ -52,8 +55,8 @@ def vectorize_jira_tickets():
         try:
             embedding = embed_text(text)
             cursor.execute(
-                "UPDATE jira_tickets SET embedding = ? WHERE id = ?",
-                (pickle.dumps(embedding), ticket_id)
+                "UPDATE jira_tickets SET embedding = ?, embedding_dim = ?, embedding_model = ? WHERE id = ?",
+                (encode_embedding(embedding), embedding.size, EMBEDDING_MODEL, ticket_id)
             )
             print(f"[{i}/{total}] Vectorized Jira ticket: {ticket_id}")
 